@@ -25,6 +25,7 @@ DAILY_POINT = 1
 WEDNESDAY_POINT = 3
 WEEKEND_POINT = 2
 
+import sys
 from enum import Enum
 
 class Grade(Enum):
@@ -116,9 +117,8 @@ def process_line(line):
     except Exception as e:
         print(f"예상치 못한 오류 발생: {e}")
 
-def input_file():
+def input_file(file_path="attendance_weekday_500.txt"):
     try:
-        file_path = "attendance_weekday_500.txt"
         with open(file_path, 'r', encoding='utf-8') as f:
             for line in f:
                 process_line(line)
@@ -133,4 +133,7 @@ def input_file():
         print("파일을 찾을 수 없습니다.")
 
 if __name__ == "__main__":
-    input_file()
+    if len(sys.argv) > 1:
+        input_file(sys.argv[1])
+    else:
+        input_file()
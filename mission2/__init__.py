@@ -0,0 +1,4 @@
+"""출석 로그를 집계해 포인트와 등급을 계산하는 패키지
+
+모듈은 서로 상대 경로로 불러온다. 명령줄 도구는 attendance_cli.main이다.
+"""
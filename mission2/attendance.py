@@ -1,50 +1,148 @@
-from day_factory import DayStrategyFactory, InvalidDataError
-from grading_factory import GradingStrategyFactory
-from bonus_factory import BonusStrategyFactory
+from .day_factory import InvalidDataError
+from .rules import RuleSet
+from .user_store import UserStore
+from .name_table import NameTable, NameList
+from .report import Report, create_sink
+from .removed_index import RemovedPlayerIndex
+from .points_index import PointsIndex
+from .stats import RunStats, BAD_FORMAT, UNKNOWN_DAY, REJECTED_CATEGORIES
+from .bad_lines import BadLineLog
+from .compressed_input import detect_compression, open_stdin_text, open_text
 from enum import Enum
+import sys
 
 class Grade(Enum):
     NORMAL = 0
     SILVER = 2
     GOLD = 1
 
+# 입력 경로 대신 쓰면 표준 입력을 읽는다
+STDIN_PATH = "-"
+
 class AttendanceSystem:
     # 상수 정의
-    MAX_USERS = 100
     NUM_DAYS = 7
+    INGEST_MODES = ("line", "bulk", "parallel", "mmap", "combine")
+    # 이 사용자 수 이상이고 numpy가 있으면 마감을 컬럼 연산으로 처리한다 (numpy를 불러오는 비용 때문)
+    VECTOR_FINALIZE_MIN_USERS = 4096
 
 
-    def __init__(self):
-        self.user_name_to_id = {}
+    def __init__(self, rules=None, profile=False, warning_limit=BadLineLog.DEFAULT_SAMPLE_LIMIT,
+                 quarantine_path=None):
+        # 이름 -> ID 조회와 ID -> 이름 조회를 하나의 압축된 이름 표로 처리한다
+        self.name_table = NameTable()
+        self.user_name_to_id = self.name_table
         self.user_id_cnt = 0
-        self.attendance_by_day = [[0] * self.NUM_DAYS for _ in range(self.MAX_USERS)]
-        self.points = [0] * self.MAX_USERS
-        self.grade = [0] * self.MAX_USERS
-        self.names = [''] * self.MAX_USERS
-        self.wednesday_attendance_count = [0] * self.MAX_USERS
-        self.weekend_attendance_count = [0] * self.MAX_USERS
-        self.day_factory = DayStrategyFactory()
-        self.grading_factory = GradingStrategyFactory()
-        self.bonus_factory = BonusStrategyFactory()
+        # 사용자 ID는 1부터 시작하므로 0번 칸은 비워 둔다
+        self.store = UserStore(self.NUM_DAYS)
+        self.attendance_by_day = self.store.attendance_by_day
+        self.points = self.store.points
+        # points에 이미 반영된 보너스. 보너스를 다시 계산해도 중복으로 더해지지 않게 한다
+        self.bonus_points = self.store.bonus_points
+        self.grade = self.store.grade
+        self.names = NameList(self.name_table)
+        self.wednesday_attendance_count = self.store.wednesday_attendance_count
+        self.weekend_attendance_count = self.store.weekend_attendance_count
+        # 단계별 시간과 처리 카운터. profile이 켜져 있으면 run이 끝날 때 요약을 출력한다
+        self.stats = RunStats()
+        # 탈락 후보 색인. 전체 사용자를 훑지 않고 목록/개수를 얻는다
+        self.removed_players = RemovedPlayerIndex(self)
+        # 포인트 순 색인 (상위 K명, 순위, 구간 조회, 등급별 인원)
+        self.points_index = PointsIndex(self)
+        self.profile = profile
+        # 잘못된 줄 집계. 경고는 분류마다 일부만 출력하고, 원하면 격리 파일에 모아 쓴다
+        self.bad_lines = BadLineLog(self.stats, warning_limit, quarantine_path)
+        self.rules = rules if rules is not None else RuleSet()
+        self.day_factory = self.rules.create_day_factory()
+        self.grading_factory = self.rules.create_grading_factory()
+        self.bonus_factory = self.rules.create_bonus_factory()
+        self.compile_rules()
+
+    @classmethod
+    def from_config(cls, config_path):
+        return cls(RuleSet.from_config(config_path))
+
+    def compile_rules(self):
+        """팩토리의 규칙을 한 번만 해석해 적재/마감 루프가 표 조회만 하도록 미리 계산한다
+
+        팩토리를 교체하거나 전략을 등록한 뒤에는 다시 호출해야 한다.
+        """
+        flag_columns = {
+            None: None,
+            "wednesday": self.wednesday_attendance_count,
+            "weekend": self.weekend_attendance_count,
+        }
+        # 요일 토큰 -> (인덱스, 포인트, 함께 증가시킬 컬럼, 사용자 정의 전략)
+        self.day_table = {
+            day_of_week: (index, add_point, flag_columns[flag], strategy)
+            for day_of_week, (index, add_point, flag, strategy) in (self.day_factory.compile() or {}).items()
+        }
+        self.bonus_table = self.bonus_factory.compile()
+        self.grade_table = self.grading_factory.compile()
+
+    def register_day_strategy(self, day_of_week, strategy):
+        self.day_factory.register_strategy(day_of_week, strategy)
+        self.compile_rules()
 
     def get_or_create_user_id(self, user_name):
-        if user_name not in self.user_name_to_id:
-            self.user_id_cnt += 1
-            self.user_name_to_id[user_name] = self.user_id_cnt
-            self.names[self.user_id_cnt] = user_name
-        return self.user_name_to_id[user_name]
+        # 줄 단위 적재의 빠른 경로: 최근에 본 이름은 인코딩과 해시 탐사 없이 찾는다
+        user_id = self.name_table.cached_id(user_name)
+        if user_id is None:
+            user_id = self.get_or_create_user_id_from_bytes(user_name.encode('utf-8'))
+            self.name_table.remember(user_name, user_id)
+        return user_id
 
-    def record_attendance(self, user_name, day_of_week):
-        user_id = self.get_or_create_user_id(user_name)
+    def get_or_create_user_id_from_bytes(self, name_bytes):
+        user_id = self.name_table.get_id(name_bytes)
+        if user_id is None:
+            name_bytes.decode('utf-8')  # 잘못된 UTF-8 이름은 표에 넣기 전에 거른다
+            user_id = self.name_table.add(name_bytes)
+            self.user_id_cnt = user_id
+            self.store.ensure_capacity(user_id + 1)
+            self.removed_players.add(user_id)
+            self.points_index.mark(user_id)
+        return user_id
+
+    def warn(self, message, line_no=None, category=BAD_FORMAT, line=None):
+        self.bad_lines.record(message, line_no, category, line)
+
+    def dispatch_day_strategy(self, user_id, day_of_week, line_no=None, count=1, line=None):
+        # 사용자 정의 전략이거나 알 수 없는 요일이면 팩토리를 거친다
         try:
             strategy = self.day_factory.get_strategy(day_of_week)
-            strategy.execute(user_id, self)  # day_of_week 인자 제거
         except InvalidDataError as e:
-            print(f"경고: {e}")
+            # 격리 파일에는 원래 줄을 남긴다. 줄 없이 호출되면 이름과 요일로 만든다
+            if line is None:
+                line = f"{self.names[user_id]} {day_of_week}"
+            self.warn(e, line_no, UNKNOWN_DAY, line)
+            return
+        if count == 1:
+            strategy.execute(user_id, self)
+        else:
+            strategy.execute_many(user_id, self, count)
+        self.points_index.mark(user_id)
+        self.stats.dispatches[type(strategy).__name__] += count
+
+    def record_attendance(self, user_name, day_of_week, line_no=None, count=1, line=None):
+        """출석 count번을 반영한다. 결합 단계는 같은 (이름, 요일) 묶음을 한 번에 넘긴다"""
+        user_id = self.get_or_create_user_id(user_name)
+        rule = self.day_table.get(day_of_week)
+        if rule is None or rule[3] is not None:
+            self.dispatch_day_strategy(user_id, day_of_week, line_no, count, line)
+            return
+
+        index, add_point, flag_column, _ = rule
+        self.attendance_by_day.data[user_id * self.NUM_DAYS + index] += count
+        self.points[user_id] += add_point * count
+        self.points_index.mark(user_id)
+        if flag_column is not None:
+            flag_column[user_id] += count
+            self.removed_players.discard(user_id)
 
 
     def calculate_bonus_points(self, user_id):
         self.bonus_factory.get_strategy().calculate(user_id, self)
+        self.points_index.mark(user_id)
 
     def determine_grade(self, user_id):
         self.grading_factory.get_strategy(self.points[user_id]).determine(user_id, self)
@@ -52,47 +150,232 @@ class AttendanceSystem:
     def print_user_summary(self, user_id):
         self.grading_factory.get_strategy(self.points[user_id]).print_summary(user_id, self)
 
+    def is_removed_candidate(self, user_id):
+        return self.grade[user_id] not in (Grade.GOLD.value, Grade.SILVER.value) and \
+            self.wednesday_attendance_count[user_id] == 0 and \
+            self.weekend_attendance_count[user_id] == 0
+
     def print_removed_players(self):
         print("\nRemoved player")
         print("==============")
-        for i in range(1, self.user_id_cnt + 1):
-            if self.grade[i] not in (Grade.GOLD.value, Grade.SILVER.value) and \
-                    self.wednesday_attendance_count[i] == 0 and \
-                    self.weekend_attendance_count[i] == 0:
-                print(self.names[i])
+        for name in self.removed_players.names():
+            print(name)
 
-    def process_line(self, line):
-        try:
-            parts = line.strip().split()
-            if len(parts) != 2:
-                raise InvalidDataError(f"잘못된 형식의 데이터: '{line.strip()}'")
-            user_name, day_of_week = parts
-            self.record_attendance(user_name, day_of_week)
+    def process_line(self, line, line_no=None):
+        # 정상 줄 경로에는 예외 처리를 두지 않는다. 잘못된 줄은 분기로 걸러 경고로 남긴다
+        parts = line.split()
+        if len(parts) != 2:
+            self.warn(f"잘못된 형식의 데이터: '{line.strip()}'", line_no, BAD_FORMAT, line)
+            return
+        user_name, day_of_week = parts
+        self.record_attendance(user_name, day_of_week, line_no, line=line)
 
-        except InvalidDataError as e:
-            print(f"경고: {e}")
-        except IndexError:
-            pass
-        except Exception as e:
-            print(f"예상치 못한 오류 발생: {e}")
+    def process_lines(self, lines):
+        """줄을 차례로 반영하고 읽은 줄 수를 센다"""
+        line_no = 0
+        for line_no, line in enumerate(lines, 1):
+            self.process_line(line, line_no)
+        self.stats.count("lines_read", line_no)
 
-    def run(self, file_path):
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                for line in f:
-                    self.process_line(line)
+    def ingest(self, file_path, mode="line", workers=None):
+        with self.stats.ingest_counters(self):
+            self._ingest(file_path, mode, workers)
+        self.bad_lines.flush()
+
+    def _ingest(self, file_path, mode, workers):
+        # 적재 엔진은 고른 방식에 필요한 것만 불러온다 (시작 시간)
+        if mode == "line":
+            with open_text(file_path) as f:
+                self.process_lines(f)
+        elif mode == "bulk" or (mode in ("mmap", "parallel") and detect_compression(file_path) is not None):
+            # 압축 파일은 바이트 위치로 나누거나 매핑할 수 없으므로 일괄 적재로 처리한다
+            from .bulk_ingest import BulkIngestEngine
+            BulkIngestEngine(self).ingest(file_path)
+        elif mode == "combine":
+            from .combiner import AttendanceCombiner
+            with open_text(file_path) as f, AttendanceCombiner(self) as combiner:
+                combiner.add_lines(f)
+        elif mode == "mmap":
+            from .line_reader import MmapIngestEngine
+            MmapIngestEngine(self).ingest(file_path)
+        elif mode == "parallel":
+            from .parallel_ingest import ParallelIngestEngine
+            ParallelIngestEngine(self, workers).ingest(file_path)
+        else:
+            raise ValueError(f"지원하지 않는 적재 방식: '{mode}'")
+
+    def ingest_stream(self, stream, mode="line"):
+        """표준 입력 같은 텍스트 스트림을 적재한다. line/combine 외의 방식은 모두 읽어 일괄 적재로 처리한다"""
+        with self.stats.ingest_counters(self):
+            if mode == "line":
+                self.process_lines(stream)
+            elif mode == "combine":
+                from .combiner import AttendanceCombiner
+                with AttendanceCombiner(self) as combiner:
+                    combiner.add_lines(stream)
+            else:
+                from .bulk_ingest import BulkIngestEngine
+                BulkIngestEngine(self).ingest_text(stream.read())
+        self.bad_lines.flush()
+
+    def ingest_files(self, patterns, workers=None):
+        """여러 파일(경로 또는 glob 패턴)을 파일 단위로 병렬 집계해 주어진 순서대로 합친다"""
+        from .batch import BatchIngestEngine
+        with self.stats.ingest_counters(self):
+            BatchIngestEngine(self, workers).ingest(patterns)
+        self.bad_lines.flush()
 
+    def merge(self, other):
+        """다른 시스템의 보너스 적용 전 상태를 이 시스템에 더한다
+
+        사용자 순서는 이 시스템의 사용자 다음에 other에만 있는 사용자가 other의 ID 순서로 붙는다.
+        보너스와 등급은 합친 뒤 finalize로 다시 계산해야 한다.
+        """
+        from .checkpoint import rules_fingerprint
+        if rules_fingerprint(self) != rules_fingerprint(other):
+            raise ValueError("규칙이 다른 시스템은 합칠 수 없습니다")
+
+        num_days = self.NUM_DAYS
+        data = self.attendance_by_day.data
+        other_data = other.attendance_by_day.data
+        for other_id in range(1, other.user_id_cnt + 1):
+            user_id = self.get_or_create_user_id_from_bytes(other.name_table.name_bytes(other_id))
+            start, other_start = user_id * num_days, other_id * num_days
+            for index in range(num_days):
+                data[start + index] += other_data[other_start + index]
+            self.points[user_id] += other.points[other_id] - other.bonus_points[other_id]
+            self.wednesday_attendance_count[user_id] += other.wednesday_attendance_count[other_id]
+            self.weekend_attendance_count[user_id] += other.weekend_attendance_count[other_id]
+            self.points_index.mark(user_id)
+            if other.wednesday_attendance_count[other_id] or other.weekend_attendance_count[other_id]:
+                self.removed_players.discard(user_id)
+
+        for category in ("lines_read",) + REJECTED_CATEGORIES:
+            self.stats.count(category, other.stats.counters[category])
+        self.stats.dispatches.update(other.stats.dispatches)
+        return self
+
+    def ingest_incremental(self, file_path, snapshot_path):
+        """스냅숏에 저장된 상태를 불러와 그 뒤에 추가된 줄만 적재한다"""
+        from .checkpoint import ingest_incremental
+        ingest_incremental(self, file_path, snapshot_path)
+        self.bad_lines.flush()
+
+    def finalize(self, vectorized=None):
+        """모든 사용자의 보너스와 등급을 계산한다
+
+        vectorized가 None이면 사용자 수와 numpy 설치 여부로 컬럼 연산 경로를 고르고,
+        True/False면 그 경로를 강제한다.
+        """
+        self.apply_bonuses(vectorized)
+        self.assign_grades(vectorized)
+
+    def finalize_reference(self):
+        """사용자마다 보너스/등급 전략 객체를 거치는 기준 구현. 일괄 마감 결과를 검증할 때 쓴다"""
+        for i in range(1, self.user_id_cnt + 1):
+            self.calculate_bonus_points(i)
+            self.determine_grade(i)
+
+    def _vector_finalizer(self, vectorized):
+        if vectorized is False or (vectorized is None and self.user_id_cnt < self.VECTOR_FINALIZE_MIN_USERS):
+            return None
+        from .vector_finalize import VectorFinalizer
+        finalizer = VectorFinalizer(self, use_numpy=vectorized)
+        return finalizer if finalizer.np is not None else None
+
+    def apply_bonuses(self, vectorized=None):
+        if self.bonus_table is None:
             for i in range(1, self.user_id_cnt + 1):
                 self.calculate_bonus_points(i)
+            return
+        finalizer = self._vector_finalizer(vectorized)
+        if finalizer is not None:
+            finalizer.apply_bonuses()
+            return
+
+        data = self.attendance_by_day.data
+        num_days = self.NUM_DAYS
+        mark_points = self.points_index.mark
+        for user_id in range(1, self.user_id_cnt + 1):
+            start = user_id * num_days
+            user_bonus = 0
+            for indexes, attendance_count, bonus_points in self.bonus_table:
+                count = 0
+                for index in indexes:
+                    count += data[start + index]
+                if count >= attendance_count:
+                    user_bonus += bonus_points
+            if user_bonus != self.bonus_points[user_id]:
+                self.points[user_id] += user_bonus - self.bonus_points[user_id]
+                self.bonus_points[user_id] = user_bonus
+                mark_points(user_id)
+
+    def assign_grades(self, vectorized=None):
+        if self.grade_table is None:
+            for i in range(1, self.user_id_cnt + 1):
                 self.determine_grade(i)
-                self.print_user_summary(i)
+            return
+        finalizer = self._vector_finalizer(vectorized)
+        if finalizer is not None:
+            finalizer.assign_grades()
+            return
+
+        normal = Grade.NORMAL.value
+        discard_removed = self.removed_players.discard
+        for user_id in range(1, self.user_id_cnt + 1):
+            user_points = self.points[user_id]
+            user_grade = normal
+            for grade_point, grade_value in self.grade_table:
+                if user_points >= grade_point:
+                    user_grade = grade_value
+                    discard_removed(user_id)
+                    break
+            self.grade[user_id] = user_grade
+
+    def build_report(self):
+        return Report.from_system(self)
 
-            self.print_removed_players()
+    def print_report(self, output_format="text", stream=None):
+        """요약 보고서를 버퍼에 모아 큰 덩어리로 출력한다"""
+        create_sink(output_format).write(self.build_report(), stream)
+
+    def print_ingest_summary(self):
+        if self.bad_lines.suppressed:
+            print(self.bad_lines.format_summary())
+
+    def run(self, file_path, mode="line", workers=None, output_format="text", stream=None,
+            snapshot_path=None):
+        try:
+            with self.stats.phase("ingest"):
+                if snapshot_path is not None:
+                    self.ingest_incremental(file_path, snapshot_path)
+                elif isinstance(file_path, (list, tuple)):
+                    self.ingest_files(file_path, workers)
+                elif file_path == STDIN_PATH:
+                    with open_stdin_text() as stdin:
+                        self.ingest_stream(stdin, mode)
+                else:
+                    self.ingest(file_path, mode, workers)
+                self.print_ingest_summary()
+            with self.stats.phase("bonus"):
+                self.apply_bonuses()
+            with self.stats.phase("grading"):
+                self.assign_grades()
+            with self.stats.phase("report"):
+                self.print_report(output_format, stream)
 
         except FileNotFoundError:
             print(f"파일을 찾을 수 없습니다: {file_path}")
+            return False
+
+        finally:
+            if self.profile:
+                print(self.stats.format_summary(), file=sys.stderr)
+        return True
 
 
 if __name__ == "__main__":
-    attendance_system = AttendanceSystem()
-    attendance_system.run("attendance_weekday_500.txt")
\ No newline at end of file
+    from .attendance_cli import main
+    import os
+    # 입력을 주지 않으면 모듈 옆의 예제 파일을 읽는다
+    sys.exit(main(default_inputs=[os.path.join(os.path.dirname(os.path.abspath(__file__)), "attendance_weekday_500.txt")]))
\ No newline at end of file
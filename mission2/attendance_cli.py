@@ -0,0 +1,96 @@
+import argparse
+import contextlib
+import sys
+
+from .attendance import AttendanceSystem, STDIN_PATH
+
+OUTPUT_FORMATS = ("text", "csv", "jsonl", "binary")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="attendance", description="출석 로그를 집계해 등급 보고서를 출력한다")
+    parser.add_argument("inputs", nargs="*", metavar="INPUT",
+                        help="출석 로그 경로 또는 glob 패턴 ('-'는 표준 입력, 없으면 표준 입력)")
+    parser.add_argument("-f", "--format", choices=OUTPUT_FORMATS, default="text", help="보고서 출력 형식")
+    parser.add_argument("-e", "--engine", choices=AttendanceSystem.INGEST_MODES, default="line",
+                        help="적재 방식 (입력이 여러 개면 파일 단위 병렬 집계를 쓴다)")
+    parser.add_argument("-j", "--workers", type=int, help="parallel 방식과 여러 파일 집계에 쓸 프로세스 수")
+    parser.add_argument("--rules", help="규칙 설정 JSON 파일")
+    parser.add_argument("--warning-limit", type=int, default=100, help="분류별로 출력할 최대 경고 수")
+    parser.add_argument("--quarantine", help="잘못된 줄을 모아 쓸 파일")
+    parser.add_argument("--memory-limit", type=_positive_int, metavar="MB",
+                        help="사용자를 메모리에 다 올리지 않고 이 상한 안에서 파티션별로 집계한다 (파일 하나만)")
+    parser.add_argument("--dedup", action="store_true",
+                        help="'이름 요일 이벤트ID' 입력에서 같은 이벤트 ID를 한 번만 반영한다 (line 방식)")
+    parser.add_argument("--dedup-events", type=int, default=1 << 20, help="중복 필터 첫 조각의 기대 이벤트 수 (넘으면 필터가 커진다)")
+    parser.add_argument("--dedup-error-rate", type=float, default=0.001, help="중복 필터의 오탐률")
+    parser.add_argument("--profile", action="store_true", help="단계별 시간과 카운터를 표준 오류로 출력")
+    return parser
+
+
+def _positive_int(text):
+    value = int(text)
+    if value <= 0:
+        raise argparse.ArgumentTypeError(f"0보다 큰 정수여야 합니다: {text}")
+    return value
+
+
+def _has_glob(path):
+    # glob 모듈은 re를 불러오므로 시작 시간을 위해 직접 확인한다
+    return any(char in path for char in "*?[")
+
+
+def main(argv=None, default_inputs=None):
+    args = build_parser().parse_args(argv)
+    inputs = args.inputs or default_inputs or [STDIN_PATH]
+    if STDIN_PATH in inputs and len(inputs) > 1:
+        print("표준 입력('-')은 다른 입력과 함께 쓸 수 없습니다", file=sys.stderr)
+        return 2
+
+    rules = None
+    if args.rules:
+        from .rules import RuleSet
+        rules = RuleSet.from_config(args.rules)
+    # 경로 하나(또는 '-')는 고른 방식으로 적재하고, 여러 경로나 glob 패턴은 파일 단위로 병렬 집계한다
+    target = inputs[0] if len(inputs) == 1 and not _has_glob(inputs[0]) else inputs
+    if args.memory_limit is not None:
+        if not isinstance(target, str) or target == STDIN_PATH or args.format == "binary":
+            print("--memory-limit은 text/csv/jsonl 형식과 입력 파일 하나에만 쓸 수 있습니다", file=sys.stderr)
+            return 2
+        return _run_out_of_core(args, rules, target)
+
+    options = dict(profile=args.profile, warning_limit=args.warning_limit, quarantine_path=args.quarantine)
+    if args.dedup:
+        if args.engine != "line":
+            print("--dedup은 line 방식에서만 쓸 수 있습니다", file=sys.stderr)
+            return 2
+        from .dedup import DedupAttendanceSystem
+        system = DedupAttendanceSystem(rules, args.dedup_events, args.dedup_error_rate, **options)
+    else:
+        system = AttendanceSystem(rules, **options)
+
+    if args.format == "text":
+        # 기존 출력과 같도록 경고와 보고서를 모두 표준 출력으로 보낸다
+        ok = system.run(target, args.engine, args.workers)
+    else:
+        # 기계용 형식은 보고서만 표준 출력으로 보내고 경고는 표준 오류로 돌린다
+        stream = sys.stdout.buffer if args.format == "binary" else sys.stdout
+        with contextlib.redirect_stdout(sys.stderr):
+            ok = system.run(target, args.engine, args.workers, args.format, stream)
+    return 0 if ok else 1
+
+
+def _run_out_of_core(args, rules, target):
+    from .out_of_core import OutOfCoreAttendance
+    system = OutOfCoreAttendance(rules, memory_limit=args.memory_limit << 20, profile=args.profile,
+                                 warning_limit=args.warning_limit, quarantine_path=args.quarantine)
+    if args.format == "text":
+        ok = system.run(target)
+    else:
+        with contextlib.redirect_stdout(sys.stderr):
+            ok = system.run(target, args.format, sys.stdout)
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
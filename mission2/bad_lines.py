@@ -0,0 +1,57 @@
+from collections import Counter
+
+from .stats import BAD_FORMAT, UNKNOWN_DAY
+
+CATEGORY_LABELS = {BAD_FORMAT: "잘못된 형식", UNKNOWN_DAY: "알 수 없는 요일"}
+
+
+class BadLineLog:
+    """잘못된 줄을 분류별로 세고, 경고는 분류마다 앞의 sample_limit개만 출력한다
+
+    quarantine_path가 있으면 잘못된 줄을 "줄 번호<TAB>분류<TAB>내용" 형식으로 모아 두었다가
+    FLUSH_LINES개씩 한 번에 파일에 쓴다. 파일은 처음 쓸 때 새로 만든다.
+    sample_limit이 None이면 모든 경고를 출력한다.
+    """
+
+    DEFAULT_SAMPLE_LIMIT = 100
+    FLUSH_LINES = 8192
+
+    def __init__(self, stats, sample_limit=DEFAULT_SAMPLE_LIMIT, quarantine_path=None):
+        self.stats = stats
+        self.sample_limit = sample_limit
+        self.quarantine_path = quarantine_path
+        self.printed = Counter()
+        self.suppressed = Counter()
+        self._buffer = []
+        self._quarantine_started = False
+
+    def record(self, message, line_no=None, category=BAD_FORMAT, line=None):
+        self.stats.count(category)
+        if self.sample_limit is None or self.printed[category] < self.sample_limit:
+            self.printed[category] += 1
+            if line_no is None:
+                print(f"경고: {message}")
+            else:
+                print(f"경고: {message} (줄 {line_no})")
+        else:
+            self.suppressed[category] += 1
+
+        if self.quarantine_path is not None:
+            text = str(message) if line is None else line.rstrip('\r\n')
+            self._buffer.append(f"{'' if line_no is None else line_no}\t{category}\t{text}\n")
+            if len(self._buffer) >= self.FLUSH_LINES:
+                self.flush()
+
+    def flush(self):
+        if self.quarantine_path is None or (not self._buffer and self._quarantine_started):
+            return
+        mode = 'a' if self._quarantine_started else 'w'
+        with open(self.quarantine_path, mode, encoding='utf-8') as f:
+            f.write(''.join(self._buffer))
+        self._quarantine_started = True
+        self._buffer.clear()
+
+    def format_summary(self):
+        counts = ", ".join(f"{label} {self.stats.counters[category]}건"
+                           for category, label in CATEGORY_LABELS.items())
+        return f"경고 요약: {counts} (출력 생략 {sum(self.suppressed.values())}건)"
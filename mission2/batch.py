@@ -0,0 +1,71 @@
+import glob
+import os
+
+from .compressed_input import detect_compression, open_text
+from .parallel_ingest import aggregate_lines, aggregate_range, portable_day_table
+
+
+def expand_inputs(patterns):
+    """경로나 glob 패턴 목록을 파일 목록으로 펼친다. 패턴마다 이름순이고, 같은 파일은 한 번만 넣는다"""
+    if isinstance(patterns, (str, os.PathLike)):
+        patterns = [patterns]
+    paths = []
+    for pattern in map(os.fspath, patterns):
+        matches = sorted(glob.glob(pattern)) if glob.has_magic(pattern) else [pattern]
+        if not matches:
+            raise FileNotFoundError(pattern)
+        paths.extend(path for path in matches if path not in paths)
+    return paths
+
+
+def aggregate_file(file_path, day_table, num_days):
+    """파일 하나를 통째로 집계한다 (작업 프로세스에서 실행)"""
+    if detect_compression(file_path) is not None:
+        with open_text(file_path) as f:
+            lines = f.read().split('\n')
+        if lines[-1] == '':
+            lines.pop()
+        partial = aggregate_lines(lines, 0, day_table, num_days)
+    else:
+        partial = aggregate_range(file_path, 0, os.path.getsize(file_path), day_table, num_days)
+    # 줄 번호는 파일마다 1부터 다시 세므로 경고에 파일 이름을 붙인다
+    partial.warnings = [(key, category, f"{file_path}: {message}", line)
+                        for key, category, message, line in partial.warnings]
+    return partial
+
+
+class BatchIngestEngine:
+    """여러 입력 파일을 파일 단위로 작업 프로세스에서 집계하고, 주어진 파일 순서대로 병합하는 엔진
+
+    사용자 ID 순서는 파일들을 순서대로 이어 붙여 줄 단위로 처리했을 때와 같다.
+    사용자 정의 요일 전략이 있으면 작업 프로세스로 넘길 수 없으므로 한 프로세스에서 차례로 적재한다.
+    """
+
+    def __init__(self, system, workers=None):
+        self.system = system
+        self.workers = workers or os.cpu_count() or 1
+
+    def ingest(self, patterns):
+        system = self.system
+        paths = expand_inputs(patterns)
+        try:
+            day_table = portable_day_table(system)
+        except ValueError:
+            # ingest_files가 이미 카운터를 세고 있으므로 ingest 대신 _ingest로 겹쳐 세지 않는다
+            for path in paths:
+                system._ingest(path, "bulk", None)
+            return
+
+        num_days = system.NUM_DAYS
+        if self.workers == 1 or len(paths) == 1:
+            partials = (aggregate_file(path, day_table, num_days) for path in paths)
+            for partial in partials:
+                partial.apply_to(system)
+            return
+
+        # 프로세스 풀은 필요할 때만 불러온다
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=min(self.workers, len(paths))) as pool:
+            futures = [pool.submit(aggregate_file, path, day_table, num_days) for path in paths]
+            for future in futures:
+                future.result().apply_to(system)
@@ -0,0 +1,184 @@
+import argparse
+import contextlib
+import hashlib
+import io
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+MISSION2_DIR = os.path.dirname(os.path.abspath(__file__))
+# 하위 프로세스는 패키지를 담은 디렉터리에서 -m으로 실행한다
+PACKAGE_PARENT = os.path.dirname(MISSION2_DIR)
+MISSION1_SCRIPT = os.path.join(MISSION2_DIR, os.pardir, "mission1", "attendance.py")
+# mission1은 사용자 ID가 1~99까지만 가능하다
+MISSION1_MAX_USERS = 99
+
+MISSION2_ENGINES = {
+    "mission2-line": "line",
+    "mission2-bulk": "bulk",
+    "mission2-mmap": "mmap",
+    "mission2-parallel": "parallel",
+    "mission2-combine": "combine",
+}
+ENGINES = ("mission1", *MISSION2_ENGINES)
+PHASES = ("ingest", "bonus", "grading", "report")
+
+# CLI 시작 시간 예산과, 시작할 때 불러오면 안 되는 무거운 모듈
+CLI_MODULE = f"{__package__}.attendance_cli"
+IMPORT_TIME_BUDGET_MS = 100
+LAZY_MODULES = ("numpy", "concurrent.futures", "multiprocessing", "sqlite3", "asyncio",
+                "gzip", "bz2", "lzma", "threading", "json", "csv")
+
+
+def report_digest(output):
+    """경고 줄을 뺀 보고서 부분의 해시. 엔진마다 경고 문구가 달라도 결과를 비교할 수 있다"""
+    report_lines = [line for line in output.splitlines()
+                    if not line.startswith(("경고:", "예상치 못한 오류"))]
+    return hashlib.sha256('\n'.join(report_lines).encode('utf-8')).hexdigest()
+
+
+def peak_rss_mb(who):
+    peak = resource.getrusage(who).ru_maxrss
+    # Linux는 KB, macOS는 바이트 단위다
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def run_mission2(file_path, mode):
+    from .attendance import AttendanceSystem
+
+    system = AttendanceSystem()
+    output = io.StringIO()
+    timings = {}
+    with contextlib.redirect_stdout(output):
+        for phase, step in (("ingest", lambda: system.ingest(file_path, mode)),
+                            ("bonus", system.apply_bonuses),
+                            ("grading", system.assign_grades),
+                            ("report", lambda: system.print_report(stream=output))):
+            started = time.perf_counter()
+            step()
+            timings[phase] = time.perf_counter() - started
+    return timings, output.getvalue()
+
+
+def run_mission1(file_path):
+    started = time.perf_counter()
+    completed = subprocess.run([sys.executable, os.path.abspath(MISSION1_SCRIPT), os.path.abspath(file_path)],
+                               capture_output=True, text=True, encoding='utf-8', check=True)
+    return {"total": time.perf_counter() - started}, completed.stdout
+
+
+def worker(engine, file_path):
+    """한 엔진을 별도 프로세스에서 실행해 결과를 JSON으로 출력한다 (최대 RSS를 엔진별로 재기 위함)"""
+    if engine == "mission1":
+        timings, output = run_mission1(file_path)
+    else:
+        timings, output = run_mission2(file_path, MISSION2_ENGINES[engine])
+    timings.setdefault("total", sum(timings.values()))
+    json.dump({
+        "engine": engine,
+        "timings": timings,
+        "digest": report_digest(output),
+        "peak_rss_mb": max(peak_rss_mb(resource.RUSAGE_SELF), peak_rss_mb(resource.RUSAGE_CHILDREN)),
+    }, sys.stdout)
+
+
+def import_profile(module=CLI_MODULE):
+    """새 프로세스에서 모듈을 불러와 누적 import 시간(ms)과 함께 불러온 무거운 모듈 목록을 돌려준다"""
+    code = f"import sys, {module}; print(','.join(m for m in {LAZY_MODULES!r} if m in sys.modules))"
+    completed = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=PACKAGE_PARENT,
+                               capture_output=True, text=True, check=True)
+    cumulative_us = 0
+    for line in completed.stderr.splitlines():
+        # "import time: 자체 | 누적 | 모듈 이름" 형식
+        fields = line.split('|')
+        if len(fields) == 3 and fields[2].strip() == module:
+            cumulative_us = int(fields[1])
+    return cumulative_us / 1000, [name for name in completed.stdout.strip().split(',') if name]
+
+
+def count_lines(file_path):
+    with open(file_path, 'rb') as f:
+        return sum(chunk.count(b'\n') for chunk in iter(lambda: f.read(1 << 20), b''))
+
+
+def count_users(file_path):
+    with open(file_path, 'r', encoding='utf-8') as f:
+        return len({parts[0] for parts in map(str.split, f) if len(parts) == 2})
+
+
+def benchmark(file_path, engines=ENGINES):
+    """엔진별 단계 시간, 처리량, 최대 RSS를 재고 출력이 모두 같은지 확인한다"""
+    line_count = count_lines(file_path)
+    if "mission1" in engines and count_users(file_path) > MISSION1_MAX_USERS:
+        engines = [engine for engine in engines if engine != "mission1"]
+
+    results = []
+    for engine in engines:
+        command = [sys.executable, "-m", f"{__package__}.benchmark", "--worker", engine, os.path.abspath(file_path)]
+        completed = subprocess.run(command, cwd=PACKAGE_PARENT, capture_output=True, text=True, check=True)
+        result = json.loads(completed.stdout)
+        result["lines_per_sec"] = line_count / result["timings"]["total"] if result["timings"]["total"] else 0.0
+        results.append(result)
+
+    reference = results[0]["digest"] if results else None
+    for result in results:
+        result["same_output"] = result["digest"] == reference
+    return {"file": file_path, "lines": line_count, "results": results}
+
+
+def print_summary(summary):
+    print(f"{summary['file']} ({summary['lines']} lines)")
+    print(f"{'engine':<20}" + ''.join(f"{phase:>10}" for phase in (*PHASES, "total"))
+          + f"{'lines/s':>12}{'RSS MB':>9}  output")
+    for result in summary["results"]:
+        timings = result["timings"]
+        cells = ''.join(f"{timings[phase]:>10.3f}" if phase in timings else f"{'-':>10}"
+                        for phase in (*PHASES, "total"))
+        print(f"{result['engine']:<20}{cells}{result['lines_per_sec']:>12.0f}{result['peak_rss_mb']:>9.1f}  "
+              + ("OK" if result["same_output"] else "MISMATCH"))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="출석 처리 엔진 벤치마크")
+    parser.add_argument("input", nargs="?", help="출석 로그 파일 (없으면 --lines/--users로 생성)")
+    parser.add_argument("--engines", nargs="+", choices=ENGINES, default=list(ENGINES))
+    parser.add_argument("--lines", type=int, default=100000)
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--malformed-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="결과를 JSON으로 저장할 경로")
+    parser.add_argument("--import-time", action="store_true", help="CLI 시작(import) 시간만 재고 예산과 비교")
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.worker:
+        worker(args.worker, args.input)
+        return 0
+    if args.import_time:
+        elapsed_ms, loaded = import_profile()
+        print(f"import {CLI_MODULE}: {elapsed_ms:.1f}ms (budget {IMPORT_TIME_BUDGET_MS}ms)"
+              + (f", eagerly loaded: {', '.join(loaded)}" if loaded else ""))
+        return 0 if elapsed_ms <= IMPORT_TIME_BUDGET_MS and not loaded else 1
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        file_path = args.input
+        if file_path is None:
+            from .workload import write_workload
+            file_path = os.path.join(work_dir, "workload.txt")
+            write_workload(file_path, args.lines, args.users,
+                           malformed_rate=args.malformed_rate, seed=args.seed)
+        summary = benchmark(file_path, args.engines)
+
+    print_summary(summary)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(summary, f, indent=2)
+    return 0 if all(result["same_output"] for result in summary["results"]) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,5 +1,30 @@
-from bonus_strategies import AllBonusStrategy
+from .bonus_strategies import AllBonusStrategy, WednesdayBonusStrategy, WeekendBonusStrategy
 
 class BonusStrategyFactory:
+    def __init__(self, strategy=None):
+        # 보너스 전략은 상태가 없으므로 한 번만 만들어 재사용한다
+        self._strategy = strategy if strategy is not None else AllBonusStrategy()
+
     def get_strategy(self):
-        return AllBonusStrategy()
\ No newline at end of file
+        return self._strategy
+
+
+    def compile(self):
+        """보너스 규칙을 (요일 인덱스들, 기준 출석 횟수, 보너스 포인트) 목록으로 만든다
+
+        기본 보너스 전략 조합이 아니면 None을 돌려주어 전략 객체로 계산하게 한다.
+        """
+        if type(self).get_strategy is not BonusStrategyFactory.get_strategy:
+            return None
+        if type(self._strategy) is not AllBonusStrategy:
+            return None
+        table = []
+        for strategy in self._strategy.strategies:
+            if type(strategy) is WednesdayBonusStrategy:
+                indexes = (strategy.wednesday_index,)
+            elif type(strategy) is WeekendBonusStrategy:
+                indexes = strategy.weekend_indexes
+            else:
+                return None
+            table.append((indexes, strategy.attendance_count, strategy.bonus_points))
+        return table
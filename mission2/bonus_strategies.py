@@ -8,23 +8,49 @@ BONUS_POINTS = 10
 
 class BonusStrategy(ABC):
     @abstractmethod
-    def calculate(self, user_id, system):
+    def bonus(self, user_id, system):
+        """사용자에게 주어질 보너스 포인트를 반환한다 (상태를 바꾸지 않는다)"""
         pass
 
-class WednesdayBonusStrategy(BonusStrategy):
     def calculate(self, user_id, system):
-        if system.attendance_by_day[user_id][WEDNESDAY_INDEX] >= BONUS_ATTENDANCE_COUNT:
-            system.points[user_id] += BONUS_POINTS
+        system.points[user_id] += self.bonus(user_id, system)
+
+class WednesdayBonusStrategy(BonusStrategy):
+    def __init__(self, wednesday_index=WEDNESDAY_INDEX,
+                 attendance_count=BONUS_ATTENDANCE_COUNT, bonus_points=BONUS_POINTS):
+        self.wednesday_index = wednesday_index
+        self.attendance_count = attendance_count
+        self.bonus_points = bonus_points
+
+    def bonus(self, user_id, system):
+        if system.attendance_by_day[user_id][self.wednesday_index] >= self.attendance_count:
+            return self.bonus_points
+        return 0
 
 
 class WeekendBonusStrategy(BonusStrategy):
-    def calculate(self, user_id, system):
-        if (system.attendance_by_day[user_id][SATURDAY_INDEX] +
-                system.attendance_by_day[user_id][SUNDAY_INDEX]) >= BONUS_ATTENDANCE_COUNT:
-            system.points[user_id] += BONUS_POINTS
+    def __init__(self, weekend_indexes=(SATURDAY_INDEX, SUNDAY_INDEX),
+                 attendance_count=BONUS_ATTENDANCE_COUNT, bonus_points=BONUS_POINTS):
+        self.weekend_indexes = tuple(weekend_indexes)
+        self.attendance_count = attendance_count
+        self.bonus_points = bonus_points
+
+    def bonus(self, user_id, system):
+        row = system.attendance_by_day[user_id]
+        if sum(row[index] for index in self.weekend_indexes) >= self.attendance_count:
+            return self.bonus_points
+        return 0
 
 
 class AllBonusStrategy(BonusStrategy):
+    def __init__(self, strategies=None):
+        self.strategies = strategies if strategies is not None else [WednesdayBonusStrategy(), WeekendBonusStrategy()]
+
+    def bonus(self, user_id, system):
+        return sum(strategy.bonus(user_id, system) for strategy in self.strategies)
+
     def calculate(self, user_id, system):
-        WednesdayBonusStrategy().calculate(user_id, system)
-        WeekendBonusStrategy().calculate(user_id, system)
\ No newline at end of file
+        # 이미 반영한 보너스를 새 보너스로 바꿔 넣으므로 여러 번 호출해도 결과가 같다
+        total = self.bonus(user_id, system)
+        system.points[user_id] += total - system.bonus_points[user_id]
+        system.bonus_points[user_id] = total
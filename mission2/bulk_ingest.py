@@ -0,0 +1,140 @@
+from collections import Counter
+
+from .day_factory import InvalidDataError
+from .stats import BAD_FORMAT, UNKNOWN_DAY
+from .user_store import load_numpy
+from .compressed_input import open_text
+
+WEDNESDAY_FLAG = 1
+WEEKEND_FLAG = 2
+
+
+class BulkIngestEngine:
+    """파일 전체를 한 번에 읽어 사용자 x 요일 출석 행렬을 만드는 일괄 적재 엔진
+
+    줄 단위 경로(process_line)와 같은 사용자 ID 순서, 포인트, 경고 출력을 만든다.
+    요일 처리는 system.day_table을 따르며, numpy가 있으면 누적을 컬럼 연산으로 처리한다.
+    """
+
+    def __init__(self, system, use_numpy=None):
+        self.system = system
+        self.np = load_numpy() if use_numpy is not False else None
+        if use_numpy and self.np is None:
+            raise ImportError("numpy가 설치되어 있지 않습니다")
+
+    def ingest(self, file_path):
+        with open_text(file_path) as f:
+            text = f.read()
+        self.ingest_text(text)
+
+    def ingest_text(self, text, first_line_no=1):
+        lines = text.split('\n')
+        if lines[-1] == '':
+            lines.pop()
+        self.system.stats.count("lines_read", len(lines))
+
+        # 같은 줄은 한 번만 분리하도록 원본 줄을 먼저 집계한다.
+        # Counter는 처음 등장한 순서를 유지하므로 사용자 ID 순서가 줄 단위 경로와 같다.
+        line_counts = Counter(lines)
+
+        system = self.system
+        day_table = system.day_table
+        user_ids, day_indexes, add_points, flags, counts = [], [], [], [], []
+        has_invalid_line = False
+        for line, count in line_counts.items():
+            parts = line.split()
+            if len(parts) != 2:
+                has_invalid_line = True
+                continue
+            user_name, day_of_week = parts
+            user_id = system.get_or_create_user_id(user_name)
+            rule = day_table.get(day_of_week)
+            if rule is None or rule[3] is not None:
+                if not self._execute_strategy(user_id, day_of_week, count):
+                    has_invalid_line = True
+                continue
+            index, add_point, flag_column, _ = rule
+            user_ids.append(user_id)
+            day_indexes.append(index)
+            add_points.append(add_point)
+            flags.append(self._flag_of(flag_column))
+            counts.append(count)
+            if flag_column is not None:
+                system.removed_players.discard(user_id)
+
+        if has_invalid_line:
+            self._print_warnings(lines, first_line_no)
+
+        system.points_index.mark_many(user_ids)
+        if self.np is not None:
+            self._apply_numpy(user_ids, day_indexes, add_points, flags, counts)
+        else:
+            self._apply_python(user_ids, day_indexes, add_points, flags, counts)
+
+    def _flag_of(self, flag_column):
+        if flag_column is None:
+            return 0
+        return WEDNESDAY_FLAG if flag_column is self.system.wednesday_attendance_count else WEEKEND_FLAG
+
+    def _execute_strategy(self, user_id, day_of_week, count):
+        # 사용자 정의 전략도 출석 횟수를 한 번에 넘긴다
+        try:
+            strategy = self.system.day_factory.get_strategy(day_of_week)
+        except InvalidDataError:
+            return False
+        strategy.execute_many(user_id, self.system, count)
+        self.system.points_index.mark(user_id)
+        self.system.stats.dispatches[type(strategy).__name__] += count
+        return True
+
+    def _print_warnings(self, lines, first_line_no):
+        # 줄 단위 경로와 같은 순서로 경고를 출력한다
+        for line_no, line in enumerate(lines, first_line_no):
+            parts = line.split()
+            if len(parts) != 2:
+                self.system.warn(f"잘못된 형식의 데이터: '{line.strip()}'", line_no, BAD_FORMAT, line)
+            elif parts[1] not in self.system.day_table:
+                try:
+                    self.system.day_factory.get_strategy(parts[1])
+                except InvalidDataError as e:
+                    self.system.warn(e, line_no, UNKNOWN_DAY, line)
+
+    def _apply_numpy(self, user_ids, day_indexes, add_points, flags, counts):
+        np = self.np
+        system = self.system
+        num_days = system.NUM_DAYS
+        rows = system.user_id_cnt + 1
+
+        user_ids = np.asarray(user_ids, dtype=np.int64)
+        counts = np.asarray(counts, dtype=np.int64)
+        flags = np.asarray(flags, dtype=np.int8)
+
+        def column_sum(keys, weights, length):
+            return np.bincount(keys, weights=weights, minlength=length).astype(np.int64)
+
+        day_delta = column_sum(user_ids * num_days + np.asarray(day_indexes, dtype=np.int64), counts, rows * num_days)
+        point_delta = column_sum(user_ids, counts * np.asarray(add_points, dtype=np.int64), rows)
+        wednesday_delta = column_sum(user_ids, counts * (flags == WEDNESDAY_FLAG), rows)
+        weekend_delta = column_sum(user_ids, counts * (flags == WEEKEND_FLAG), rows)
+
+        matrix = np.frombuffer(system.attendance_by_day.data, dtype=np.int32)
+        points = np.frombuffer(system.points, dtype=np.int64)
+        wednesday = np.frombuffer(system.wednesday_attendance_count, dtype=np.int32)
+        weekend = np.frombuffer(system.weekend_attendance_count, dtype=np.int32)
+
+        matrix[:rows * num_days] += day_delta.astype(np.int32)
+        points[:rows] += point_delta
+        wednesday[:rows] += wednesday_delta.astype(np.int32)
+        weekend[:rows] += weekend_delta.astype(np.int32)
+
+    def _apply_python(self, user_ids, day_indexes, add_points, flags, counts):
+        system = self.system
+        num_days = system.NUM_DAYS
+        matrix = system.attendance_by_day.data
+        for user_id, index, add_point, flag, count in zip(user_ids, day_indexes, add_points, flags, counts):
+            matrix[user_id * num_days + index] += count
+            system.points[user_id] += add_point * count
+            if flag == WEDNESDAY_FLAG:
+                system.wednesday_attendance_count[user_id] += count
+            elif flag == WEEKEND_FLAG:
+                system.weekend_attendance_count[user_id] += count
@@ -0,0 +1,157 @@
+import hashlib
+import json
+import os
+import struct
+import sys
+from array import array
+
+from .user_store import COUNT_TYPECODE, DAY_COUNT_TYPECODE, POINT_TYPECODE
+
+HASH_CHUNK_SIZE = 1 << 20
+
+
+def _hasher():
+    return hashlib.blake2b(digest_size=32)
+
+
+def rules_fingerprint(system):
+    """규칙 상수와 사용자 정의 전략이 바뀌면 달라지는 지문"""
+    rules = system.rules.to_dict()
+    rules["custom_strategies"] = sorted(
+        f"{day_of_week}:{type(strategy).__module__}.{type(strategy).__qualname__}"
+        for day_of_week, (*_, strategy) in system.day_table.items() if strategy is not None)
+    return hashlib.sha256(json.dumps(rules, sort_keys=True).encode('utf-8')).digest()
+
+
+def _to_le_bytes(column):
+    if sys.byteorder == 'big':
+        column = array(column.typecode, column)
+        column.byteswap()
+    return column.tobytes()
+
+
+def _from_le_bytes(typecode, data):
+    column = array(typecode)
+    column.frombytes(data)
+    if sys.byteorder == 'big':
+        column.byteswap()
+    return column
+
+
+class CheckpointStore:
+    """적재가 끝난 상태를 압축된 바이너리 스냅숏으로 저장하고 다시 불러온다
+
+    저장 내용: 이름 표, 요일별 출석 행렬, 보너스 전 포인트, 수요일/주말 횟수,
+    처리한 입력 바이트 위치와 그 앞부분의 해시, 규칙 지문.
+    앞부분 내용이나 규칙이 바뀌면 스냅숏은 자동으로 무효가 된다.
+    """
+    MAGIC = b'ATSN'
+    VERSION = 1
+    HEADER = struct.Struct('<4sI32s32sQQQQ')
+
+    def __init__(self, snapshot_path):
+        self.snapshot_path = snapshot_path
+
+    def save(self, system, offset, prefix_hash, line_count):
+        rows = system.user_id_cnt + 1
+        num_days = system.NUM_DAYS
+        names = '\n'.join(system.names[1:rows]).encode('utf-8')
+        base_points = array(POINT_TYPECODE, (system.points[i] - system.bonus_points[i] for i in range(rows)))
+
+        temp_path = f"{self.snapshot_path}.tmp"
+        with open(temp_path, 'wb') as f:
+            f.write(self.HEADER.pack(self.MAGIC, self.VERSION, rules_fingerprint(system), prefix_hash,
+                                     offset, line_count, system.user_id_cnt, len(names)))
+            f.write(names)
+            f.write(_to_le_bytes(system.attendance_by_day.data[:rows * num_days]))
+            f.write(_to_le_bytes(base_points))
+            f.write(_to_le_bytes(system.wednesday_attendance_count[:rows]))
+            f.write(_to_le_bytes(system.weekend_attendance_count[:rows]))
+        os.replace(temp_path, self.snapshot_path)
+
+    def _read(self, system):
+        try:
+            with open(self.snapshot_path, 'rb') as f:
+                data = f.read()
+        except FileNotFoundError:
+            return None
+        if len(data) < self.HEADER.size:
+            return None
+        magic, version, fingerprint, prefix_hash, offset, line_count, user_count, names_length = \
+            self.HEADER.unpack_from(data, 0)
+        if magic != self.MAGIC or version != self.VERSION or fingerprint != rules_fingerprint(system):
+            return None
+
+        rows = user_count + 1
+        num_days = system.NUM_DAYS
+        sizes = [names_length, 4 * rows * num_days, 8 * rows, 4 * rows, 4 * rows]
+        if len(data) != self.HEADER.size + sum(sizes):
+            return None
+        sections, position = [], self.HEADER.size
+        for size in sizes:
+            sections.append(data[position:position + size])
+            position += size
+        return prefix_hash, offset, line_count, user_count, sections
+
+    def load(self, system, file_path):
+        """스냅숏이 유효하면 상태를 복원하고 (바이트 위치, 줄 수, 앞부분 해셔)를 반환한다
+
+        유효하지 않으면 상태를 바꾸지 않고 (0, 0, 빈 해셔)를 반환한다.
+        """
+        if system.user_id_cnt != 0:
+            raise ValueError("스냅숏은 비어 있는 AttendanceSystem에만 불러올 수 있습니다")
+        snapshot = self._read(system)
+        if snapshot is None or os.path.getsize(file_path) < snapshot[1]:
+            return 0, 0, _hasher()
+
+        prefix_hash, offset, line_count, user_count, sections = snapshot
+        hasher = _hasher()
+        with open(file_path, 'rb') as f:
+            remaining = offset
+            while remaining:
+                chunk = f.read(min(HASH_CHUNK_SIZE, remaining))
+                if not chunk:
+                    break
+                hasher.update(chunk)
+                remaining -= len(chunk)
+        if hasher.digest() != prefix_hash:
+            return 0, 0, _hasher()
+
+        names, matrix, base_points, wednesday, weekend = sections
+        for user_name in (names.decode('utf-8').split('\n') if user_count else []):
+            system.get_or_create_user_id(user_name)
+        rows = user_count + 1
+        system.attendance_by_day.data[:rows * system.NUM_DAYS] = _from_le_bytes(DAY_COUNT_TYPECODE, matrix)
+        system.points[:rows] = _from_le_bytes(POINT_TYPECODE, base_points)
+        system.wednesday_attendance_count[:rows] = _from_le_bytes(COUNT_TYPECODE, wednesday)
+        system.weekend_attendance_count[:rows] = _from_le_bytes(COUNT_TYPECODE, weekend)
+        return offset, line_count, hasher
+
+
+def ingest_incremental(system, file_path, snapshot_path):
+    """스냅숏 이후에 추가된 줄만 적재하고 새 스냅숏을 저장한다
+
+    아직 줄바꿈이 오지 않은 마지막 줄은 다음 실행으로 넘긴다.
+    """
+    from .bulk_ingest import BulkIngestEngine
+    from .compressed_input import detect_compression
+
+    if detect_compression(file_path) is not None:
+        raise ValueError("압축된 입력은 바이트 위치로 이어서 읽을 수 없습니다")
+    store = CheckpointStore(snapshot_path)
+    offset, line_count, hasher = store.load(system, file_path)
+
+    with open(file_path, 'rb') as f:
+        f.seek(offset)
+        tail = f.read()
+    end = tail.rfind(b'\n') + 1
+    tail = tail[:end]
+    hasher.update(tail)
+
+    text = tail.decode('utf-8').replace('\r\n', '\n').replace('\r', '\n')
+    # 복원한 상태는 이번 실행에서 읽은 줄이 아니므로 카운터는 복원 뒤부터 센다
+    with system.stats.ingest_counters(system):
+        BulkIngestEngine(system).ingest_text(text, first_line_no=line_count + 1)
+    line_count += text.count('\n')
+
+    store.save(system, offset + end, hasher.digest(), line_count)
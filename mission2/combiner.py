@@ -0,0 +1,88 @@
+from collections import Counter
+
+from .day_factory import InvalidDataError
+from .stats import BAD_FORMAT, UNKNOWN_DAY
+
+DEFAULT_MAX_PAIRS = 65536
+DEFAULT_MAX_LINES = 1 << 20
+
+
+class AttendanceCombiner:
+    """record_attendance 앞에서 같은 줄을 (이름, 요일) -> 횟수로 모아 한 번씩 반영하는 결합 단계
+
+    서로 다른 줄이 max_pairs개가 되거나 모은 줄이 max_lines줄이 되면 비우므로 메모리는 상한 안에 머문다.
+    비울 때는 처음 등장한 순서대로 반영하므로 사용자 ID 순서가 줄 단위 적재와 같다.
+    줄마다 드는 파이썬 작업은 Counter 갱신 하나이고, 전략 실행은 서로 다른 쌍의 수만큼만 한다.
+    잘못된 줄의 경고는 원래 줄 번호로 남기기 위해 비울 때 해당 묶음을 한 번 더 훑어 출력한다.
+    """
+
+    def __init__(self, system, max_pairs=None, max_lines=None):
+        self.max_pairs = DEFAULT_MAX_PAIRS if max_pairs is None else max_pairs
+        self.max_lines = DEFAULT_MAX_LINES if max_lines is None else max_lines
+        if self.max_pairs < 1 or self.max_lines < 1:
+            raise ValueError("결합 단계의 상한은 1 이상이어야 합니다")
+        self.system = system
+        self.flushes = 0
+        self._counts = Counter()
+        self._lines = []
+        self._first_line_no = 1
+
+    def add(self, line):
+        self._counts[line] += 1
+        self._lines.append(line)
+        if len(self._counts) >= self.max_pairs or len(self._lines) >= self.max_lines:
+            self.flush()
+
+    def add_lines(self, lines):
+        for line in lines:
+            self.add(line)
+
+    def flush(self):
+        if not self._lines:
+            return
+        system = self.system
+        day_table = system.day_table
+        has_invalid_line = False
+        for line, count in self._counts.items():
+            parts = line.split()
+            if len(parts) != 2:
+                has_invalid_line = True
+                continue
+            user_name, day_of_week = parts
+            if day_of_week not in day_table:
+                # 경고는 아래에서 줄 순서대로 내고, 사용자는 줄 단위 적재처럼 여기서 만든다
+                try:
+                    system.day_factory.get_strategy(day_of_week)
+                except InvalidDataError:
+                    system.get_or_create_user_id(user_name)
+                    has_invalid_line = True
+                    continue
+            system.record_attendance(user_name, day_of_week, count=count)
+
+        if has_invalid_line:
+            self._warn_invalid_lines()
+        system.stats.count("lines_read", len(self._lines))
+        system.stats.count("combined_lines", len(self._lines) - len(self._counts))
+        self.flushes += 1
+        self._first_line_no += len(self._lines)
+        self._counts = Counter()
+        self._lines = []
+
+    def _warn_invalid_lines(self):
+        system = self.system
+        for line_no, line in enumerate(self._lines, self._first_line_no):
+            parts = line.split()
+            if len(parts) != 2:
+                system.warn(f"잘못된 형식의 데이터: '{line.strip()}'", line_no, BAD_FORMAT, line)
+            elif parts[1] not in system.day_table:
+                try:
+                    system.day_factory.get_strategy(parts[1])
+                except InvalidDataError as e:
+                    system.warn(e, line_no, UNKNOWN_DAY, line)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.flush()
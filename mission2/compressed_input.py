@@ -0,0 +1,126 @@
+import io
+import sys
+from contextlib import contextmanager
+
+# 압축 형식 -> (매직 바이트, 압축 해제 모듈). 모듈은 압축 파일을 만났을 때만 불러온다 (시작 시간)
+# gzip은 압축 방식(deflate)까지 본다. bz2의 'BZh'는 평문 이름(예: BZhang)과 겹치므로 _is_bz2에서 더 확인한다
+COMPRESSION_FORMATS = {
+    "gzip": (b'\x1f\x8b\x08', "gzip"),
+    "bz2": (b'BZh', "bz2"),
+    "xz": (b'\xfd7zXZ\x00', "lzma"),
+}
+# bz2 헤더 'BZh' + 블록 크기('1'~'9') 다음에 오는 첫 블록 또는 스트림 끝(빈 입력) 매직
+BZ2_BLOCK_MAGICS = (b'1AY&SY', b'\x17rE8P\x90')
+CHUNK_SIZE = 1 << 20
+QUEUE_CHUNKS = 8
+
+
+def detect_compression(file_path):
+    """파일 앞부분의 매직 바이트로 압축 형식 이름을 찾는다. 압축되지 않았으면 None"""
+    with open(file_path, 'rb') as f:
+        head = f.read(10)
+    for name, (magic, _) in COMPRESSION_FORMATS.items():
+        if head.startswith(magic) and (name != "bz2" or _is_bz2(head)):
+            return name
+    return None
+
+
+def _is_bz2(head):
+    return len(head) == 10 and head[3:4] in b'123456789' and head[4:] in BZ2_BLOCK_MAGICS
+
+
+class DecompressingReader(io.RawIOBase):
+    """별도 스레드에서 압축을 풀어 크기가 정해진 대기열로 넘겨받는 읽기 전용 파일 객체
+
+    대기열이 가득 차면 압축 해제 스레드가 기다리므로 메모리는 chunk_size * queue_chunks를 넘지 않는다.
+    zlib/bz2/lzma는 압축을 푸는 동안 GIL을 놓으므로 압축 해제와 파싱이 겹쳐 실행된다.
+    """
+
+    def __init__(self, file_path, compression, chunk_size=CHUNK_SIZE, queue_chunks=QUEUE_CHUNKS):
+        import importlib
+        import queue
+        import threading
+        super().__init__()
+        self._full = queue.Full
+        self._queue = queue.Queue(maxsize=queue_chunks)
+        self._pending = memoryview(b'')
+        self._finished = False
+        self._stop = threading.Event()
+        opener = importlib.import_module(COMPRESSION_FORMATS[compression][1]).open
+        self._thread = threading.Thread(target=self._produce, args=(file_path, opener, chunk_size), daemon=True)
+        self._thread.start()
+
+    def _produce(self, file_path, opener, chunk_size):
+        try:
+            with opener(file_path, 'rb') as f:
+                while not self._stop.is_set():
+                    chunk = f.read(chunk_size)
+                    if not chunk:
+                        break
+                    self._put(chunk)
+        except Exception as e:
+            self._put(e)
+            return
+        self._put(None)
+
+    def _put(self, item):
+        # 읽는 쪽이 먼저 닫히면 대기열이 더 비지 않으므로 멈춤 신호를 확인하며 기다린다
+        while not self._stop.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return
+            except self._full:
+                continue
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        while not self._pending:
+            if self._finished:
+                return 0
+            item = self._queue.get()
+            if item is None:
+                self._finished = True
+                return 0
+            if isinstance(item, Exception):
+                self._finished = True
+                raise item
+            self._pending = memoryview(item)
+        size = min(len(buffer), len(self._pending))
+        buffer[:size] = self._pending[:size]
+        self._pending = self._pending[size:]
+        return size
+
+    def close(self):
+        if not self.closed:
+            self._stop.set()
+            self._thread.join()
+        super().close()
+
+
+@contextmanager
+def open_stdin_text(encoding='utf-8'):
+    """표준 입력을 파일 입력과 같은 인코딩의 텍스트로 읽는다 (로케일 인코딩을 따르지 않는다)
+
+    끝나면 감싼 객체만 떼어 내므로 sys.stdin은 닫히지 않는다.
+    """
+    buffer = getattr(sys.stdin, 'buffer', None)
+    if buffer is None:
+        # 테스트 등에서 텍스트 스트림으로 바꿔 둔 표준 입력은 그대로 쓴다
+        yield sys.stdin
+        return
+    stream = io.TextIOWrapper(buffer, encoding=encoding)
+    try:
+        yield stream
+    finally:
+        stream.detach()
+
+
+def open_text(file_path, encoding='utf-8'):
+    """압축 여부를 자동으로 판단해 텍스트 모드 파일 객체를 연다 (줄바꿈 처리는 open과 같다)"""
+    compression = detect_compression(file_path)
+    if compression is None:
+        return open(file_path, 'r', encoding=encoding)
+    raw = DecompressingReader(file_path, compression)
+    return io.TextIOWrapper(io.BufferedReader(raw, CHUNK_SIZE), encoding=encoding)
@@ -1,4 +1,4 @@
-from day_strategies import SimpleDayStrategy, WednesdayStrategy, WeekendStrategy
+from .day_strategies import SimpleDayStrategy, WednesdayStrategy, WeekendStrategy
 
 class InvalidDataError(Exception):
     """유효하지 않은 입력 데이터에 대한 커스텀 예외"""
@@ -15,14 +15,49 @@ class DayStrategyFactory:
         "sunday": {"index": 6, "add_point": 2, "is_weekend": True},
     }
 
-    def get_strategy(self, day_of_week):
-        info = self.DAY_INFO.get(day_of_week)
-        if not info:
-            raise InvalidDataError(f"알 수 없는 요일: '{day_of_week}'")
+    # 기본 전략 -> 함께 증가시키는 카운터 플래그
+    BUILTIN_FLAGS = {SimpleDayStrategy: None, WednesdayStrategy: "wednesday", WeekendStrategy: "weekend"}
+
+    def __init__(self, day_info=None):
+        if day_info is not None:
+            self.DAY_INFO = day_info
+        # 전략은 상태가 없으므로 요일별로 한 번만 만들어 재사용한다
+        self._strategies = {day: self._create_strategy(info) for day, info in self.DAY_INFO.items()}
 
+    @staticmethod
+    def _create_strategy(info):
         if info.get("is_wednesday"):
             return WednesdayStrategy(info)
         elif info.get("is_weekend"):
             return WeekendStrategy(info)
         else:
-            return SimpleDayStrategy(info)
\ No newline at end of file
+            return SimpleDayStrategy(info)
+
+    def get_strategy(self, day_of_week):
+        strategy = self._strategies.get(day_of_week)
+        if strategy is None:
+            raise InvalidDataError(f"알 수 없는 요일: '{day_of_week}'")
+        return strategy
+
+    def register_strategy(self, day_of_week, strategy):
+        """요일에 사용자 정의 전략을 등록한다"""
+        self._strategies[day_of_week] = strategy
+
+    def compile(self):
+        """요일 토큰 -> (인덱스, 포인트, 카운터 플래그, 사용자 정의 전략) 표를 만든다
+
+        기본 전략은 표 조회만으로 처리할 수 있도록 값을 펼치고,
+        사용자 정의 전략은 그대로 넘겨 execute로 처리하게 한다.
+        get_strategy를 재정의한 하위 클래스는 None을 돌려주어 항상 get_strategy를 거치게 한다.
+        """
+        if type(self).get_strategy is not DayStrategyFactory.get_strategy:
+            return None
+        table = {}
+        for day_of_week, strategy in self._strategies.items():
+            strategy_type = type(strategy)
+            if strategy_type in self.BUILTIN_FLAGS:
+                table[day_of_week] = (strategy.index, strategy.add_point,
+                                      self.BUILTIN_FLAGS[strategy_type], None)
+            else:
+                table[day_of_week] = (None, None, None, strategy)
+        return table
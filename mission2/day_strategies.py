@@ -3,31 +3,41 @@ from abc import ABC, abstractmethod
 class AttendanceStrategy(ABC):
     def __init__(self, day_info):
         self.day_info = day_info
+        self.index = day_info.get("index")
+        self.add_point = day_info.get("add_point")
 
     @abstractmethod
     def execute(self, user_id, system):
         pass
 
+    def execute_many(self, user_id, system, count):
+        # 기본 전략은 출석 count번을 한 번에 반영하고, count를 받지 않는 사용자 정의 전략은 count번 실행한다
+        if type(self).execute in COUNTED_EXECUTES:
+            self.execute(user_id, system, count)
+            return
+        for _ in range(count):
+            self.execute(user_id, system)
+
 
 class SimpleDayStrategy(AttendanceStrategy):
-    def execute(self, user_id, system):
-        index = self.day_info["index"]
-        add_point = self.day_info["add_point"]
-        system.attendance_by_day[user_id][index] += 1
-        system.points[user_id] += add_point
+    def execute(self, user_id, system, count=1):
+        system.attendance_by_day[user_id][self.index] += count
+        system.points[user_id] += self.add_point * count
 
 class WednesdayStrategy(AttendanceStrategy):
-    def execute(self, user_id, system):
-        index = self.day_info["index"]
-        add_point = self.day_info["add_point"]
-        system.attendance_by_day[user_id][index] += 1
-        system.points[user_id] += add_point
-        system.wednesday_attendance_count[user_id] += 1
+    def execute(self, user_id, system, count=1):
+        system.attendance_by_day[user_id][self.index] += count
+        system.points[user_id] += self.add_point * count
+        system.wednesday_attendance_count[user_id] += count
+        system.removed_players.discard(user_id)
 
 class WeekendStrategy(AttendanceStrategy):
-    def execute(self, user_id, system):
-        index = self.day_info["index"]
-        add_point = self.day_info["add_point"]
-        system.attendance_by_day[user_id][index] += 1
-        system.points[user_id] += add_point
-        system.weekend_attendance_count[user_id] += 1
\ No newline at end of file
+    def execute(self, user_id, system, count=1):
+        system.attendance_by_day[user_id][self.index] += count
+        system.points[user_id] += self.add_point * count
+        system.weekend_attendance_count[user_id] += count
+        system.removed_players.discard(user_id)
+
+
+# 출석 횟수(count)를 인자로 받는 execute
+COUNTED_EXECUTES = (SimpleDayStrategy.execute, WednesdayStrategy.execute, WeekendStrategy.execute)
@@ -0,0 +1,193 @@
+import math
+from collections import deque
+
+from .attendance import AttendanceSystem
+from .stats import BAD_FORMAT
+
+DEFAULT_EXPECTED_EVENTS = 1 << 20
+DEFAULT_ERROR_RATE = 0.001
+DEFAULT_RECENT_IDS = 65536
+# 조각이 가득 차면 다음 조각은 이만큼 크게, 오탐률은 이만큼 낮게 만든다
+SLICE_GROWTH = 2
+SLICE_TIGHTENING = 0.5
+
+
+class BloomFilter:
+    """기대 원소 수와 오탐률로 크기를 정하는 블룸 필터
+
+    원소마다 파이썬 hash 하나(64비트 SipHash)를 상/하위 32비트로 나눠 이중 해싱으로 k개 위치를 만든다.
+    hash는 프로세스마다 다르게 섞이므로 필터는 한 실행 안에서만 쓴다.
+    """
+
+    def __init__(self, expected_items, error_rate):
+        if expected_items < 1 or not 0 < error_rate < 1:
+            raise ValueError(f"잘못된 필터 크기: 원소 {expected_items}개, 오탐률 {error_rate}")
+        self.capacity = expected_items
+        self.error_rate = error_rate
+        self.size = max(8, math.ceil(-expected_items * math.log(error_rate) / math.log(2) ** 2))
+        self.hash_count = max(1, round(self.size / expected_items * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, value):
+        low, high = value & 0xFFFFFFFF, (value >> 32) & 0xFFFFFFFF | 1
+        size = self.size
+        return [(low + i * high) % size for i in range(self.hash_count)]
+
+    def add_hash(self, value):
+        """hash 값으로 원소를 넣고, 넣기 전에 이미 있었을 수 있으면 True를 돌려준다"""
+        bits = self.bits
+        present = True
+        for position in self._positions(value):
+            mask = 1 << (position & 7)
+            if not bits[position >> 3] & mask:
+                present = False
+                bits[position >> 3] |= mask
+        if not present:
+            self.count += 1
+        return present
+
+    def contains_hash(self, value):
+        bits = self.bits
+        return all(bits[position >> 3] & (1 << (position & 7)) for position in self._positions(value))
+
+    def add(self, item):
+        return self.add_hash(hash(item))
+
+    def __contains__(self, item):
+        return self.contains_hash(hash(item))
+
+    @property
+    def full(self):
+        return self.count >= self.capacity
+
+    def nbytes(self):
+        return len(self.bits)
+
+
+class ScalableBloomFilter:
+    """원소 수에 맞춰 조각을 늘려 가는 블룸 필터 (Almeida 외, Scalable Bloom Filters)
+
+    조각 하나가 기대 원소 수만큼 차면 SLICE_GROWTH배 크고 오탐률이 SLICE_TIGHTENING배인 조각을 붙인다.
+    조각별 오탐률의 합이 error_rate를 넘지 않으므로 기대보다 많은 이벤트가 와도 전체 오탐률이 지켜지고,
+    메모리는 이벤트 수에 비례해 늘어난다.
+    """
+
+    def __init__(self, initial_items, error_rate):
+        self.error_rate = error_rate
+        self.slices = [BloomFilter(initial_items, error_rate * (1 - SLICE_TIGHTENING))]
+
+    def add(self, item):
+        """원소를 넣고, 넣기 전에 이미 있었을 수 있으면 True를 돌려준다"""
+        value = hash(item)
+        slices = self.slices
+        for bloom in slices[:-1]:
+            if bloom.contains_hash(value):
+                return True
+        current = slices[-1]
+        if current.full:
+            if current.contains_hash(value):
+                return True
+            current = BloomFilter(current.capacity * SLICE_GROWTH, current.error_rate * SLICE_TIGHTENING)
+            slices.append(current)
+        return current.add_hash(value)
+
+    def __contains__(self, item):
+        value = hash(item)
+        return any(bloom.contains_hash(value) for bloom in self.slices)
+
+    def __len__(self):
+        return sum(bloom.count for bloom in self.slices)
+
+    def nbytes(self):
+        return sum(bloom.nbytes() for bloom in self.slices)
+
+
+class DuplicateFilter:
+    """이벤트 ID의 중복 여부를 정해진 메모리 안에서 판단한다
+
+    최근 recent_size개의 ID는 정확히 기억해 바로 중복으로 판단하고, 그보다 오래된 ID는 블룸 필터로 판단한다.
+    필터가 처음 보는 ID라고 하면 확실히 새 ID이고, 이미 있다고 하면 error_rate 이하의 확률로 오탐이다.
+    expected_events는 첫 조각의 크기일 뿐이며, 넘어서면 필터가 조각을 늘린다.
+    """
+
+    def __init__(self, expected_events=DEFAULT_EXPECTED_EVENTS, error_rate=DEFAULT_ERROR_RATE,
+                 recent_size=DEFAULT_RECENT_IDS):
+        self.bloom = ScalableBloomFilter(expected_events, error_rate)
+        self.recent_size = recent_size
+        self._recent = set()
+        self._recent_order = deque()
+        self.exact_hits = 0
+        # 최근 목록에는 없고 필터만 보고 걸러 낸 중복 (이 중 일부는 오탐일 수 있다)
+        self.probable_hits = 0
+
+    def seen(self, event_id):
+        """이미 본 ID면 True. 처음 보는 ID는 기억해 두고 False를 돌려준다"""
+        if event_id in self._recent:
+            self.exact_hits += 1
+            return True
+        maybe_seen = self.bloom.add(event_id)
+        self._recent.add(event_id)
+        self._recent_order.append(event_id)
+        if len(self._recent_order) > self.recent_size:
+            self._recent.discard(self._recent_order.popleft())
+        if maybe_seen:
+            self.probable_hits += 1
+        return maybe_seen
+
+    @property
+    def suppressed(self):
+        return self.exact_hits + self.probable_hits
+
+    def nbytes(self):
+        return self.bloom.nbytes()
+
+
+class DedupAttendanceSystem(AttendanceSystem):
+    """같은 이벤트 ID의 출석을 한 번만 반영하는 시스템 (같은 배치를 다시 받아도 결과가 같다)
+
+    입력 형식은 "이름 요일 이벤트ID"이다. 중복 이벤트는 형식 검사 다음, 요일 검사 전에 걸러 내므로
+    다시 받은 잘못된 요일 줄도 경고를 반복하지 않는다. ID가 없는 기존 형식은 그대로 반영한다.
+    중복 판단에는 줄 내용이 아니라 ID만 쓰므로 줄 단위 적재만 지원한다.
+    """
+
+    def __init__(self, rules=None, expected_events=DEFAULT_EXPECTED_EVENTS, error_rate=DEFAULT_ERROR_RATE,
+                 recent_size=DEFAULT_RECENT_IDS, **options):
+        self.duplicates = DuplicateFilter(expected_events, error_rate, recent_size)
+        super().__init__(rules, **options)
+
+    def process_line(self, line, line_no=None):
+        parts = line.split()
+        if len(parts) == 2:
+            super().process_line(line, line_no)
+            return
+        if len(parts) != 3:
+            self.warn(f"잘못된 형식의 데이터: '{line.strip()}'", line_no, BAD_FORMAT, line)
+            return
+        user_name, day_of_week, event_id = parts
+        if self.duplicates.seen(event_id):
+            self.stats.count("duplicate_records")
+            return
+        self.record_attendance(user_name, day_of_week, line_no, line=line)
+
+    def _ingest(self, file_path, mode, workers):
+        if mode != "line":
+            raise ValueError(f"중복 제거 모드는 줄 단위 적재만 지원합니다: '{mode}'")
+        super()._ingest(file_path, mode, workers)
+
+    def ingest_stream(self, stream, mode="line"):
+        if mode != "line":
+            raise ValueError(f"중복 제거 모드는 줄 단위 적재만 지원합니다: '{mode}'")
+        super().ingest_stream(stream, mode)
+
+    def ingest_files(self, patterns, workers=None):
+        # 파일 단위 병렬 집계는 이벤트 ID를 보지 않으므로 파일을 차례로 줄 단위 적재한다
+        from .batch import expand_inputs
+        for file_path in expand_inputs(patterns):
+            self.ingest(file_path)
+
+    def print_ingest_summary(self):
+        super().print_ingest_summary()
+        duplicates = self.duplicates
+        if duplicates.suppressed:
+            print(f"중복 이벤트 {duplicates.suppressed}건 생략 (필터로만 판단 {duplicates.probable_hits}건)")
@@ -0,0 +1,111 @@
+import io
+import os
+import sys
+import time
+from collections import namedtuple
+
+from .attendance import AttendanceSystem, Grade
+
+# kind가 "grade"이면 before/after는 등급 이름, "removed"이면 탈락 후보 여부
+FollowEvent = namedtuple("FollowEvent", "user_name kind before after")
+
+
+class AttendanceFollower:
+    """커지는 출석 로그를 따라가며 새 줄만 반영하고 등급/탈락 후보 변화를 이벤트로 알린다
+
+    줄마다 해당 사용자의 보너스와 등급만 다시 계산한다.
+    보너스 계산은 사용자별로 멱등이므로 반복해서 다시 계산해도 포인트가 중복되지 않는다.
+    """
+
+    def __init__(self, system, file_path, offset=0, poll_interval=0.5):
+        self.system = system
+        self.file_path = file_path
+        self.offset = offset
+        self.poll_interval = poll_interval
+        self.last_poll_lines = 0  # 마지막 poll에서 읽은 줄 수
+
+    def _state(self, user_id):
+        if user_id is None:
+            # 아직 없는 사용자는 출석이 없는 사용자와 같은 상태로 본다
+            return Grade.NORMAL.name, True
+        return Grade(self.system.grade[user_id]).name, self.system.is_removed_candidate(user_id)
+
+    def apply_line(self, line):
+        """한 줄을 반영하고 발생한 이벤트 목록을 반환한다"""
+        system = self.system
+        parts = line.split()
+        if len(parts) != 2:
+            system.process_line(line)
+            return []
+
+        user_name = parts[0]
+        before_grade, before_removed = self._state(system.user_name_to_id.get(user_name))
+        system.process_line(line)
+        user_id = system.user_name_to_id[user_name]
+        system.calculate_bonus_points(user_id)
+        system.determine_grade(user_id)
+        after_grade, after_removed = self._state(user_id)
+
+        events = []
+        if before_grade != after_grade:
+            events.append(FollowEvent(user_name, "grade", before_grade, after_grade))
+        if before_removed != after_removed:
+            events.append(FollowEvent(user_name, "removed", before_removed, after_removed))
+        return events
+
+    def _read_new_lines(self):
+        size = os.path.getsize(self.file_path)
+        if size < self.offset:
+            raise ValueError(f"로그 파일이 줄어들었습니다: {self.file_path}")
+        if size == self.offset:
+            return []
+        with open(self.file_path, 'rb') as f:
+            f.seek(self.offset)
+            data = f.read(size - self.offset)
+        # 아직 줄바꿈이 오지 않은 마지막 줄은 다음 번에 읽는다
+        end = data.rfind(b'\n') + 1
+        self.offset += end
+        return list(io.TextIOWrapper(io.BytesIO(data[:end]), encoding='utf-8'))
+
+    def catch_up(self):
+        """지금까지 쌓인 줄을 이벤트 없이 반영하고 전체 사용자를 마감한다"""
+        for line in self._read_new_lines():
+            self.system.process_line(line)
+        self.system.finalize()
+
+    def poll(self):
+        """새 줄을 반영하고 이벤트 목록을 반환한다. 읽은 줄 수는 last_poll_lines에 남긴다"""
+        lines = self._read_new_lines()
+        self.last_poll_lines = len(lines)
+        events = []
+        for line in lines:
+            events.extend(self.apply_line(line))
+        return events
+
+    def follow(self, on_event, max_idle=None):
+        """로그를 계속 따라간다. max_idle초 동안 새 줄이 없으면 멈춘다"""
+        idle = 0.0
+        while max_idle is None or idle < max_idle:
+            for event in self.poll():
+                on_event(event)
+            # 이벤트가 없어도 새 줄이 들어왔으면 쉬지 않고 다시 읽는다
+            if self.last_poll_lines:
+                idle = 0.0
+            else:
+                time.sleep(self.poll_interval)
+                idle += self.poll_interval
+
+
+def print_event(event):
+    if event.kind == "grade":
+        print(f"GRADE : {event.user_name}, {event.before} -> {event.after}")
+    elif event.after:
+        print(f"REMOVED CANDIDATE : {event.user_name}")
+    else:
+        print(f"NOT REMOVED CANDIDATE : {event.user_name}")
+
+
+if __name__ == "__main__":
+    follower = AttendanceFollower(AttendanceSystem(), sys.argv[1] if len(sys.argv) > 1 else "attendance_weekday_500.txt")
+    follower.catch_up()
+    follower.follow(print_event)
@@ -1,4 +1,4 @@
-from grading_strategies import NormalGradingStrategy, SilverGradingStrategy, GoldGradingStrategy
+from .grading_strategies import NormalGradingStrategy, SilverGradingStrategy, GoldGradingStrategy, Grade
 
 
 GOLD_GRADE_POINT = 50
@@ -6,10 +6,28 @@ SILVER_GRADE_POINT = 30
 
 class GradingStrategyFactory:
 
+    def __init__(self, gold_grade_point=GOLD_GRADE_POINT, silver_grade_point=SILVER_GRADE_POINT):
+        self.gold_grade_point = gold_grade_point
+        self.silver_grade_point = silver_grade_point
+        # 등급 전략은 상태가 없으므로 한 번만 만들어 재사용한다
+        self._gold = GoldGradingStrategy()
+        self._silver = SilverGradingStrategy()
+        self._normal = NormalGradingStrategy()
+
     def get_strategy(self, user_points):
-        if user_points >= GOLD_GRADE_POINT:
-            return GoldGradingStrategy()
-        elif user_points >= SILVER_GRADE_POINT:
-            return SilverGradingStrategy()
+        if user_points >= self.gold_grade_point:
+            return self._gold
+        elif user_points >= self.silver_grade_point:
+            return self._silver
         else:
-            return NormalGradingStrategy()
\ No newline at end of file
+            return self._normal
+
+
+    def compile(self):
+        """등급 기준을 높은 순서의 (기준 포인트, 등급 값) 목록으로 만든다
+
+        get_strategy를 재정의한 하위 클래스는 None을 돌려주어 전략 객체로 등급을 정하게 한다.
+        """
+        if type(self).get_strategy is not GradingStrategyFactory.get_strategy:
+            return None
+        return [(self.gold_grade_point, Grade.GOLD.value), (self.silver_grade_point, Grade.SILVER.value)]
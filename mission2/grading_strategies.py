@@ -7,30 +7,37 @@ class Grade(Enum):
     GOLD = 1
 
 class GradingStrategy(ABC):
+    # 보고서에 쓰이는 등급. label은 출력용 이름이다
+    grade = None
+
+    @property
+    def label(self):
+        return self.grade.name
+
     @abstractmethod
     def determine(self, user_id, system):
         pass
+
     def print_summary(self, user_id, system):
-        pass
+        print(f"NAME : {system.names[user_id]}, POINT : {system.points[user_id]}, GRADE : {self.label}")
 
 class NormalGradingStrategy(GradingStrategy):
+    grade = Grade.NORMAL
+
     def determine(self, user_id, system):
         system.grade[user_id] = Grade.NORMAL.value
 
-    def print_summary(self, user_id, system):
-        print(f"NAME : {system.names[user_id]}, POINT : {system.points[user_id]}, GRADE : NORMAL")
-
 
 class SilverGradingStrategy(GradingStrategy):
+    grade = Grade.SILVER
+
     def determine(self, user_id, system):
         system.grade[user_id] = Grade.SILVER.value
-
-    def print_summary(self, user_id, system):
-        print(f"NAME : {system.names[user_id]}, POINT : {system.points[user_id]}, GRADE : SILVER")
+        system.removed_players.discard(user_id)
 
 class GoldGradingStrategy(GradingStrategy):
+    grade = Grade.GOLD
+
     def determine(self, user_id, system):
         system.grade[user_id] = Grade.GOLD.value
-
-    def print_summary(self, user_id, system):
-        print(f"NAME : {system.names[user_id]}, POINT : {system.points[user_id]}, GRADE : GOLD")
\ No newline at end of file
+        system.removed_players.discard(user_id)
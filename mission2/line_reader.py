@@ -0,0 +1,67 @@
+import mmap
+import os
+
+from .stats import BAD_FORMAT
+
+
+class MmapIngestEngine:
+    """입력 파일을 mmap으로 열어 바이트 단위로 줄과 단어를 나누는 적재 엔진
+
+    줄마다 str을 만들지 않고, 사용자 이름은 bytes 그대로 이름 표에서 ID를 찾는다.
+    요일 토큰은 미리 만든 bytes -> 규칙 표로 바로 찾는다.
+    단어 구분은 ASCII 공백 기준이며, 줄바꿈은 LF/CRLF를 지원한다.
+    """
+
+    def __init__(self, system):
+        self.system = system
+
+    def _byte_day_table(self):
+        return {day_of_week.encode('utf-8'): rule for day_of_week, rule in self.system.day_table.items()}
+
+    def ingest(self, file_path):
+        with open(file_path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                self._scan(mm)
+
+    def _scan(self, mm):
+        system = self.system
+        name_table = system.name_table
+        day_table = self._byte_day_table()
+        matrix = system.attendance_by_day.data
+        points = system.points
+        num_days = system.NUM_DAYS
+        discard_removed = system.removed_players.discard
+        mark_points = system.points_index.mark
+
+        line_no = 0
+        for raw in iter(mm.readline, b''):
+            line_no += 1
+            parts = raw.split()
+            if len(parts) != 2:
+                line = raw.decode('utf-8', errors='replace')
+                system.warn(f"잘못된 형식의 데이터: '{line.strip()}'", line_no, BAD_FORMAT, line)
+                continue
+
+            user_name, day_of_week = parts
+            user_id = name_table.get_id(user_name)
+            if user_id is None:
+                user_id = system.get_or_create_user_id_from_bytes(user_name)
+
+            rule = day_table.get(day_of_week)
+            if rule is None or rule[3] is not None:
+                # 알 수 없는 요일이면 격리 파일에 남길 원래 줄도 넘긴다
+                line = raw.decode('utf-8', errors='replace') if rule is None else None
+                system.dispatch_day_strategy(user_id, day_of_week.decode('utf-8', errors='replace'), line_no,
+                                             line=line)
+                continue
+
+            index, add_point, flag_column, _ = rule
+            matrix[user_id * num_days + index] += 1
+            points[user_id] += add_point
+            mark_points(user_id)
+            if flag_column is not None:
+                flag_column[user_id] += 1
+                discard_removed(user_id)
+        system.stats.count("lines_read", line_no)
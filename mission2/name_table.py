@@ -0,0 +1,171 @@
+from array import array
+
+EMPTY_SLOT = 0
+INITIAL_SLOTS = 1024
+# 최근에 찾은 이름 -> ID 캐시(str, bytes 각각)의 최대 크기. 가득 차면 비우고 다시 채운다
+RECENT_CACHE_SIZE = 1 << 16
+
+
+class NameTable:
+    """사용자 이름을 하나의 UTF-8 영역(arena)에 모아 두고 개방 주소법 해시로 ID를 찾는 표
+
+    ID는 1부터 시작하는 밀집 번호이며, 0번은 빈 이름으로 예약한다.
+    - arena: 이름 UTF-8 바이트를 이어 붙인 영역
+    - offsets: ID별 arena 시작 위치 (ID k의 이름은 offsets[k]:offsets[k + 1])
+    - hashes: ID별 해시 값 (재배치와 비교에 사용)
+    - slots: 선형 탐사 해시 색인, 빈 칸은 0
+    조회는 크기가 정해진 최근 이름 -> ID 캐시를 먼저 보므로 자주 나오는 이름은 해시 탐사를 건너뛴다.
+    ID는 바뀌지 않으므로 캐시는 무효화할 필요가 없고, 메모리는 RECENT_CACHE_SIZE개를 넘지 않는다.
+    ASCII 이름은 str과 bytes의 해시가 같으므로 한 dict에 섞으면 서로 부딪쳐 str과 bytes를 비교하게 된다.
+    그래서 str 이름과 bytes 이름의 캐시를 따로 둔다.
+    """
+
+    def __init__(self):
+        self.arena = bytearray()
+        self.offsets = array('q', [0, 0])
+        self.hashes = array('q', [0])
+        self.slots = array('i', bytes(4 * INITIAL_SLOTS))
+        self.count = 0
+        self._recent_ids = {}
+        self._recent_byte_ids = {}
+
+    def __len__(self):
+        return self.count
+
+    def _find_slot(self, name_bytes, name_hash):
+        slots, hashes, offsets = self.slots, self.hashes, self.offsets
+        length = len(name_bytes)
+        mask = len(slots) - 1
+        i = name_hash & mask
+        while True:
+            user_id = slots[i]
+            if user_id == EMPTY_SLOT:
+                return i, None
+            if hashes[user_id] == name_hash:
+                # 잘라 낸 복사본을 만들지 않고 arena 안에서 바로 비교한다
+                start = offsets[user_id]
+                if offsets[user_id + 1] - start == length and self.arena.startswith(name_bytes, start):
+                    return i, user_id
+            i = (i + 1) & mask
+
+    def get_id(self, name_bytes):
+        """UTF-8 이름 bytes로 ID를 찾는다. 없으면 None"""
+        user_id = self._recent_byte_ids.get(name_bytes)
+        if user_id is None:
+            user_id = self._find_slot(name_bytes, hash(name_bytes))[1]
+            if user_id is not None:
+                _remember(self._recent_byte_ids, name_bytes, user_id)
+        return user_id
+
+    def add(self, name_bytes):
+        """이름을 추가하고 ID를 반환한다. 이미 있으면 기존 ID를 반환한다"""
+        name_hash = hash(name_bytes)
+        slot, user_id = self._find_slot(name_bytes, name_hash)
+        if user_id is not None:
+            return user_id
+
+        self.count += 1
+        user_id = self.count
+        self.arena += name_bytes
+        self.offsets.append(len(self.arena))
+        self.hashes.append(name_hash)
+        self.slots[slot] = user_id
+        # 사용률이 절반을 넘으면 색인을 2배로 늘린다
+        if self.count * 2 > len(self.slots):
+            self._resize(len(self.slots) * 2)
+        return user_id
+
+    def _resize(self, size):
+        slots = array('i', bytes(4 * size))
+        mask = size - 1
+        for user_id in range(1, self.count + 1):
+            i = self.hashes[user_id] & mask
+            while slots[i] != EMPTY_SLOT:
+                i = (i + 1) & mask
+            slots[i] = user_id
+        self.slots = slots
+
+    def name_bytes(self, user_id):
+        return bytes(self.arena[self.offsets[user_id]:self.offsets[user_id + 1]])
+
+    def name(self, user_id):
+        if not 0 <= user_id <= self.count:
+            raise IndexError(f"사용자 ID 범위 초과: {user_id}")
+        return self.arena[self.offsets[user_id]:self.offsets[user_id + 1]].decode('utf-8')
+
+    def nbytes(self):
+        return len(self.arena) + sum(column.itemsize * len(column)
+                                     for column in (self.offsets, self.hashes, self.slots))
+
+    def cached_id(self, user_name):
+        """최근 이름(str) 캐시만 본다. 없으면 None"""
+        return self._recent_ids.get(user_name)
+
+    def remember(self, user_name, user_id):
+        _remember(self._recent_ids, user_name, user_id)
+
+    # 이름(str) -> ID 매핑처럼 쓸 수 있게 한다 (기존 user_name_to_id 호환)
+    def get(self, user_name, default=None):
+        user_id = self._recent_ids.get(user_name)
+        if user_id is None:
+            user_id = self.get_id(user_name.encode('utf-8'))
+            if user_id is None:
+                return default
+            _remember(self._recent_ids, user_name, user_id)
+        return user_id
+
+    def __getitem__(self, user_name):
+        user_id = self.get(user_name)
+        if user_id is None:
+            raise KeyError(user_name)
+        return user_id
+
+    def __contains__(self, user_name):
+        return self.get(user_name) is not None
+
+    def __iter__(self):
+        for user_id in range(1, self.count + 1):
+            yield self.name(user_id)
+
+    def keys(self):
+        return iter(self)
+
+    def items(self):
+        for user_id in range(1, self.count + 1):
+            yield self.name(user_id), user_id
+
+
+def _remember(recent_ids, name, user_id):
+    if len(recent_ids) >= RECENT_CACHE_SIZE:
+        recent_ids.clear()
+    recent_ids[name] = user_id
+
+
+class NameList:
+    """NameTable을 ID -> 이름 목록처럼 보여주는 읽기 전용 뷰 (기존 names 호환, 0번은 빈 이름)"""
+
+    def __init__(self, table):
+        self.table = table
+
+    def __len__(self):
+        return self.table.count + 1
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self.table.name(user_id) for user_id in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        return self.table.name(index)
+
+    def __iter__(self):
+        for user_id in range(len(self)):
+            yield self.table.name(user_id)
+
+    def __eq__(self, other):
+        try:
+            return list(self) == list(other)
+        except TypeError:
+            return NotImplemented
+
+    def __repr__(self):
+        return f"NameList({list(self)!r})"
@@ -0,0 +1,239 @@
+import heapq
+import os
+import sys
+import tempfile
+import zlib
+
+from .attendance import AttendanceSystem
+from .bad_lines import BadLineLog
+from .compressed_input import detect_compression, open_text
+from .day_factory import InvalidDataError
+from .report import Report, ReportRow, StreamedReport, create_sink
+from .stats import BAD_FORMAT, UNKNOWN_DAY, builtin_dispatch_totals
+
+DEFAULT_MEMORY_LIMIT = 256 << 20
+# 모든 줄이 새 사용자일 때 파티션 하나를 적재/마감/보고서 행으로 만드는 데 드는 입력 1바이트당 메모리 (측정값 약 22)
+MEMORY_PER_INPUT_BYTE = 24
+# 압축 파일은 크기만으로 줄 수를 알 수 없으므로 이 비율로 풀린다고 본다
+ASSUMED_COMPRESSION_RATIO = 10
+# 파티션마다 쓰기 파일을 하나씩 열어 두므로 열린 파일 수의 상한이기도 하다
+MAX_PARTITIONS = 512
+SPILL_BUFFER_BYTES = 64 << 10
+MIN_SPILL_BUFFER_BYTES = 1 << 10
+# 상한의 절반은 열어 둔 파일의 버퍼에, 나머지 절반은 파티션 하나의 집계에 쓴다
+MIN_MEMORY_LIMIT = 2 * MAX_PARTITIONS * MIN_SPILL_BUFFER_BYTES
+# 파티션 번호는 이름의 crc32를 앞 단계 파티션 수의 곱으로 나눈 몫에서 고르므로 곱이 이 값을 넘으면 더 나눌 수 없다
+HASH_SPACE = 1 << 32
+STREAMED_FORMATS = ("text", "csv", "jsonl")
+
+
+def partition_count(file_path, memory_limit):
+    """입력 크기와 메모리 상한으로 파티션 수를 정한다. MAX_PARTITIONS를 넘어야 하면 나중에 파티션을 다시 나눈다"""
+    size = os.path.getsize(file_path)
+    if detect_compression(file_path) is not None:
+        size *= ASSUMED_COMPRESSION_RATIO
+    needed = -(-size * MEMORY_PER_INPUT_BYTE // (memory_limit // 2))
+    return max(1, min(MAX_PARTITIONS, needed))
+
+
+def spill_buffer_size(memory_limit, files):
+    """동시에 열어 둔 files개 파일의 버퍼 합이 상한의 절반을 넘지 않는 버퍼 크기"""
+    return max(MIN_SPILL_BUFFER_BYTES, min(SPILL_BUFFER_BYTES, memory_limit // (2 * files)))
+
+
+class MergedRows:
+    """파티션별 결과 파일을 첫 등장 줄 번호로 k-way 병합해 읽는 행 목록. 읽을 때마다 다시 병합한다"""
+
+    def __init__(self, run_paths, buffer_size=SPILL_BUFFER_BYTES):
+        self.run_paths = run_paths
+        self.buffer_size = buffer_size
+
+    @staticmethod
+    def _read_run(path, buffer_size):
+        with open(path, encoding='utf-8', buffering=buffer_size) as f:
+            for record in f:
+                yield int(record.split('\t', 1)[0]), record
+
+    def records(self):
+        """(첫 등장 줄 번호, 결과 파일의 한 줄)을 줄 번호 순서로 돌려준다"""
+        runs = [self._read_run(path, self.buffer_size) for path in self.run_paths]
+        return heapq.merge(*runs, key=lambda item: item[0])
+
+    def __iter__(self):
+        for _, record in self.records():
+            _, name, points, grade, label, removed = record.rstrip('\n').split('\t')
+            yield ReportRow(name, int(points), int(grade), label, removed == "1")
+
+
+class OutOfCoreAttendance:
+    """사용자가 메모리에 다 들어가지 않는 입력을 위한 외부 메모리 모드
+
+    1단계: 입력을 한 번 훑으며 잘못된 줄은 바로 경고하고, 나머지는 이름의 crc32로 파티션 파일에 나눠 쓴다.
+    2단계: 파티션마다 새 AttendanceSystem으로 적재/마감하고, 사용자별 결과를 첫 등장 줄 번호 순서로 결과 파일에 쓴다.
+    3단계: 결과 파일을 첫 등장 줄 번호로 k-way 병합해 메모리 백엔드와 같은 순서의 보고서를 쓴다.
+    한 번에 메모리에 있는 것은 파티션 하나뿐이므로 최대 메모리는 memory_limit(또는 partitions)로 정해진다.
+    MAX_PARTITIONS개로도 상한을 못 지키는 큰 입력은 상한을 넘는 파티션을 이름 해시의 다른 자리로 다시 나눈다.
+    열어 둔 파일의 버퍼도 상한 안에서 잡는다.
+    사용자 정의 전략은 파티션 시스템으로 넘길 수 있도록 RuleSet에 담긴 것만 지원한다.
+    """
+
+    def __init__(self, rules=None, memory_limit=DEFAULT_MEMORY_LIMIT, partitions=None, spill_dir=None,
+                 profile=False, warning_limit=BadLineLog.DEFAULT_SAMPLE_LIMIT, quarantine_path=None):
+        if memory_limit < MIN_MEMORY_LIMIT:
+            raise ValueError(f"메모리 상한은 {MIN_MEMORY_LIMIT}바이트 이상이어야 합니다: {memory_limit}")
+        if partitions is not None and not 1 <= partitions <= MAX_PARTITIONS:
+            raise ValueError(f"파티션 수는 1 이상 {MAX_PARTITIONS} 이하여야 합니다: {partitions}")
+        self.rules = rules
+        self.memory_limit = memory_limit
+        self.partitions = partitions
+        self.spill_dir = spill_dir
+        self.profile = profile
+        # 줄 검사와 경고, 통계는 빈 시스템 하나가 맡는다
+        self.system = AttendanceSystem(rules, warning_limit=warning_limit, quarantine_path=quarantine_path)
+        self.stats = self.system.stats
+        self.bad_lines = self.system.bad_lines
+
+    def partition(self, file_path, directory, partitions):
+        """입력을 이름 해시로 나눈 파티션 파일 경로 목록을 돌려준다"""
+        system = self.system
+        paths = [os.path.join(directory, f"part-{index:04d}.txt") for index in range(partitions)]
+        buffer_size = spill_buffer_size(self.memory_limit, partitions)
+        writers = [open(path, 'w', encoding='utf-8', buffering=buffer_size) for path in paths]
+        line_no = 0
+        try:
+            with open_text(file_path) as f:
+                for line_no, line in enumerate(f, 1):
+                    parts = line.split()
+                    if len(parts) != 2:
+                        system.warn(f"잘못된 형식의 데이터: '{line.strip()}'", line_no, BAD_FORMAT, line)
+                        continue
+                    user_name, day_of_week = parts
+                    writer = writers[zlib.crc32(user_name.encode('utf-8')) % partitions]
+                    if day_of_week not in system.day_table:
+                        try:
+                            system.day_factory.get_strategy(day_of_week)
+                        except InvalidDataError as e:
+                            system.warn(e, line_no, UNKNOWN_DAY, line)
+                            # 줄 단위 적재처럼 사용자는 만들되 요일은 반영하지 않는다
+                            writer.write(f"{line_no} {user_name}\n")
+                            continue
+                    writer.write(f"{line_no} {user_name} {day_of_week}\n")
+        finally:
+            for writer in writers:
+                writer.close()
+        self.stats.count("lines_read", line_no)
+        system.bad_lines.flush()
+        return paths
+
+    def split_partition(self, partition_path, divisor):
+        """상한을 넘는 파티션을 crc32 // divisor로 다시 나눠 (경로, 다음 divisor) 목록을 돌려준다
+
+        나눠도 한 파일에 모두 모이면 해시의 다음 자리로 다시 나누도록 파티션을 그대로 돌려주고,
+        더 나눌 해시 자리가 없으면(같은 이름뿐이라 사용자 수가 적으면) None을 돌려준다.
+        """
+        partitions = min(partition_count(partition_path, self.memory_limit), HASH_SPACE // divisor)
+        if partitions < 2:
+            return None
+        base = partition_path[:-len(".txt")]
+        paths = [f"{base}-{index:04d}.txt" for index in range(partitions)]
+        buffer_size = spill_buffer_size(self.memory_limit, partitions)
+        writers = [open(path, 'w', encoding='utf-8', buffering=buffer_size) for path in paths]
+        try:
+            with open(partition_path, encoding='utf-8') as f:
+                for record in f:
+                    user_name = record.split(None, 2)[1]
+                    writers[zlib.crc32(user_name.encode('utf-8')) // divisor % partitions].write(record)
+        finally:
+            for writer in writers:
+                writer.close()
+
+        if max(os.path.getsize(path) for path in paths) == os.path.getsize(partition_path):
+            for path in paths:
+                os.remove(path)
+            return [(partition_path, divisor * partitions)]
+        os.remove(partition_path)
+        self.stats.count("repartitioned")
+        return [(path, divisor * partitions) for path in paths]
+
+    def aggregate_partition(self, partition_path, run_path):
+        """파티션 하나를 적재/마감해 결과 파일로 쓰고 사용자 수를 돌려준다"""
+        system = AttendanceSystem(self.rules)
+        first_line_nos = []
+        with open(partition_path, encoding='utf-8') as f:
+            for record in f:
+                parts = record.split()
+                users_before = system.user_id_cnt
+                if len(parts) == 3:
+                    system.record_attendance(parts[1], parts[2])
+                else:
+                    system.get_or_create_user_id(parts[1])
+                if system.user_id_cnt != users_before:
+                    first_line_nos.append(parts[0])
+        system.finalize()
+        self.stats.dispatches.update(system.stats.dispatches + builtin_dispatch_totals(system))
+
+        rows = Report.from_system(system).rows
+        with open(run_path, 'w', encoding='utf-8', buffering=spill_buffer_size(self.memory_limit, 1)) as out:
+            for first_line_no, row in zip(first_line_nos, rows):
+                out.write(f"{first_line_no}\t{row.name}\t{row.points}\t{row.grade}\t{row.label}\t{int(row.removed)}\n")
+        return len(rows)
+
+    def build_report(self, file_path, directory):
+        partitions = self.partitions or partition_count(file_path, self.memory_limit)
+        self.stats.count("partitions", partitions)
+        with self.stats.phase("partition"):
+            partition_paths = self.partition(file_path, directory, partitions)
+        run_paths = []
+        with self.stats.phase("aggregate"):
+            # 결과 파일은 줄 번호로 병합하므로 다시 나눈 파티션을 어떤 순서로 집계해도 된다
+            pending = [(path, partitions) for path in partition_paths]
+            while pending:
+                partition_path, divisor = pending.pop()
+                if partition_count(partition_path, self.memory_limit) > 1:
+                    children = self.split_partition(partition_path, divisor)
+                    if children is not None:
+                        pending.extend(children)
+                        continue
+                run_path = partition_path[:-len(".txt")] + ".run"
+                self.stats.count("users_created", self.aggregate_partition(partition_path, run_path))
+                os.remove(partition_path)
+                run_paths.append(run_path)
+            run_paths = self.merge_runs(run_paths)
+        return StreamedReport(MergedRows(run_paths, spill_buffer_size(self.memory_limit, len(run_paths))))
+
+    def merge_runs(self, run_paths):
+        """다시 나눈 파티션으로 결과 파일이 MAX_PARTITIONS개를 넘으면 묶음별로 미리 병합해 동시에 여는 파일 수를 줄인다"""
+        while len(run_paths) > MAX_PARTITIONS:
+            merged_paths = []
+            for start in range(0, len(run_paths), MAX_PARTITIONS):
+                group = run_paths[start:start + MAX_PARTITIONS]
+                merged_path = group[0][:-len(".run")] + "-merged.run"
+                buffer_size = spill_buffer_size(self.memory_limit, len(group) + 1)
+                with open(merged_path, 'w', encoding='utf-8', buffering=buffer_size) as out:
+                    for _, record in MergedRows(group, buffer_size).records():
+                        out.write(record)
+                for path in group:
+                    os.remove(path)
+                merged_paths.append(merged_path)
+            run_paths = merged_paths
+        return run_paths
+
+    def run(self, file_path, output_format="text", stream=None):
+        if output_format not in STREAMED_FORMATS:
+            raise ValueError(f"외부 메모리 모드가 지원하지 않는 출력 형식: '{output_format}'")
+        try:
+            with tempfile.TemporaryDirectory(prefix="attendance-spill-", dir=self.spill_dir) as directory:
+                report = self.build_report(file_path, directory)
+                if self.bad_lines.suppressed:
+                    print(self.bad_lines.format_summary())
+                with self.stats.phase("report"):
+                    create_sink(output_format).write(report, stream)
+
+        except FileNotFoundError:
+            print(f"파일을 찾을 수 없습니다: {file_path}")
+            return False
+
+        finally:
+            if self.profile:
+                print(self.stats.format_summary(), file=sys.stderr)
+        return True
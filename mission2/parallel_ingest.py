@@ -0,0 +1,155 @@
+import io
+import os
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from functools import reduce
+
+from .stats import BAD_FORMAT, UNKNOWN_DAY
+
+# 사용자 집계 항목의 칸 위치: [첫 등장 위치, 포인트, 수요일 횟수, 주말 횟수, 요일별 횟수...]
+FIRST_SEEN, POINTS, WEDNESDAY_COUNT, WEEKEND_COUNT, DAY_COUNTS = 0, 1, 2, 3, 4
+
+
+class PartialAggregate:
+    """입력의 일부 구간을 집계한 결과
+
+    merge는 결합 법칙과 교환 법칙을 만족하므로 구간 결과를 어떤 순서로 합쳐도 같다.
+    첫 등장 위치는 (구간 시작 바이트, 구간 내 순번)이라 구간 사이에서도 비교할 수 있다.
+    """
+
+    def __init__(self, num_days):
+        self.num_days = num_days
+        self.users = {}
+        self.warnings = []  # (위치, 분류, 메시지, 원래 줄)
+        self.line_counts = {}  # 구간 시작 바이트 -> 줄 수 (경고 줄 번호 계산용)
+
+    def merge(self, other):
+        for user_name, entry in other.users.items():
+            mine = self.users.get(user_name)
+            if mine is None:
+                self.users[user_name] = list(entry)
+                continue
+            if entry[FIRST_SEEN] < mine[FIRST_SEEN]:
+                mine[FIRST_SEEN] = entry[FIRST_SEEN]
+            for i in range(POINTS, len(entry)):
+                mine[i] += entry[i]
+        self.warnings.extend(other.warnings)
+        self.line_counts.update(other.line_counts)
+        return self
+
+    def apply_to(self, system):
+        """경고를 입력 순서대로 출력하고, 사용자를 첫 등장 순서대로 시스템에 반영한다"""
+        lines_before, total = {}, 0
+        for start in sorted(self.line_counts):
+            lines_before[start] = total
+            total += self.line_counts[start]
+        system.stats.count("lines_read", total)
+        for (start, line_index), category, message, line in sorted(self.warnings):
+            system.warn(message, lines_before[start] + line_index + 1, category, line)
+
+        matrix = system.attendance_by_day.data
+        num_days = self.num_days
+        for user_name, entry in sorted(self.users.items(), key=lambda item: item[1][FIRST_SEEN]):
+            user_id = system.get_or_create_user_id(user_name)
+            system.points[user_id] += entry[POINTS]
+            system.points_index.mark(user_id)
+            system.wednesday_attendance_count[user_id] += entry[WEDNESDAY_COUNT]
+            system.weekend_attendance_count[user_id] += entry[WEEKEND_COUNT]
+            start = user_id * num_days
+            for index in range(num_days):
+                matrix[start + index] += entry[DAY_COUNTS + index]
+
+
+def portable_day_table(system):
+    """작업 프로세스로 넘길 수 있는 요일 토큰 -> (인덱스, 포인트, 카운터 플래그) 표"""
+    table = system.day_factory.compile()
+    if table is None or any(strategy is not None for *_, strategy in table.values()):
+        raise ValueError("병렬 적재는 사용자 정의 요일 전략을 지원하지 않습니다")
+    return {day_of_week: (index, add_point, flag) for day_of_week, (index, add_point, flag, _) in table.items()}
+
+
+def split_ranges(file_path, shard_count):
+    """파일을 줄바꿈 경계에 맞춘 (시작, 끝) 바이트 구간으로 나눈다"""
+    size = os.path.getsize(file_path)
+    bounds = [0]
+    with open(file_path, 'rb') as f:
+        for k in range(1, shard_count):
+            f.seek(size * k // shard_count)
+            f.readline()
+            position = f.tell()
+            if bounds[-1] < position < size:
+                bounds.append(position)
+    bounds.append(size)
+    return [(start, end) for start, end in zip(bounds, bounds[1:]) if start < end]
+
+
+def aggregate_range(file_path, start, end, day_table, num_days):
+    """파일의 [start, end) 구간을 읽어 PartialAggregate를 만든다 (작업 프로세스에서 실행)"""
+    with open(file_path, 'rb') as f:
+        f.seek(start)
+        data = f.read(end - start)
+    # 텍스트 모드와 같은 줄바꿈 처리를 위해 TextIOWrapper로 디코딩한다
+    lines = io.TextIOWrapper(io.BytesIO(data), encoding='utf-8').read().split('\n')
+    if lines[-1] == '':
+        lines.pop()
+    return aggregate_lines(lines, start, day_table, num_days)
+
+
+def aggregate_lines(lines, start, day_table, num_days):
+    """줄 목록을 집계한다. start는 첫 등장 위치와 경고 줄 번호를 구간 사이에서 비교하기 위한 키다"""
+    partial = PartialAggregate(num_days)
+    partial.line_counts[start] = len(lines)
+    users = partial.users
+    has_invalid_line = False
+    # 같은 줄은 한 번만 처리한다. Counter의 순서(rank)는 구간 안에서의 첫 등장 순서와 같다.
+    for rank, (line, count) in enumerate(Counter(lines).items()):
+        parts = line.split()
+        if len(parts) != 2:
+            has_invalid_line = True
+            continue
+        user_name, day_of_week = parts
+        entry = users.get(user_name)
+        if entry is None:
+            entry = users[user_name] = [(start, rank), 0, 0, 0] + [0] * num_days
+        rule = day_table.get(day_of_week)
+        if rule is None:
+            has_invalid_line = True
+            continue
+        index, add_point, flag = rule
+        entry[DAY_COUNTS + index] += count
+        entry[POINTS] += add_point * count
+        if flag == "wednesday":
+            entry[WEDNESDAY_COUNT] += count
+        elif flag == "weekend":
+            entry[WEEKEND_COUNT] += count
+
+    if has_invalid_line:
+        for line_index, line in enumerate(lines):
+            parts = line.split()
+            if len(parts) != 2:
+                partial.warnings.append(((start, line_index), BAD_FORMAT, f"잘못된 형식의 데이터: '{line.strip()}'", line))
+            elif parts[1] not in day_table:
+                partial.warnings.append(((start, line_index), UNKNOWN_DAY, f"알 수 없는 요일: '{parts[1]}'", line))
+    return partial
+
+
+class ParallelIngestEngine:
+    """입력 파일을 바이트 구간으로 나눠 여러 프로세스에서 집계한 뒤 병합하는 적재 엔진"""
+
+    def __init__(self, system, workers=None, shards_per_worker=4):
+        self.system = system
+        self.workers = workers or os.cpu_count() or 1
+        self.shards_per_worker = shards_per_worker
+
+    def ingest(self, file_path):
+        system = self.system
+        day_table = portable_day_table(system)
+        ranges = split_ranges(file_path, self.workers * self.shards_per_worker)
+        num_days = system.NUM_DAYS
+
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            futures = [pool.submit(aggregate_range, file_path, start, end, day_table, num_days)
+                       for start, end in ranges]
+            merged = reduce(PartialAggregate.merge, (future.result() for future in futures),
+                            PartialAggregate(num_days))
+        merged.apply_to(system)
@@ -0,0 +1,175 @@
+import heapq
+from array import array
+
+from .grading_strategies import Grade
+
+
+def _ignore(user_ids):
+    pass
+
+
+class PointsIndex:
+    """포인트 값으로 정렬된 사용자 색인 (리더보드, 순위, 구간 조회, 등급별 인원)
+
+    포인트 값 -> 사용자 ID 버킷과, 값별 인원수를 담은 펜윅 트리로 이뤄진다.
+    색인은 처음 조회할 때 전체 사용자로 만든다. 그 전까지 mark는 아무것도 하지 않으므로
+    조회하지 않는 실행은 사용자당 메모리를 쓰지 않는다.
+    만든 뒤에는 포인트가 바뀐 사용자를 mark로 표시만 해 두고 다음 조회에서 한꺼번에 반영한다.
+    동점 버킷은 상위 k명에 필요한 만큼만 힙으로 고르고, 구간 조회가 버킷 전체를 ID 순서로 읽을 때만
+    정렬 목록을 만들어 버킷이 바뀔 때까지 다시 쓴다.
+    """
+
+    INITIAL_VALUES = 1024
+
+    def __init__(self, system):
+        self.system = system
+        self._built = False
+        self._dirty = set()
+        self.mark = self.mark_many = _ignore
+        self._indexed = {}  # 사용자 ID -> 색인에 반영된 포인트
+        self._buckets = {}  # 포인트 -> 그 포인트인 사용자 ID 집합
+        self._ordered = {}  # 포인트 -> 버킷의 ID 정렬 목록 (구간 조회에서 만들고 버킷이 바뀌면 버린다)
+        self._size = self.INITIAL_VALUES
+        self._tree = array('q', bytes(8 * (self._size + 1)))
+
+    def _sync(self):
+        points = self.system.points
+        if not self._built:
+            self._built = True
+            self.mark = self._dirty.add
+            self.mark_many = self._dirty.update
+            for user_id in range(1, self.system.user_id_cnt + 1):
+                self._update(user_id, points[user_id])
+            return
+        for user_id in self._dirty:
+            self._update(user_id, points[user_id])
+        self._dirty.clear()
+
+    def _update(self, user_id, value):
+        old = self._indexed.get(user_id)
+        if old == value:
+            return
+        if value < 0:
+            raise ValueError(f"음수 포인트는 색인할 수 없습니다: {value}")
+        if old is not None:
+            bucket = self._buckets[old]
+            bucket.discard(user_id)
+            if not bucket:
+                del self._buckets[old]
+            self._ordered.pop(old, None)
+            self._add(old, -1)
+        self._ordered.pop(value, None)
+        self._add(value, 1)
+        self._indexed[user_id] = value
+        self._buckets.setdefault(value, set()).add(user_id)
+
+    def _add(self, value, delta):
+        if value >= self._size:
+            self._grow(value)
+        i = value + 1
+        tree = self._tree
+        while i <= self._size:
+            tree[i] += delta
+            i += i & -i
+
+    def _grow(self, value):
+        # 크기를 두 배씩 늘리고 버킷 인원수로 트리를 다시 만든다
+        size = self._size
+        while size <= value:
+            size *= 2
+        self._size = size
+        self._tree = array('q', bytes(8 * (size + 1)))
+        for bucket_value, bucket in self._buckets.items():
+            self._add(bucket_value, len(bucket))
+
+    def _prefix(self, value):
+        """포인트가 value 이하인 사용자 수"""
+        if value < 0:
+            return 0
+        i = min(value + 1, self._size)
+        total = 0
+        tree = self._tree
+        while i > 0:
+            total += tree[i]
+            i -= i & -i
+        return total
+
+    def _kth(self, k):
+        """포인트 오름차순으로 k번째(1부터) 사용자의 포인트"""
+        position = 0
+        step = self._size
+        tree = self._tree
+        while step:
+            nxt = position + step
+            if nxt <= self._size and tree[nxt] < k:
+                position = nxt
+                k -= tree[nxt]
+            step >>= 1
+        return position  # 트리 인덱스 position + 1 == 포인트 position
+
+    def __len__(self):
+        self._sync()
+        return len(self._indexed)
+
+    def top(self, k):
+        """포인트 상위 k명의 (사용자 ID, 포인트). 동점은 ID 순서"""
+        self._sync()
+        result = []
+        remaining = len(self._indexed)
+        while remaining > 0 and len(result) < k:
+            value = self._kth(remaining)
+            bucket = self._buckets[value]
+            ordered = self._ordered.get(value)
+            need = k - len(result)
+            user_ids = ordered[:need] if ordered is not None else heapq.nsmallest(need, bucket)
+            result.extend((user_id, value) for user_id in user_ids)
+            remaining -= len(bucket)
+        return result
+
+    def rank(self, user_id):
+        """동점은 같은 순위. 1위가 가장 높은 포인트"""
+        self._sync()
+        value = self._indexed[user_id]
+        return len(self._indexed) - self._prefix(value) + 1
+
+    def count_range(self, low, high):
+        self._sync()
+        if low > high:
+            return 0
+        return self._prefix(high) - self._prefix(low - 1)
+
+    def range(self, low, high):
+        """포인트가 low 이상 high 이하인 (사용자 ID, 포인트). 포인트 오름차순, 동점은 ID 순서"""
+        self._sync()
+        result = []
+        if low > high:
+            return result
+        position = self._prefix(low - 1) + 1
+        last = self._prefix(high)
+        while position <= last:
+            value = self._kth(position)
+            ordered = self._ordered.get(value)
+            if ordered is None:
+                ordered = self._ordered[value] = sorted(self._buckets[value])
+            result.extend((user_id, value) for user_id in ordered)
+            position += len(ordered)
+        return result
+
+    def grade_counts(self):
+        """현재 포인트 기준 등급별 인원. 보너스 적용 전에는 적용 전 포인트로 센다"""
+        self._sync()
+        grade_table = self.system.grade_table
+        counts = {grade.name: 0 for grade in Grade}
+        if grade_table is None:
+            # 사용자 정의 등급 전략은 포인트 구간을 알 수 없으므로 등급 컬럼을 센다
+            for user_id in self._indexed:
+                counts[Grade(self.system.grade[user_id]).name] += 1
+            return counts
+
+        above = 0
+        for grade_point, grade_value in sorted(grade_table, reverse=True):
+            at_least = len(self._indexed) - self._prefix(grade_point - 1)
+            counts[Grade(grade_value).name] += at_least - above
+            above = at_least
+        counts[Grade.NORMAL.name] += len(self._indexed) - above
+        return counts
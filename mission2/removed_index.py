@@ -0,0 +1,59 @@
+class RemovedPlayerIndex:
+    """탈락 후보 사용자 ID를 적재/등급 부여와 함께 갱신하는 색인
+
+    사용자가 만들어지면 들어오고, 첫 수요일/주말 출석이나 SILVER/GOLD 등급이 되면 빠진다.
+    후보 여부는 UserStore의 사용자별 1바이트 플래그 컬럼에 두므로 사용자당 1바이트만 들고,
+    목록은 플래그를 ID 순서로 훑어 만들므로 항상 ID 순서다.
+    기간 모드처럼 출석이 만료되는 경우에는 restore/rebuild로 다시 넣는다.
+    컬럼을 직접 고치는 경로(병렬 병합, 스냅숏 복원 등)를 위해 조회할 때 남은 후보를 한 번 더 확인한다.
+    """
+
+    def __init__(self, system):
+        self.system = system
+        self._flags = system.store.removed_candidate  # 제자리에서 늘어나므로 참조가 계속 유효하다
+
+    def add(self, user_id):
+        self._flags[user_id] = 1
+
+    def discard(self, user_id):
+        self._flags[user_id] = 0
+
+    def restore(self, user_id):
+        self._flags[user_id] = 1
+
+    def rebuild(self):
+        """전체 사용자를 훑어 다시 만든다. 등급이 내려갈 수 있는 마감 뒤에 쓴다"""
+        is_removed_candidate = self.system.is_removed_candidate
+        flags = self._flags
+        for user_id in range(1, self.system.user_id_cnt + 1):
+            flags[user_id] = 1 if is_removed_candidate(user_id) else 0
+
+    def _flagged(self):
+        flags = self._flags
+        end = self.system.user_id_cnt + 1
+        user_id = flags.find(1, 1, end)
+        while user_id != -1:
+            yield user_id
+            user_id = flags.find(1, user_id + 1, end)
+
+    def _prune(self):
+        is_removed_candidate = self.system.is_removed_candidate
+        stale = [user_id for user_id in self._flagged() if not is_removed_candidate(user_id)]
+        for user_id in stale:
+            self._flags[user_id] = 0
+
+    def user_ids(self):
+        self._prune()
+        return list(self._flagged())
+
+    def names(self):
+        names = self.system.names
+        return [names[user_id] for user_id in self.user_ids()]
+
+    def __len__(self):
+        self._prune()
+        return self._flags.count(1, 1, self.system.user_id_cnt + 1)
+
+    def __contains__(self, user_id):
+        return 0 < user_id <= self.system.user_id_cnt and self._flags[user_id] == 1 and \
+            self.system.is_removed_candidate(user_id)
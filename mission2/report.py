@@ -0,0 +1,181 @@
+import io
+import struct
+import sys
+from abc import ABC, abstractmethod
+from itertools import islice
+
+# 한 번에 버퍼에 모아 쓰는 행 수
+CHUNK_ROWS = 8192
+
+
+class ReportRow:
+    __slots__ = ('name', 'points', 'grade', 'label', 'removed')
+
+    def __init__(self, name, points, grade, label, removed):
+        self.name = name
+        self.points = points
+        self.grade = grade
+        self.label = label
+        self.removed = removed
+
+    def __eq__(self, other):
+        return isinstance(other, ReportRow) and all(
+            getattr(self, slot) == getattr(other, slot) for slot in self.__slots__)
+
+    def __repr__(self):
+        return f"ReportRow({self.name!r}, {self.points}, {self.label}, removed={self.removed})"
+
+
+class Report:
+    """마감된 시스템의 사용자 요약. 사용자 ID 순서를 따른다"""
+
+    def __init__(self, rows):
+        self.rows = rows
+
+    @classmethod
+    def from_system(cls, system):
+        rows = []
+        for user_id in range(1, system.user_id_cnt + 1):
+            points = system.points[user_id]
+            strategy = system.grading_factory.get_strategy(points)
+            rows.append(ReportRow(system.names[user_id], points, strategy.grade.value, strategy.label,
+                                  system.is_removed_candidate(user_id)))
+        return cls(rows)
+
+    def removed_names(self):
+        return [row.name for row in self.rows if row.removed]
+
+
+class StreamedReport(Report):
+    """행을 메모리에 올리지 않고 읽을 때마다 다시 만들어 흘려 보내는 보고서
+
+    rows는 여러 번 읽을 수 있는 반복 가능한 객체다. removed_names를 주면 탈락 후보 목록을
+    행을 다시 훑지 않고 그 함수(예: 색인을 쓰는 쿼리)에서 가져온다.
+    """
+
+    def __init__(self, rows, removed_names=None):
+        super().__init__(rows)
+        self._removed_names = removed_names
+
+    def removed_names(self):
+        if self._removed_names is not None:
+            return self._removed_names()
+        return (row.name for row in self.rows if row.removed)
+
+
+def _chunks(rows):
+    # 목록뿐 아니라 병합된 행 스트림처럼 한 번씩 읽히는 반복 가능한 객체도 나눈다
+    iterator = iter(rows)
+    while True:
+        chunk = list(islice(iterator, CHUNK_ROWS))
+        if not chunk:
+            return
+        yield chunk
+
+
+class ReportSink(ABC):
+    binary = False
+
+    @abstractmethod
+    def render(self, report):
+        """보고서를 큰 덩어리(str 또는 bytes) 단위로 만들어 내보낸다"""
+        pass
+
+    def write(self, report, stream=None):
+        if stream is None:
+            stream = sys.stdout.buffer if self.binary else sys.stdout
+        for chunk in self.render(report):
+            stream.write(chunk)
+        stream.flush()
+
+
+class TextSink(ReportSink):
+    """기존 print 출력과 바이트 단위로 같은 사람용 텍스트"""
+
+    def render(self, report):
+        for rows in _chunks(report.rows):
+            yield ''.join([f"NAME : {row.name}, POINT : {row.points}, GRADE : {row.label}\n" for row in rows])
+        removed = report.removed_names()
+        yield "\nRemoved player\n==============\n"
+        for names in _chunks(removed):
+            yield ''.join([f"{name}\n" for name in names])
+
+
+class CsvSink(ReportSink):
+    HEADER = ("name", "points", "grade", "removed")
+
+    def render(self, report):
+        import csv  # 형식별 모듈은 그 형식을 쓸 때만 불러온다 (시작 시간)
+        yield ','.join(self.HEADER) + '\n'
+        for rows in _chunks(report.rows):
+            buffer = io.StringIO()
+            csv.writer(buffer, lineterminator='\n').writerows(
+                (row.name, row.points, row.label, int(row.removed)) for row in rows)
+            yield buffer.getvalue()
+
+
+class JsonLinesSink(ReportSink):
+    def render(self, report):
+        import json
+        for rows in _chunks(report.rows):
+            yield ''.join([json.dumps({"name": row.name, "points": row.points, "grade": row.label,
+                                       "removed": row.removed}, ensure_ascii=False) + '\n'
+                           for row in rows])
+
+
+class BinarySink(ReportSink):
+    """mmap으로 바로 읽을 수 있는 고정 길이 레코드 형식
+
+    [헤더][레코드 x count][이름 UTF-8 바이트]
+    헤더: magic, 버전, 레코드 크기, 레코드 수
+    레코드: 이름 오프셋(이름 영역 기준), 이름 길이, 포인트, 등급 값, 탈락 후보 여부
+    """
+    binary = True
+    MAGIC = b'ATRP'
+    VERSION = 1
+    HEADER = struct.Struct('<4sHHQ')
+    RECORD = struct.Struct('<QIqBB2x')
+
+    def render(self, report):
+        # 레코드 뒤에 이름 영역이 오므로 행을 두 번 읽는다 (len과 반복만 쓰므로 흘려 보내는 행도 된다)
+        yield self.HEADER.pack(self.MAGIC, self.VERSION, self.RECORD.size, len(report.rows))
+        offset = 0
+        for rows in _chunks(report.rows):
+            buffer = bytearray()
+            for row in rows:
+                name_length = len(row.name.encode('utf-8'))
+                buffer += self.RECORD.pack(offset, name_length, row.points, row.grade, row.removed)
+                offset += name_length
+            yield bytes(buffer)
+        for rows in _chunks(report.rows):
+            yield b''.join([row.name.encode('utf-8') for row in rows])
+
+
+def read_binary_report(data):
+    """BinarySink 형식의 bytes(또는 mmap)를 (이름, 포인트, 등급 값, 탈락 후보 여부) 목록으로 읽는다"""
+    magic, version, record_size, count = BinarySink.HEADER.unpack_from(data, 0)
+    if magic != BinarySink.MAGIC or version != BinarySink.VERSION:
+        raise ValueError("지원하지 않는 보고서 형식입니다")
+    names_start = BinarySink.HEADER.size + record_size * count
+    records = []
+    for i in range(count):
+        name_offset, name_length, points, grade, removed = BinarySink.RECORD.unpack_from(
+            data, BinarySink.HEADER.size + record_size * i)
+        start = names_start + name_offset
+        records.append((bytes(data[start:start + name_length]).decode('utf-8'), points, grade, bool(removed)))
+    return records
+
+
+SINKS = {
+    "text": TextSink,
+    "csv": CsvSink,
+    "jsonl": JsonLinesSink,
+    "binary": BinarySink,
+}
+
+
+def create_sink(output_format):
+    sink_class = SINKS.get(output_format)
+    if sink_class is None:
+        raise ValueError(f"지원하지 않는 출력 형식: '{output_format}'")
+    return sink_class()
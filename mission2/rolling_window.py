@@ -0,0 +1,180 @@
+import heapq
+from array import array
+from datetime import date
+
+from .attendance import AttendanceSystem
+from .stats import BAD_FORMAT
+
+DEFAULT_WINDOW_DAYS = 28
+EMPTY_DAY = -1
+# 칸에 기록된 출석이 함께 올린 카운터
+NO_FLAG, WEDNESDAY_FLAG, WEEKEND_FLAG = 0, 1, 2
+
+
+class DayRing:
+    """사용자마다 window_days칸짜리 날짜별 출석 링 버퍼
+
+    칸 위치는 (날짜 서수 % window_days)이고, 칸마다 날짜, 요일 인덱스, 출석 수, 포인트, 카운터 종류를 둔다.
+    모든 사용자의 칸을 하나의 연속된 배열에 두며 용량이 부족하면 2배씩 늘린다.
+    """
+
+    def __init__(self, window_days, capacity):
+        self.window_days = window_days
+        self.capacity = 0
+        self.day = array('i')
+        self.index = array('b')
+        self.count = array('i')
+        self.points = array('q')
+        self.flag = array('b')
+        self.ensure_capacity(capacity)
+
+    def ensure_capacity(self, size):
+        if size <= self.capacity:
+            return
+        new_capacity = max(self.capacity * 2, size)
+        extra = (new_capacity - self.capacity) * self.window_days
+        self.day.extend(array('i', [EMPTY_DAY]) * extra)
+        for column in (self.index, self.count, self.points, self.flag):
+            column.frombytes(bytes(column.itemsize * extra))
+        self.capacity = new_capacity
+
+    def nbytes(self):
+        return sum(column.itemsize * len(column)
+                   for column in (self.day, self.index, self.count, self.points, self.flag))
+
+
+class RollingWindowAttendanceSystem(AttendanceSystem):
+    """최근 window_days일 동안의 출석만으로 포인트, 보너스, 등급을 계산하는 시스템
+
+    입력 형식은 "이름 요일 YYYY-MM-DD"이다. 가장 늦은 날짜가 기간의 끝이 되고,
+    기간을 벗어난 날짜의 칸은 날짜별 만료 목록을 따라 사용자마다 상수 시간에 빼낸다.
+    출석 행렬과 포인트 컬럼은 항상 기간 안의 합계이므로 보너스/등급 계산은 그대로 쓴다.
+    날짜가 없는 기존 형식은 AttendanceSystem이 그대로 처리한다.
+    """
+
+    def __init__(self, window_days=DEFAULT_WINDOW_DAYS, rules=None, **options):
+        if window_days < 1:
+            raise ValueError(f"기간은 1일 이상이어야 합니다: {window_days}")
+        self.window_days = window_days
+        self.ring = DayRing(window_days, 0)
+        self.current_day = None  # 기간의 마지막 날 (날짜 서수)
+        self._expiry_days = []  # 칸이 남아 있는 날짜의 최소 힙
+        self._expiry_users = {}  # 날짜 -> 그 날짜 칸을 가진 사용자 ID 목록
+        super().__init__(rules, **options)
+        self.ring.ensure_capacity(self.store.capacity)
+
+    def get_or_create_user_id_from_bytes(self, name_bytes):
+        user_id = super().get_or_create_user_id_from_bytes(name_bytes)
+        self.ring.ensure_capacity(self.store.capacity)
+        return user_id
+
+    @property
+    def window_start(self):
+        return None if self.current_day is None else self.current_day - self.window_days + 1
+
+    def advance_to(self, as_of):
+        """기간의 끝을 as_of(date 또는 날짜 서수)로 옮기고 벗어난 날짜의 칸을 만료시킨다"""
+        day = as_of.toordinal() if isinstance(as_of, date) else as_of
+        if self.current_day is not None and day <= self.current_day:
+            return
+        self.current_day = day
+        window_start = self.window_start
+        while self._expiry_days and self._expiry_days[0] < window_start:
+            expired_day = heapq.heappop(self._expiry_days)
+            for user_id in self._expiry_users.pop(expired_day):
+                self._expire(user_id, expired_day)
+
+    def _expire(self, user_id, day):
+        ring = self.ring
+        slot = user_id * self.window_days + day % self.window_days
+        count = ring.count[slot]
+        self.attendance_by_day.data[user_id * self.NUM_DAYS + ring.index[slot]] -= count
+        self.points[user_id] -= ring.points[slot]
+        flag = ring.flag[slot]
+        if flag == WEDNESDAY_FLAG:
+            self.wednesday_attendance_count[user_id] -= count
+        elif flag == WEEKEND_FLAG:
+            self.weekend_attendance_count[user_id] -= count
+        ring.day[slot] = EMPTY_DAY
+        ring.count[slot] = 0
+        ring.points[slot] = 0
+        self.points_index.mark(user_id)
+        if flag != NO_FLAG and self.is_removed_candidate(user_id):
+            self.removed_players.restore(user_id)
+
+    def process_line(self, line, line_no=None):
+        parts = line.split()
+        if len(parts) == 2:
+            super().process_line(line, line_no)
+            return
+        if len(parts) != 3:
+            self.warn(f"잘못된 형식의 데이터: '{line.strip()}'", line_no, BAD_FORMAT, line)
+            return
+        user_name, day_of_week, date_text = parts
+        try:
+            day = date.fromisoformat(date_text).toordinal()
+        except ValueError:
+            self.warn(f"잘못된 날짜: '{date_text}'", line_no, BAD_FORMAT, line)
+            return
+        self.record_dated_attendance(user_name, day_of_week, day, line_no, line)
+
+    def record_dated_attendance(self, user_name, day_of_week, day, line_no=None, line=None):
+        if self.current_day is None or day > self.current_day:
+            self.advance_to(day)
+        user_id = self.get_or_create_user_id(user_name)
+        rule = self.day_table.get(day_of_week)
+        if rule is None:
+            self.dispatch_day_strategy(user_id, day_of_week, line_no, line=line)
+            return
+        index, add_point, flag_column, strategy = rule
+        if strategy is not None:
+            raise ValueError("기간 모드는 사용자 정의 요일 전략을 지원하지 않습니다")
+        if index != (day - 1) % 7:  # 서수 1(0001-01-01)은 월요일
+            self.warn(f"날짜와 요일이 맞지 않습니다: '{day_of_week}' {date.fromordinal(day)}",
+                      line_no, BAD_FORMAT, line)
+            return
+        if day < self.window_start:
+            # 이미 기간을 벗어난 늦게 도착한 기록
+            self.stats.count("expired_records")
+            return
+
+        ring = self.ring
+        slot = user_id * self.window_days + day % self.window_days
+        if ring.day[slot] != day:
+            ring.day[slot] = day
+            ring.index[slot] = index
+            if flag_column is None:
+                ring.flag[slot] = NO_FLAG
+            else:
+                ring.flag[slot] = WEDNESDAY_FLAG if flag_column is self.wednesday_attendance_count else WEEKEND_FLAG
+            users = self._expiry_users.get(day)
+            if users is None:
+                users = self._expiry_users[day] = []
+                heapq.heappush(self._expiry_days, day)
+            users.append(user_id)
+        ring.count[slot] += 1
+        ring.points[slot] += add_point
+
+        self.attendance_by_day.data[user_id * self.NUM_DAYS + index] += 1
+        self.points[user_id] += add_point
+        self.points_index.mark(user_id)
+        if flag_column is not None:
+            flag_column[user_id] += 1
+            self.removed_players.discard(user_id)
+
+    def _ingest(self, file_path, mode, workers):
+        if mode != "line":
+            raise ValueError(f"기간 모드는 줄 단위 적재만 지원합니다: '{mode}'")
+        super()._ingest(file_path, mode, workers)
+
+    def assign_grades(self, vectorized=None):
+        super().assign_grades(vectorized)
+        # 만료로 등급이 내려갈 수 있으므로 탈락 후보를 다시 맞춘다
+        self.removed_players.rebuild()
+
+    def window_summary(self, user_id):
+        """사용자의 기간 안 (날짜, 출석 수) 목록. 날짜순"""
+        ring = self.ring
+        start = user_id * self.window_days
+        return sorted((date.fromordinal(ring.day[slot]), ring.count[slot])
+                      for slot in range(start, start + self.window_days) if ring.day[slot] != EMPTY_DAY)
@@ -0,0 +1,85 @@
+from .day_factory import DayStrategyFactory
+from .bonus_factory import BonusStrategyFactory
+from .bonus_strategies import (AllBonusStrategy, WednesdayBonusStrategy, WeekendBonusStrategy,
+                              WEDNESDAY_INDEX, SATURDAY_INDEX, SUNDAY_INDEX,
+                              BONUS_ATTENDANCE_COUNT, BONUS_POINTS)
+from .grading_factory import GradingStrategyFactory, GOLD_GRADE_POINT, SILVER_GRADE_POINT
+
+
+class RuleSet:
+    """요일 정보, 보너스 상수, 등급 기준을 담은 출석 규칙 묶음
+
+    설정 파일(JSON) 형식:
+        {"days": {"monday": {"index": 0, "add_point": 1}, ...},
+         "bonus": {"attendance_count": 10, "points": 10,
+                   "wednesday_index": 2, "weekend_indexes": [5, 6]},
+         "grades": {"gold": 50, "silver": 30}}
+    빠진 항목은 기본 상수를 사용한다.
+    """
+    NUM_DAYS = 7
+
+    def __init__(self, day_info=None,
+                 bonus_attendance_count=BONUS_ATTENDANCE_COUNT, bonus_points=BONUS_POINTS,
+                 wednesday_index=WEDNESDAY_INDEX, weekend_indexes=(SATURDAY_INDEX, SUNDAY_INDEX),
+                 gold_grade_point=GOLD_GRADE_POINT, silver_grade_point=SILVER_GRADE_POINT):
+        self.day_info = dict(day_info if day_info is not None else DayStrategyFactory.DAY_INFO)
+        self.bonus_attendance_count = bonus_attendance_count
+        self.bonus_points = bonus_points
+        self.wednesday_index = wednesday_index
+        self.weekend_indexes = tuple(weekend_indexes)
+        self.gold_grade_point = gold_grade_point
+        self.silver_grade_point = silver_grade_point
+        self._validate()
+
+    def _validate(self):
+        indexes = [info["index"] for info in self.day_info.values()]
+        indexes += [self.wednesday_index, *self.weekend_indexes]
+        for index in indexes:
+            if not 0 <= index < self.NUM_DAYS:
+                raise ValueError(f"요일 인덱스는 0~{self.NUM_DAYS - 1} 사이여야 합니다: {index}")
+        if self.silver_grade_point > self.gold_grade_point:
+            raise ValueError("SILVER 기준 포인트가 GOLD 기준 포인트보다 클 수 없습니다")
+
+    @classmethod
+    def from_dict(cls, config):
+        bonus = config.get("bonus", {})
+        grades = config.get("grades", {})
+        return cls(
+            day_info=config.get("days"),
+            bonus_attendance_count=bonus.get("attendance_count", BONUS_ATTENDANCE_COUNT),
+            bonus_points=bonus.get("points", BONUS_POINTS),
+            wednesday_index=bonus.get("wednesday_index", WEDNESDAY_INDEX),
+            weekend_indexes=bonus.get("weekend_indexes", (SATURDAY_INDEX, SUNDAY_INDEX)),
+            gold_grade_point=grades.get("gold", GOLD_GRADE_POINT),
+            silver_grade_point=grades.get("silver", SILVER_GRADE_POINT),
+        )
+
+    @classmethod
+    def from_config(cls, file_path):
+        import json  # 설정 파일을 쓸 때만 불러온다 (시작 시간)
+        with open(file_path, 'r', encoding='utf-8') as f:
+            return cls.from_dict(json.load(f))
+
+    def to_dict(self):
+        return {
+            "days": self.day_info,
+            "bonus": {
+                "attendance_count": self.bonus_attendance_count,
+                "points": self.bonus_points,
+                "wednesday_index": self.wednesday_index,
+                "weekend_indexes": list(self.weekend_indexes),
+            },
+            "grades": {"gold": self.gold_grade_point, "silver": self.silver_grade_point},
+        }
+
+    def create_day_factory(self):
+        return DayStrategyFactory(self.day_info)
+
+    def create_bonus_factory(self):
+        return BonusStrategyFactory(AllBonusStrategy([
+            WednesdayBonusStrategy(self.wednesday_index, self.bonus_attendance_count, self.bonus_points),
+            WeekendBonusStrategy(self.weekend_indexes, self.bonus_attendance_count, self.bonus_points),
+        ]))
+
+    def create_grading_factory(self):
+        return GradingStrategyFactory(self.gold_grade_point, self.silver_grade_point)
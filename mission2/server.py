@@ -0,0 +1,192 @@
+import argparse
+import asyncio
+import time
+
+from .attendance import AttendanceSystem, Grade
+from .stats import BAD_FORMAT
+
+QUERY_PREFIX = "? "
+SYNC_COMMAND = "!sync"
+
+
+class AttendanceServer:
+    """키오스크 출석 이벤트를 소켓으로 받아 마이크로 배치로 반영하는 asyncio 서버
+
+    프로토콜 (한 줄에 하나, UTF-8):
+        name weekday   출석 기록 (응답 없음)
+        ? name         포인트/등급 조회 -> "name POINT GRADE" 또는 "name NOT_FOUND"
+        !sync          앞서 보낸 기록이 모두 반영되면 "OK"로 응답
+    대기열이 가득 차면 읽기를 멈춰 클라이언트 쪽으로 역압(backpressure)이 전달된다.
+    UTF-8로 읽을 수 없는 줄은 연결을 끊지 않고 다른 기록과 같은 순서로 잘못된 형식 경고를 남긴다.
+    """
+
+    def __init__(self, system=None, batch_size=1024, flush_interval=0.05, queue_size=65536):
+        self.system = system if system is not None else AttendanceSystem()
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.queue = asyncio.Queue(maxsize=queue_size)
+        self.events_applied = 0
+        self.batches_applied = 0
+        self._server = None
+        self._batcher = None
+
+    async def start(self, host="127.0.0.1", port=0, unix_path=None):
+        if unix_path is not None:
+            self._server = await asyncio.start_unix_server(self._handle_client, path=unix_path)
+        else:
+            self._server = await asyncio.start_server(self._handle_client, host, port)
+        self._batcher = asyncio.create_task(self._run_batcher())
+        return self._server
+
+    @property
+    def address(self):
+        return self._server.sockets[0].getsockname()
+
+    async def stop(self):
+        self._server.close()
+        await self._server.wait_closed()
+        await self.queue.join()
+        self._batcher.cancel()
+
+    async def _handle_client(self, reader, writer):
+        try:
+            while True:
+                raw = await reader.readline()
+                if not raw:
+                    break
+                try:
+                    line = raw.decode('utf-8').rstrip('\r\n')
+                except UnicodeDecodeError:
+                    # 원래 bytes 그대로 대기열에 넣고 배치에서 경고로 남긴다
+                    await self.queue.put(raw)
+                    continue
+                if line.startswith(QUERY_PREFIX):
+                    writer.write(self.query(line[len(QUERY_PREFIX):].strip()).encode('utf-8') + b'\n')
+                elif line == SYNC_COMMAND:
+                    barrier = asyncio.get_running_loop().create_future()
+                    await self.queue.put(barrier)
+                    await barrier
+                    writer.write(b'OK\n')
+                else:
+                    await self.queue.put(line)
+                await writer.drain()
+        finally:
+            writer.close()
+
+    async def _run_batcher(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.queue.get()]
+            deadline = loop.time() + self.flush_interval
+            while len(batch) < self.batch_size:
+                if not self.queue.empty():
+                    batch.append(self.queue.get_nowait())
+                    continue
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self.queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+            self.apply_batch(batch)
+            for _ in batch:
+                self.queue.task_done()
+
+    def apply_batch(self, batch):
+        process_line = self.system.process_line
+        for item in batch:
+            if isinstance(item, str):
+                process_line(item)
+                self.events_applied += 1
+            elif isinstance(item, bytes):
+                line = item.decode('utf-8', errors='replace')
+                self.system.warn(f"잘못된 형식의 데이터: '{line.strip()}'", None, BAD_FORMAT, line)
+            else:
+                item.set_result(None)
+        self.batches_applied += 1
+
+    def query(self, user_name):
+        """메모리 상태에서 바로 답한다. 보너스/등급은 해당 사용자만 다시 계산한다 (멱등)"""
+        system = self.system
+        user_id = system.user_name_to_id.get(user_name)
+        if user_id is None:
+            return f"{user_name} NOT_FOUND"
+        system.calculate_bonus_points(user_id)
+        system.determine_grade(user_id)
+        return f"{user_name} {system.points[user_id]} {Grade(system.grade[user_id]).name}"
+
+
+async def run_load_client(host, port, lines):
+    """준비된 출석 줄을 보내고 모두 반영될 때까지 기다린다"""
+    reader, writer = await asyncio.open_connection(host, port)
+    for line in lines:
+        writer.write(line.encode('utf-8'))
+        await writer.drain()
+    writer.write(f"{SYNC_COMMAND}\n".encode('utf-8'))
+    await writer.drain()
+    await reader.readline()
+    writer.close()
+    await writer.wait_closed()
+
+
+async def benchmark_server(events=100000, users=1000, connections=4, batch_size=1024, flush_interval=0.05):
+    """로컬 서버에 부하 생성기를 붙여 초당 반영 이벤트 수를 잰다"""
+    from .workload import generate_lines
+
+    per_connection = []
+    for seed in range(connections):
+        text = ''.join(generate_lines(events // connections, users, seed=seed))
+        # 큰 덩어리로 보내 클라이언트 쪽 비용을 줄인다
+        lines = text.splitlines(keepends=True)
+        per_connection.append([''.join(lines[i:i + 512]) for i in range(0, len(lines), 512)])
+
+    server = AttendanceServer(batch_size=batch_size, flush_interval=flush_interval)
+    await server.start()
+    host, port = server.address[:2]
+    started = time.perf_counter()
+    await asyncio.gather(*(run_load_client(host, port, chunks) for chunks in per_connection))
+    elapsed = time.perf_counter() - started
+    await server.stop()
+    return {
+        "events": server.events_applied,
+        "batches": server.batches_applied,
+        "seconds": elapsed,
+        "events_per_sec": server.events_applied / elapsed if elapsed else 0.0,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="출석 이벤트 수집 서버")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    serve = subparsers.add_parser("serve")
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=9000)
+    serve.add_argument("--unix", help="TCP 대신 사용할 Unix 소켓 경로")
+    bench = subparsers.add_parser("bench")
+    bench.add_argument("--events", type=int, default=100000)
+    bench.add_argument("--users", type=int, default=1000)
+    bench.add_argument("--connections", type=int, default=4)
+    for sub in (serve, bench):
+        sub.add_argument("--batch-size", type=int, default=1024)
+        sub.add_argument("--flush-interval", type=float, default=0.05)
+    args = parser.parse_args(argv)
+
+    if args.command == "bench":
+        result = asyncio.run(benchmark_server(args.events, args.users, args.connections,
+                                              args.batch_size, args.flush_interval))
+        print(f"{result['events']} events in {result['seconds']:.3f}s "
+              f"({result['events_per_sec']:.0f} events/s, {result['batches']} batches)")
+        return
+
+    async def serve_forever():
+        server = AttendanceServer(batch_size=args.batch_size, flush_interval=args.flush_interval)
+        listener = await server.start(args.host, args.port, args.unix)
+        async with listener:
+            await listener.serve_forever()
+
+    asyncio.run(serve_forever())
+
+
+if __name__ == "__main__":
+    main()
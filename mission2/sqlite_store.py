@@ -0,0 +1,209 @@
+import sqlite3
+from collections import Counter
+
+from .bad_lines import BadLineLog
+from .compressed_input import open_text
+from .day_factory import InvalidDataError
+from .grading_strategies import Grade
+from .report import ReportRow, StreamedReport, create_sink
+from .rules import RuleSet
+from .stats import RunStats, BAD_FORMAT, UNKNOWN_DAY, BUILTIN_STRATEGY_NAMES
+
+NUM_DAYS = 7
+DAY_COLUMNS = tuple(f"d{index}" for index in range(NUM_DAYS))
+DEFAULT_BATCH_LINES = 65536
+
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS users (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    points INTEGER NOT NULL DEFAULT 0,
+    bonus INTEGER NOT NULL DEFAULT 0,
+    grade INTEGER NOT NULL DEFAULT {Grade.NORMAL.value},
+    wednesday INTEGER NOT NULL DEFAULT 0,
+    weekend INTEGER NOT NULL DEFAULT 0,
+    {', '.join(f"{column} INTEGER NOT NULL DEFAULT 0" for column in DAY_COLUMNS)}
+);
+CREATE INDEX IF NOT EXISTS users_removed ON users(id)
+    WHERE grade = {Grade.NORMAL.value} AND wednesday = 0 AND weekend = 0;
+-- 이전 버전이 만든 합계 포인트 색인은 쓰는 쿼리가 없고 갱신 비용만 들므로 지운다
+DROP INDEX IF EXISTS users_total_points;
+"""
+
+REMOVED_CONDITION = f"grade = {Grade.NORMAL.value} AND wednesday = 0 AND weekend = 0"
+
+
+class SqliteRows:
+    """users 테이블을 id 순서로 읽는 보고서 행 목록. 읽을 때마다 새 커서로 다시 읽으므로 행을 메모리에 모으지 않는다"""
+
+    def __init__(self, connection):
+        self.connection = connection
+
+    def __len__(self):
+        return self.connection.execute("SELECT COUNT(*) FROM users").fetchone()[0]
+
+    def __iter__(self):
+        for name, points, grade, removed in self.connection.execute(
+                f"SELECT name, points + bonus, grade, {REMOVED_CONDITION} FROM users ORDER BY id"):
+            yield ReportRow(name, points, grade, Grade(grade).name, bool(removed))
+
+
+class SqliteAttendanceSystem:
+    """사용자 상태를 로컬 SQLite 파일에 두는 출석 시스템 (메모리 백엔드와 같은 결과)
+
+    points 컬럼은 보너스를 뺀 기본 포인트, bonus 컬럼은 적용된 보너스다.
+    적재는 batch_lines줄마다 같은 줄을 모아 executemany로 반영하고, 파일 하나를 한 트랜잭션으로 처리한다.
+    보너스와 등급은 집합 단위 UPDATE 한 번씩으로 계산한다.
+    사용자 정의 전략은 SQL로 옮길 수 없으므로 기본 규칙(RuleSet)만 지원한다.
+    """
+
+    def __init__(self, db_path, rules=None, batch_lines=DEFAULT_BATCH_LINES,
+                 warning_limit=BadLineLog.DEFAULT_SAMPLE_LIMIT, quarantine_path=None):
+        self.rules = rules if rules is not None else RuleSet()
+        self.day_factory = self.rules.create_day_factory()
+        self.grading_factory = self.rules.create_grading_factory()
+        day_table = self.day_factory.compile()
+        self.bonus_table = self.rules.create_bonus_factory().compile()
+        self.grade_table = self.grading_factory.compile()
+        if day_table is None or self.bonus_table is None or self.grade_table is None or \
+                any(strategy is not None for *_, strategy in day_table.values()):
+            raise ValueError("SQLite 백엔드는 사용자 정의 전략을 지원하지 않습니다")
+        # 요일 토큰 -> (인덱스, 포인트, 카운터 플래그)
+        self.day_table = {day_of_week: (index, add_point, flag)
+                          for day_of_week, (index, add_point, flag, _) in day_table.items()}
+        self.batch_lines = batch_lines
+        self.stats = RunStats()
+        self.bad_lines = BadLineLog(self.stats, warning_limit, quarantine_path)
+
+        self.connection = sqlite3.connect(db_path)
+        self.connection.execute("PRAGMA journal_mode = WAL")
+        self.connection.execute("PRAGMA synchronous = NORMAL")
+        self.connection.executescript(SCHEMA)
+
+    def close(self):
+        self.connection.close()
+
+    @property
+    def user_id_cnt(self):
+        return self.connection.execute("SELECT COUNT(*) FROM users").fetchone()[0]
+
+    def warn(self, message, line_no=None, category=BAD_FORMAT, line=None):
+        self.bad_lines.record(message, line_no, category, line)
+
+    def ingest(self, file_path):
+        users_before = self.user_id_cnt
+        with open_text(file_path) as f, self.connection:
+            batch, first_line_no = [], 1
+            for line in f:
+                batch.append(line)
+                if len(batch) >= self.batch_lines:
+                    self._apply_batch(batch, first_line_no)
+                    first_line_no += len(batch)
+                    batch = []
+            if batch:
+                self._apply_batch(batch, first_line_no)
+        self.stats.count("users_created", self.user_id_cnt - users_before)
+        self.bad_lines.flush()
+
+    def _apply_batch(self, lines, first_line_no):
+        day_table = self.day_table
+        new_names = {}
+        # 요일 인덱스 -> 사용자 이름 -> [출석 수, 포인트, 수요일 수, 주말 수]
+        deltas = [{} for _ in range(NUM_DAYS)]
+        has_invalid_line = False
+        self.stats.count("lines_read", len(lines))
+        for line, count in Counter(lines).items():
+            parts = line.split()
+            if len(parts) != 2:
+                has_invalid_line = True
+                continue
+            user_name, day_of_week = parts
+            new_names.setdefault(user_name, None)
+            rule = day_table.get(day_of_week)
+            if rule is None:
+                has_invalid_line = True
+                continue
+            index, add_point, flag = rule
+            delta = deltas[index].setdefault(user_name, [0, 0, 0, 0])
+            delta[0] += count
+            delta[1] += add_point * count
+            delta[2] += count if flag == "wednesday" else 0
+            delta[3] += count if flag == "weekend" else 0
+            self.stats.dispatches[BUILTIN_STRATEGY_NAMES[flag]] += count
+
+        if has_invalid_line:
+            self._warn_invalid_lines(lines, first_line_no)
+
+        # 처음 등장한 순서대로 넣으므로 id가 메모리 백엔드의 사용자 ID 순서와 같다
+        self.connection.executemany("INSERT OR IGNORE INTO users(name) VALUES (?)",
+                                    ((name,) for name in new_names))
+        for index, by_user in enumerate(deltas):
+            if not by_user:
+                continue
+            column = DAY_COLUMNS[index]
+            self.connection.executemany(
+                f"UPDATE users SET {column} = {column} + ?, points = points + ?, "
+                "wednesday = wednesday + ?, weekend = weekend + ? WHERE name = ?",
+                ((days, points, wednesday, weekend, name)
+                 for name, (days, points, wednesday, weekend) in by_user.items()))
+
+    def _warn_invalid_lines(self, lines, first_line_no):
+        for line_no, line in enumerate(lines, first_line_no):
+            parts = line.split()
+            if len(parts) != 2:
+                self.warn(f"잘못된 형식의 데이터: '{line.strip()}'", line_no, BAD_FORMAT, line)
+            elif parts[1] not in self.day_table:
+                try:
+                    self.day_factory.get_strategy(parts[1])
+                except InvalidDataError as e:
+                    self.warn(e, line_no, UNKNOWN_DAY, line)
+
+    def apply_bonuses(self):
+        terms = [f"CASE WHEN {' + '.join(DAY_COLUMNS[index] for index in indexes)} >= {attendance_count} "
+                 f"THEN {bonus_points} ELSE 0 END"
+                 for indexes, attendance_count, bonus_points in self.bonus_table]
+        with self.connection:
+            self.connection.execute(f"UPDATE users SET bonus = {' + '.join(terms) or '0'}")
+
+    def assign_grades(self):
+        cases = ' '.join(f"WHEN points + bonus >= {grade_point} THEN {grade_value}"
+                         for grade_point, grade_value in self.grade_table)
+        with self.connection:
+            self.connection.execute(f"UPDATE users SET grade = CASE {cases} ELSE {Grade.NORMAL.value} END")
+
+    def finalize(self):
+        self.apply_bonuses()
+        self.assign_grades()
+
+    def iter_removed_names(self):
+        # users_removed 부분 색인만 훑는다
+        return (name for name, in self.connection.execute(
+            f"SELECT name FROM users WHERE {REMOVED_CONDITION} ORDER BY id"))
+
+    def removed_names(self):
+        return list(self.iter_removed_names())
+
+    def build_report(self):
+        return StreamedReport(SqliteRows(self.connection), self.iter_removed_names)
+
+    def print_report(self, output_format="text", stream=None):
+        create_sink(output_format).write(self.build_report(), stream)
+
+    def run(self, file_path, output_format="text", stream=None):
+        try:
+            with self.stats.phase("ingest"):
+                self.ingest(file_path)
+                if self.bad_lines.suppressed:
+                    print(self.bad_lines.format_summary())
+            with self.stats.phase("bonus"):
+                self.apply_bonuses()
+            with self.stats.phase("grading"):
+                self.assign_grades()
+            with self.stats.phase("report"):
+                self.print_report(output_format, stream)
+
+        except FileNotFoundError:
+            print(f"파일을 찾을 수 없습니다: {file_path}")
+            return False
+        return True
+
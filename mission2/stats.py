@@ -0,0 +1,96 @@
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+# 경고 분류
+BAD_FORMAT = "bad_format"
+UNKNOWN_DAY = "unknown_day"
+# 읽었지만 반영하지 않은 줄의 분류 (경고 분류 포함)
+REJECTED_CATEGORIES = (BAD_FORMAT, UNKNOWN_DAY, "duplicate_records", "expired_records")
+
+# 기본 요일 전략의 카운터 플래그 -> 전략 이름
+BUILTIN_STRATEGY_NAMES = {None: "SimpleDayStrategy", "wednesday": "WednesdayStrategy", "weekend": "WeekendStrategy"}
+
+
+def builtin_dispatch_totals(system):
+    """기본 요일 전략 종류별로 지금까지 기록된 출석 수
+
+    줄마다 세지 않고 출석 행렬의 요일별 합계에서 계산하므로 적재 경로에 비용이 없다.
+    """
+    data = system.attendance_by_day.data
+    rows = system.user_id_cnt + 1
+    num_days = system.NUM_DAYS
+    index_names = {}
+    for index, _, flag, strategy in (system.day_factory.compile() or {}).values():
+        if strategy is None:
+            index_names.setdefault(index, BUILTIN_STRATEGY_NAMES[flag])
+
+    totals = Counter()
+    for index, name in index_names.items():
+        totals[name] += sum(data[index:rows * num_days:num_days])
+    return totals
+
+
+class RunStats:
+    """AttendanceSystem 실행의 단계별 벽시계/CPU 시간과 처리 카운터
+
+    카운터는 오류 경로와 단계 경계에서만 갱신하므로 정상 줄 처리에는 비용이 들지 않는다.
+    읽은 줄 수(lines_read)는 적재 루프가 끝날 때 한 번에 더한다.
+    """
+
+    def __init__(self):
+        self.phases = {}  # 단계 이름 -> [벽시계 시간, CPU 시간]
+        self.counters = Counter()
+        self.dispatches = Counter()
+
+    @contextmanager
+    def phase(self, name):
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield
+        finally:
+            timing = self.phases.setdefault(name, [0.0, 0.0])
+            timing[0] += time.perf_counter() - wall
+            timing[1] += time.process_time() - cpu
+
+    @contextmanager
+    def ingest_counters(self, system):
+        """적재 전후의 상태 차이로 사용자 생성 수와 전략별 처리 수를 센다"""
+        users_before = system.user_id_cnt
+        dispatches_before = builtin_dispatch_totals(system)
+        yield
+        self.counters["users_created"] += system.user_id_cnt - users_before
+        self.dispatches.update(builtin_dispatch_totals(system) - dispatches_before)
+
+    def count(self, name, amount=1):
+        self.counters[name] += amount
+
+    @property
+    def lines_read(self):
+        return self.counters["lines_read"]
+
+    @property
+    def valid_records(self):
+        return self.lines_read - sum(self.counters[category] for category in REJECTED_CATEGORIES)
+
+    def to_dict(self):
+        return {
+            "phases": {name: {"wall": wall, "cpu": cpu} for name, (wall, cpu) in self.phases.items()},
+            "lines_read": self.lines_read,
+            "valid_records": self.valid_records,
+            BAD_FORMAT: self.counters[BAD_FORMAT],
+            UNKNOWN_DAY: self.counters[UNKNOWN_DAY],
+            "users_created": self.counters["users_created"],
+            "dispatches": dict(self.dispatches),
+        }
+
+    def format_summary(self):
+        lines = ["[profile]"]
+        for name, (wall, cpu) in self.phases.items():
+            lines.append(f"  {name:<10} wall {wall:9.4f}s  cpu {cpu:9.4f}s")
+        stats = self.to_dict()
+        for name in ("lines_read", "valid_records", "bad_format", "unknown_day", "users_created"):
+            lines.append(f"  {name:<14} {stats[name]}")
+        for name, count in sorted(self.dispatches.items()):
+            lines.append(f"  dispatch {name:<20} {count}")
+        return '\n'.join(lines)
@@ -1,8 +1,20 @@
+import os
+import subprocess
+import sys
+
 import pytest
-from grading_strategies import NormalGradingStrategy, SilverGradingStrategy, GoldGradingStrategy
-from attendance import AttendanceSystem, Grade, InvalidDataError
-from bonus_strategies import BONUS_POINTS, BONUS_ATTENDANCE_COUNT, WednesdayBonusStrategy, WeekendBonusStrategy, AllBonusStrategy
-from grading_factory import GradingStrategyFactory, GOLD_GRADE_POINT, SILVER_GRADE_POINT
+from .grading_strategies import NormalGradingStrategy, SilverGradingStrategy, GoldGradingStrategy
+from .attendance import AttendanceSystem, Grade, InvalidDataError
+from .bonus_strategies import BONUS_POINTS, BONUS_ATTENDANCE_COUNT, WednesdayBonusStrategy, WeekendBonusStrategy, AllBonusStrategy
+from .grading_factory import GradingStrategyFactory, GOLD_GRADE_POINT, SILVER_GRADE_POINT
+
+# CLI 같은 하위 프로세스는 패키지를 담은 디렉터리에서 -m으로 실행한다
+PACKAGE_PARENT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def run_module(module, *args, **options):
+    return subprocess.run([sys.executable, "-m", f"{__package__}.{module}", *args], cwd=PACKAGE_PARENT, **options)
+
 
 @pytest.fixture
 def system():
@@ -390,4 +402,1338 @@ def test_run_with_mock_file(system, mock_file):
 
     # user3: 금요일 1회 = 1점, 등급 NORMAL
     assert system.points[user3_id] == 1
-    assert system.grade[user3_id] == Grade.NORMAL.value
\ No newline at end of file
+    assert system.grade[user3_id] == Grade.NORMAL.value
+
+def test_user_store_grows_beyond_initial_capacity(system):
+    """초기 용량을 넘는 사용자도 생성되고 컬럼이 2배씩 늘어나는지 테스트"""
+    initial_capacity = system.store.capacity
+    user_count = initial_capacity * 3
+
+    for i in range(user_count):
+        system.record_attendance(f"user{i}", "wednesday")
+
+    assert system.user_id_cnt == user_count
+    assert system.store.capacity == initial_capacity * 4
+    assert system.names[user_count] == f"user{user_count - 1}"
+    assert system.points[user_count] == 3
+    assert system.wednesday_attendance_count[user_count] == 1
+
+
+def test_day_matrix_is_contiguous_int32_block(system):
+    """요일별 출석 행렬이 하나의 연속된 int32 배열에 저장되는지 테스트"""
+    user_id = create_user_and_set_attendance(system, "matrix_user", [1, 2, 3, 4, 5, 6, 7])
+
+    matrix = system.attendance_by_day
+    assert matrix.data.typecode == 'i' and matrix.data.itemsize == 4
+    assert len(matrix.data) == system.store.capacity * system.NUM_DAYS
+    start = user_id * system.NUM_DAYS
+    assert matrix.data[start:start + system.NUM_DAYS].tolist() == [1, 2, 3, 4, 5, 6, 7]
+    assert matrix[user_id] == [1, 2, 3, 4, 5, 6, 7]
+
+
+@pytest.fixture
+def messy_file(tmp_path):
+    """잘못된 형식과 알 수 없는 요일이 섞인 테스트용 파일"""
+    file_content = """user1 monday
+user2 wednesday
+broken_line
+user3 funday
+user1 saturday
+
+user2 wednesday extra
+user4 sunday
+user1 wednesday
+"""
+    file_path = tmp_path / "messy_attendance.txt"
+    file_path.write_text(file_content, encoding='utf-8')
+    return file_path
+
+
+def run_and_capture(file_path, capsys, mode, **system_kwargs):
+    system = AttendanceSystem(**system_kwargs)
+    system.run(file_path, mode=mode)
+    return system, capsys.readouterr().out
+
+
+@pytest.mark.parametrize("use_numpy", [False, True])
+def test_bulk_ingest_matches_line_mode(messy_file, capsys, monkeypatch, use_numpy):
+    """일괄 적재 결과(출력, 포인트, 사용자 순서)가 줄 단위 경로와 같은지 테스트"""
+    if use_numpy:
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(f"{__package__}.bulk_ingest.load_numpy", lambda: None)
+
+    line_system, line_output = run_and_capture(messy_file, capsys, "line")
+    bulk_system, bulk_output = run_and_capture(messy_file, capsys, "bulk")
+
+    assert bulk_output == line_output
+    assert bulk_system.names == line_system.names
+    for user_id in range(1, line_system.user_id_cnt + 1):
+        assert bulk_system.attendance_by_day[user_id] == line_system.attendance_by_day[user_id]
+        assert bulk_system.points[user_id] == line_system.points[user_id]
+        assert bulk_system.wednesday_attendance_count[user_id] == line_system.wednesday_attendance_count[user_id]
+        assert bulk_system.weekend_attendance_count[user_id] == line_system.weekend_attendance_count[user_id]
+
+
+def test_run_rejects_unknown_ingest_mode(system, mock_file):
+    with pytest.raises(ValueError):
+        system.run(mock_file, mode="unknown")
+
+
+def test_factories_reuse_strategy_instances(system):
+    """팩토리가 호출마다 새 전략 객체를 만들지 않고 재사용하는지 테스트"""
+    assert system.day_factory.get_strategy("monday") is system.day_factory.get_strategy("monday")
+    assert system.grading_factory.get_strategy(GOLD_GRADE_POINT) is system.grading_factory.get_strategy(GOLD_GRADE_POINT + 1)
+    assert system.bonus_factory.get_strategy() is system.bonus_factory.get_strategy()
+
+
+def test_compiled_day_table(system):
+    """요일 토큰이 (인덱스, 포인트, 카운터 컬럼) 표로 컴파일되는지 테스트"""
+    index, add_point, flag_column, strategy = system.day_table["wednesday"]
+    assert (index, add_point, strategy) == (2, 3, None)
+    assert flag_column is system.wednesday_attendance_count
+    assert system.day_table["sunday"][2] is system.weekend_attendance_count
+    assert system.day_table["monday"][2] is None
+
+
+def test_compiled_finalize_matches_strategy_path(messy_file):
+    """표 조회 기반 마감 결과가 전략 객체 기반 결과와 같은지 테스트"""
+    compiled = AttendanceSystem()
+    reference = AttendanceSystem()
+    for target in (compiled, reference):
+        target.ingest(messy_file)
+        for user_name, days in (("bonus_a", ["wednesday"] * 10 + ["saturday"] * 10),
+                                ("bonus_b", ["sunday"] * 6 + ["saturday"] * 4 + ["monday"] * 5)):
+            for day in days:
+                target.record_attendance(user_name, day)
+
+    compiled.finalize()
+    for user_id in range(1, reference.user_id_cnt + 1):
+        reference.calculate_bonus_points(user_id)
+        reference.determine_grade(user_id)
+
+    for user_id in range(1, reference.user_id_cnt + 1):
+        assert compiled.points[user_id] == reference.points[user_id]
+        assert compiled.grade[user_id] == reference.grade[user_id]
+
+
+def test_custom_day_strategy_still_dispatched(system, tmp_path):
+    """사용자 정의 요일 전략을 등록하면 줄 단위/일괄 적재 모두 그 전략을 사용하는지 테스트"""
+    from .day_strategies import AttendanceStrategy
+
+    class HolidayStrategy(AttendanceStrategy):
+        def execute(self, user_id, system):
+            system.points[user_id] += 5
+
+    system.register_day_strategy("holiday", HolidayStrategy({}))
+    system.record_attendance("holiday_user", "holiday")
+    assert system.points[system.user_name_to_id["holiday_user"]] == 5
+
+    file_path = tmp_path / "holiday.txt"
+    file_path.write_text("holiday_user holiday\nholiday_user holiday\n")
+    system.ingest(file_path, mode="bulk")
+    assert system.points[system.user_name_to_id["holiday_user"]] == 15
+
+
+def test_custom_grading_factory_uses_strategy_path(system):
+    """get_strategy를 재정의한 등급 팩토리는 마감 시 전략 경로를 사용하는지 테스트"""
+    class AlwaysGoldFactory(GradingStrategyFactory):
+        def get_strategy(self, user_points):
+            return GoldGradingStrategy()
+
+    system.grading_factory = AlwaysGoldFactory()
+    system.compile_rules()
+    system.record_attendance("gold_user", "monday")
+    system.finalize()
+    assert system.grade[system.user_name_to_id["gold_user"]] == Grade.GOLD.value
+
+
+def test_rules_loaded_from_config(tmp_path):
+    """설정 파일에서 규칙을 읽어 포인트와 등급 기준을 바꿀 수 있는지 테스트"""
+    config_path = tmp_path / "rules.json"
+    config_path.write_text(
+        '{"days": {"monday": {"index": 0, "add_point": 4}},'
+        ' "bonus": {"attendance_count": 2, "points": 7, "wednesday_index": 0},'
+        ' "grades": {"gold": 15, "silver": 5}}'
+    )
+    system = AttendanceSystem.from_config(config_path)
+
+    system.record_attendance("config_user", "monday")
+    system.record_attendance("config_user", "monday")
+    system.finalize()
+
+    user_id = system.user_name_to_id["config_user"]
+    assert system.points[user_id] == 4 * 2 + 7
+    assert system.grade[user_id] == Grade.GOLD.value
+
+
+def test_rules_reject_out_of_range_day_index():
+    from .rules import RuleSet
+    with pytest.raises(ValueError):
+        RuleSet(day_info={"someday": {"index": 7, "add_point": 1}})
+
+
+def test_parallel_ingest_matches_line_mode(messy_file, capsys):
+    """병렬 적재 결과가 줄 단위 경로와 같은지 테스트 (사용자 순서, 경고 순서 포함)"""
+    line_system, line_output = run_and_capture(messy_file, capsys, "line")
+
+    parallel_system = AttendanceSystem()
+    parallel_system.run(messy_file, mode="parallel", workers=2)
+    parallel_output = capsys.readouterr().out
+
+    assert parallel_output == line_output
+    assert parallel_system.names == line_system.names
+
+
+def test_split_ranges_are_newline_aligned(tmp_path):
+    from .parallel_ingest import split_ranges
+
+    file_path = tmp_path / "ranges.txt"
+    file_path.write_bytes(b"".join(f"user{i} monday\n".encode() for i in range(100)))
+    data = file_path.read_bytes()
+
+    ranges = split_ranges(file_path, 7)
+    assert ranges[0][0] == 0 and ranges[-1][1] == len(data)
+    for (_, end), (next_start, _) in zip(ranges, ranges[1:]):
+        assert end == next_start
+        assert data[end - 1:end] == b"\n"
+
+
+def test_partial_aggregate_merge_is_order_independent(tmp_path):
+    """구간 결과를 어떤 순서로 병합해도 첫 등장 순서와 합계가 같은지 테스트"""
+    from .parallel_ingest import split_ranges, aggregate_range, portable_day_table, PartialAggregate
+
+    file_path = tmp_path / "merge.txt"
+    file_path.write_text("".join(f"user{i % 13} {day}\n" for i, day in
+                                 enumerate(["monday", "wednesday", "sunday", "friday"] * 30)))
+    system = AttendanceSystem()
+    table = portable_day_table(system)
+    partials = [aggregate_range(file_path, start, end, table, system.NUM_DAYS)
+                for start, end in split_ranges(file_path, 5)]
+
+    forward = PartialAggregate(system.NUM_DAYS)
+    for partial in partials:
+        forward.merge(partial)
+    backward = PartialAggregate(system.NUM_DAYS)
+    for partial in reversed(partials):
+        backward.merge(partial)
+
+    assert forward.users == backward.users
+    first_seen_order = sorted(forward.users, key=lambda name: forward.users[name][0])
+    assert first_seen_order == [f"user{i}" for i in range(13)]
+
+
+def test_all_bonus_strategy_is_idempotent(system):
+    """보너스를 여러 번 다시 계산해도 포인트가 중복으로 더해지지 않는지 테스트"""
+    user_id = create_user_and_set_attendance(system, "idempotent_user", [0, 0, 10, 0, 0, 5, 5])
+    system.points[user_id] = 50
+
+    for _ in range(3):
+        system.calculate_bonus_points(user_id)
+    assert system.points[user_id] == 50 + BONUS_POINTS * 2
+
+    # 출석이 바뀌면 보너스만 교체된다
+    system.attendance_by_day[user_id][5] = 0
+    system.calculate_bonus_points(user_id)
+    assert system.points[user_id] == 50 + BONUS_POINTS
+
+
+def test_finalize_twice_gives_same_points(mock_file):
+    system = AttendanceSystem()
+    system.ingest(mock_file)
+    for _ in range(10):
+        system.record_attendance("user2", "wednesday")
+    system.finalize()
+    points = list(system.points[:system.user_id_cnt + 1])
+    system.finalize()
+    assert list(system.points[:system.user_id_cnt + 1]) == points
+
+
+def test_follower_emits_grade_and_removed_events(tmp_path):
+    """로그에 줄이 추가될 때 해당 사용자의 등급/탈락 후보 변화만 이벤트로 알리는지 테스트"""
+    from .follow import AttendanceFollower, FollowEvent
+
+    log_path = tmp_path / "live.txt"
+    log_path.write_text("alice monday\n")
+    system = AttendanceSystem()
+    follower = AttendanceFollower(system, log_path)
+    follower.catch_up()
+    alice_id = system.user_name_to_id["alice"]
+    assert system.is_removed_candidate(alice_id)
+
+    with open(log_path, "a") as f:
+        f.write("alice wednesday\n" * 9)
+        f.write("alice wednesday")  # 줄바꿈이 없는 줄은 아직 반영하지 않는다
+    events = follower.poll()
+    assert events == [FollowEvent("alice", "removed", True, False)]
+    assert system.points[alice_id] == 1 + 3 * 9
+
+    with open(log_path, "a") as f:
+        f.write("\n")
+    events = follower.poll()
+    # 수요일 10회 보너스까지 반영되어 SILVER가 된다
+    assert events == [FollowEvent("alice", "grade", "NORMAL", "SILVER")]
+    assert system.points[alice_id] == 1 + 3 * 10 + BONUS_POINTS
+
+    with open(log_path, "a") as f:
+        f.write("alice wednesday\n" * 4)
+    events = follower.poll()
+    assert events == [FollowEvent("alice", "grade", "SILVER", "GOLD")]
+    assert system.points[alice_id] == 1 + 3 * 14 + BONUS_POINTS
+
+
+def test_follower_is_not_idle_while_lines_arrive(tmp_path, monkeypatch):
+    """이벤트를 일으키지 않는 줄이라도 들어오는 동안에는 max_idle로 멈추지 않는지 테스트"""
+    from . import follow
+    from .follow import AttendanceFollower
+
+    log_path = tmp_path / "live.txt"
+    log_path.write_text("")
+    system = AttendanceSystem()
+    follower = AttendanceFollower(system, log_path, poll_interval=0.1)
+    appended = []
+
+    def fake_sleep(seconds):
+        # 쉬는 동안 작성자가 등급/탈락 후보를 바꾸지 않는 줄을 하나씩 덧붙인다
+        if len(appended) < 10:
+            with open(log_path, "a") as f:
+                f.write("alice monday\n")
+            appended.append(seconds)
+
+    monkeypatch.setattr(follow.time, "sleep", fake_sleep)
+    follower.follow(lambda event: None, max_idle=0.3)
+    assert system.points[system.user_name_to_id["alice"]] == 10
+
+
+@pytest.mark.parametrize("mode", ["line", "bulk", "mmap", "parallel"])
+def test_warnings_include_line_numbers(messy_file, capsys, mode):
+    """모든 적재 방식이 경고에 줄 번호를 붙이는지 테스트"""
+    AttendanceSystem().ingest(messy_file, mode=mode, workers=2)
+    output = capsys.readouterr().out
+    assert output.splitlines() == [
+        "경고: 잘못된 형식의 데이터: 'broken_line' (줄 3)",
+        "경고: 알 수 없는 요일: 'funday' (줄 4)",
+        "경고: 잘못된 형식의 데이터: '' (줄 6)",
+        "경고: 잘못된 형식의 데이터: 'user2 wednesday extra' (줄 7)",
+    ]
+
+
+def test_mmap_ingest_matches_line_mode(messy_file, capsys):
+    """mmap 바이트 단위 적재 결과가 줄 단위 경로와 같은지 테스트"""
+    line_system, line_output = run_and_capture(messy_file, capsys, "line")
+    mmap_system, mmap_output = run_and_capture(messy_file, capsys, "mmap")
+
+    assert mmap_output == line_output
+    assert mmap_system.names == line_system.names
+    assert list(mmap_system.points) == list(line_system.points)
+
+
+def test_mmap_ingest_resolves_utf8_names(tmp_path):
+    file_path = tmp_path / "names.txt"
+    file_path.write_text("철수 monday\r\n영희 sunday\r\n철수 wednesday\r\n", encoding='utf-8')
+    system = AttendanceSystem()
+    system.ingest(file_path, mode="mmap")
+
+    assert system.names[1:] == ["철수", "영희"]
+    assert system.name_table.get_id("영희".encode()) == 2
+    assert system.points[1] == 1 + 3
+
+
+def test_mmap_ingest_empty_file(tmp_path):
+    file_path = tmp_path / "empty.txt"
+    file_path.write_text("")
+    system = AttendanceSystem()
+    system.ingest(file_path, mode="mmap")
+    assert system.user_id_cnt == 0
+
+
+def test_grading_strategies_supply_labels():
+    assert NormalGradingStrategy().label == "NORMAL"
+    assert SilverGradingStrategy().label == "SILVER"
+    assert GoldGradingStrategy().label == "GOLD"
+
+
+@pytest.fixture
+def finalized_system(messy_file, capsys):
+    system = AttendanceSystem()
+    system.ingest(messy_file)
+    for _ in range(10):
+        system.record_attendance("user2", "wednesday")
+    system.finalize()
+    capsys.readouterr()
+    return system
+
+
+def test_text_sink_matches_print_output(finalized_system, capsys):
+    """텍스트 출력이 기존 사용자별 print 출력과 같은지 테스트"""
+    for user_id in range(1, finalized_system.user_id_cnt + 1):
+        finalized_system.print_user_summary(user_id)
+    finalized_system.print_removed_players()
+    expected = capsys.readouterr().out
+
+    finalized_system.print_report()
+    assert capsys.readouterr().out == expected
+
+
+def test_csv_and_jsonl_sinks(finalized_system):
+    import csv
+    import io
+    import json
+
+    stream = io.StringIO()
+    finalized_system.print_report("csv", stream)
+    rows = list(csv.reader(io.StringIO(stream.getvalue())))
+    assert rows[0] == ["name", "points", "grade", "removed"]
+    assert rows[1] == ["user1", str(finalized_system.points[1]), "NORMAL", "0"]
+    assert len(rows) == finalized_system.user_id_cnt + 1
+
+    stream = io.StringIO()
+    finalized_system.print_report("jsonl", stream)
+    records = [json.loads(line) for line in stream.getvalue().splitlines()]
+    assert records[1] == {"name": "user2", "points": finalized_system.points[2], "grade": "SILVER", "removed": False}
+    assert [r["name"] for r in records if r["removed"]] == finalized_system.build_report().removed_names()
+
+
+def test_binary_sink_round_trip(finalized_system, tmp_path):
+    """고정 길이 바이너리 보고서를 mmap으로 다시 읽을 수 있는지 테스트"""
+    import mmap
+    from .report import read_binary_report
+
+    path = tmp_path / "report.bin"
+    with open(path, "wb") as f:
+        finalized_system.print_report("binary", f)
+
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        records = read_binary_report(mm)
+
+    report = finalized_system.build_report()
+    assert records == [(row.name, row.points, row.grade, row.removed) for row in report.rows]
+
+
+def test_unknown_output_format(finalized_system):
+    with pytest.raises(ValueError):
+        finalized_system.print_report("xml")
+
+
+def test_incremental_run_ingests_only_new_tail(tmp_path, capsys, monkeypatch):
+    """스냅숏 이후에 추가된 줄만 적재해도 전체를 다시 처리한 결과와 같은지 테스트"""
+    from . import bulk_ingest
+    log_path = tmp_path / "hourly.txt"
+    snapshot_path = tmp_path / "hourly.snapshot"
+    log_path.write_text("user1 wednesday\n" * 10 + "user2 monday\nbad line here\n")
+    AttendanceSystem().run(log_path, snapshot_path=snapshot_path)
+    capsys.readouterr()
+
+    with open(log_path, "a") as f:
+        f.write("user3 sunday\n" + "user1 saturday\n" * 10 + "user4 funday\nuser5 partial")
+
+    ingested = []
+    original_ingest_text = bulk_ingest.BulkIngestEngine.ingest_text
+    monkeypatch.setattr(bulk_ingest.BulkIngestEngine, "ingest_text",
+                        lambda self, text, first_line_no=1: (ingested.append(text),
+                                                             original_ingest_text(self, text, first_line_no)))
+    incremental = AttendanceSystem()
+    incremental.run(log_path, snapshot_path=snapshot_path)
+    incremental_output = capsys.readouterr().out
+
+    # 줄바꿈이 오지 않은 마지막 줄은 아직 처리하지 않는다
+    assert ingested == ["user3 sunday\n" + "user1 saturday\n" * 10 + "user4 funday\n"]
+    assert "경고: 알 수 없는 요일: 'funday' (줄 24)" in incremental_output
+
+    full_path = tmp_path / "full.txt"
+    full_path.write_bytes(log_path.read_bytes().rsplit(b"\n", 1)[0] + b"\n")
+    reference = AttendanceSystem()
+    reference.run(full_path)
+    reference_output = capsys.readouterr().out
+    report_start = reference_output.index("NAME")
+    assert incremental_output[incremental_output.index("NAME"):] == reference_output[report_start:]
+    assert list(incremental.points) == list(reference.points)
+    # 통계에는 스냅숏에서 복원한 상태가 아니라 이번에 읽은 줄만 들어간다
+    assert (incremental.stats.lines_read, incremental.stats.counters["users_created"]) == (12, 2)
+
+    rerun = AttendanceSystem()
+    rerun.run(log_path, snapshot_path=snapshot_path)
+    capsys.readouterr()
+    assert rerun.stats.to_dict()["lines_read"] == 0
+    assert rerun.stats.to_dict()["users_created"] == 0
+
+
+def test_snapshot_invalidated_when_prefix_or_rules_change(tmp_path, capsys):
+    from .checkpoint import CheckpointStore
+    from .rules import RuleSet
+
+    log_path = tmp_path / "log.txt"
+    snapshot_path = tmp_path / "log.snapshot"
+    log_path.write_text("user1 monday\nuser2 friday\n")
+    AttendanceSystem().run(log_path, snapshot_path=snapshot_path)
+
+    offset, _, _ = CheckpointStore(snapshot_path).load(AttendanceSystem(), log_path)
+    assert offset == len(log_path.read_bytes())
+
+    # 규칙 상수가 바뀌면 무효
+    changed_rules = AttendanceSystem(RuleSet(gold_grade_point=60))
+    assert CheckpointStore(snapshot_path).load(changed_rules, log_path)[0] == 0
+
+    # 앞부분 내용이 바뀌면 무효
+    log_path.write_text("user9 monday\nuser2 friday\nuser3 sunday\n")
+    system = AttendanceSystem()
+    assert CheckpointStore(snapshot_path).load(system, log_path)[0] == 0
+    assert system.user_id_cnt == 0
+
+    system.run(log_path, snapshot_path=snapshot_path)
+    assert system.names[1:] == ["user9", "user2", "user3"]
+
+
+def test_name_table_lookup_and_reverse_lookup():
+    """이름 표가 bytes로 ID를 찾고, ID로 이름을 돌려주는지 테스트 (색인 확장 포함)"""
+    from .name_table import NameTable, INITIAL_SLOTS
+
+    table = NameTable()
+    names = [f"member{i}".encode() for i in range(INITIAL_SLOTS * 2)] + ["김철수".encode()]
+    ids = [table.add(name) for name in names]
+
+    assert ids == list(range(1, len(names) + 1))
+    assert len(table.slots) > INITIAL_SLOTS
+    assert all(table.get_id(name) == user_id for name, user_id in zip(names, ids))
+    assert table.add(b"member5") == 6
+    assert table.get_id(b"nobody") is None
+    assert table.name(len(names)) == "김철수"
+    assert table.arena == b"".join(names)
+    # 길이만 다르고 앞부분이 같은 이름을 같은 이름으로 보지 않는다
+    assert table.get_id(b"member1") == 2 and table.get_id(b"member10") == 11
+    assert table.get_id(b"member1000000") is None
+
+
+def test_name_table_recent_cache_is_bounded(monkeypatch):
+    from . import name_table
+    monkeypatch.setattr(name_table, "RECENT_CACHE_SIZE", 4)
+    system = AttendanceSystem()
+    for i in range(20):
+        system.record_attendance(f"user{i}", "monday")
+    assert len(system.name_table._recent_ids) <= 4
+    assert [system.get_or_create_user_id(f"user{i}") for i in range(20)] == list(range(1, 21))
+    assert system.name_table.get_id(b"user3") == 4
+    assert len(system.name_table._recent_byte_ids) <= 4
+
+
+def test_name_table_keeps_str_and_bytes_caches_apart():
+    """같은 해시를 갖는 str 이름과 bytes 이름을 같은 캐시에서 비교하지 않는지 테스트 (python -bb에서 BytesWarning)"""
+    code = (f"from {__package__}.attendance import AttendanceSystem\n"
+            "a, b = AttendanceSystem(), AttendanceSystem()\n"
+            "a.record_attendance('alice', 'monday')\n"
+            "b.record_attendance('alice', 'monday')\n"
+            "b.record_attendance('bob', 'monday')\n"
+            "a.merge(b)\n"
+            "assert a.name_table.get('alice') == a.name_table.get_id(b'alice') == 1\n")
+    subprocess.run([sys.executable, "-bb", "-c", code], cwd=PACKAGE_PARENT, check=True)
+
+
+def test_system_names_backed_by_name_table(system):
+    system.record_attendance("alice", "monday")
+    system.record_attendance("bob", "monday")
+
+    assert system.user_name_to_id is system.name_table
+    assert "alice" in system.user_name_to_id and "carol" not in system.user_name_to_id
+    assert system.names[2] == "bob"
+    assert system.names == ["", "alice", "bob"]
+    with pytest.raises(KeyError):
+        system.user_name_to_id["carol"]
+
+
+def test_invalid_utf8_name_is_rejected_before_insert(system):
+    with pytest.raises(UnicodeDecodeError):
+        system.get_or_create_user_id_from_bytes(b"\xff\xfe")
+    assert system.user_id_cnt == 0
+    assert len(system.name_table) == 0
+
+
+def test_workload_generator_is_reproducible(tmp_path):
+    """생성기가 같은 시드로 같은 파일을 만들고, 편중과 잘못된 줄 비율을 따르는지 테스트"""
+    from collections import Counter
+    from .workload import write_workload, WEEKDAYS
+
+    first, second = tmp_path / "a.txt", tmp_path / "b.txt"
+    write_workload(first, 20000, 50, zipf_exponent=1.5, malformed_rate=0.05, seed=7)
+    write_workload(second, 20000, 50, zipf_exponent=1.5, malformed_rate=0.05, seed=7)
+    assert first.read_bytes() == second.read_bytes()
+
+    lines = first.read_text().splitlines()
+    assert len(lines) == 20000
+    valid = [line.split() for line in lines if len(line.split()) == 2 and line.split()[1] in WEEKDAYS]
+    assert 0.9 < len(valid) / len(lines) < 0.99
+
+    # Zipf 편중: 가장 활발한 사용자가 전체 출석의 상당 부분을 차지한다
+    top_user_count = Counter(name for name, _ in valid).most_common(1)[0][1]
+    assert top_user_count > len(valid) * 0.2
+
+
+def test_benchmark_engines_agree(tmp_path):
+    from .benchmark import benchmark
+    from .workload import write_workload
+
+    file_path = tmp_path / "bench.txt"
+    write_workload(file_path, 3000, 40, malformed_rate=0.01, seed=3)
+    summary = benchmark(str(file_path), ["mission2-line", "mission2-bulk", "mission2-mmap"])
+
+    assert summary["lines"] == 3000
+    assert [result["engine"] for result in summary["results"]] == ["mission2-line", "mission2-bulk", "mission2-mmap"]
+    for result in summary["results"]:
+        assert result["same_output"]
+        assert set(result["timings"]) == {"ingest", "bonus", "grading", "report", "total"}
+        assert result["lines_per_sec"] > 0 and result["peak_rss_mb"] > 0
+
+
+@pytest.mark.parametrize("mode", ["line", "bulk", "combine", "mmap", "parallel"])
+def test_run_stats_counters(messy_file, capsys, mode):
+    """실행 후 단계별 시간과 처리 카운터가 구조화된 통계로 제공되는지 테스트"""
+    system = AttendanceSystem()
+    system.run(messy_file, mode=mode, workers=2)
+    stats = system.stats.to_dict()
+
+    assert set(stats["phases"]) == {"ingest", "bonus", "grading", "report"}
+    assert all(timing["wall"] >= 0 and timing["cpu"] >= 0 for timing in stats["phases"].values())
+    assert stats["lines_read"] == 9
+    assert stats["valid_records"] == 5
+    assert stats["bad_format"] == 3
+    assert stats["unknown_day"] == 1
+    assert stats["users_created"] == 4
+    assert stats["dispatches"] == {"SimpleDayStrategy": 1, "WednesdayStrategy": 2, "WeekendStrategy": 2}
+
+
+def test_run_stats_count_lines_read_not_matrix_changes(tmp_path, capsys):
+    """중복 이벤트와 기간 만료가 출석 행렬을 바꾸지 않거나 되돌려도 읽은 줄 수와 유효 기록 수가 맞는지 테스트"""
+    from .dedup import DedupAttendanceSystem
+    from .rolling_window import RollingWindowAttendanceSystem
+
+    events = tmp_path / "events.txt"
+    events.write_text("Umar monday e1\nXena tuesday e2\nUmar monday e1\nXena friday e3\n", encoding='utf-8')
+    system = DedupAttendanceSystem()
+    system.ingest(str(events))
+    assert (system.stats.lines_read, system.stats.valid_records) == (4, 3)
+
+    dated = tmp_path / "dated.txt"
+    dated.write_text("Umar monday 2024-01-01\nUmar monday 2024-03-04\n", encoding='utf-8')
+    system = RollingWindowAttendanceSystem(window_days=7)
+    system.ingest(str(dated))
+    assert system.attendance_by_day[1][0] == 1
+    assert (system.stats.lines_read, system.stats.valid_records) == (2, 2)
+
+
+def test_profile_summary_goes_to_stderr(mock_file, capsys):
+    AttendanceSystem(profile=True).run(mock_file)
+    captured = capsys.readouterr()
+    assert "[profile]" in captured.err
+    assert "lines_read     4" in captured.err
+    assert "[profile]" not in captured.out
+
+
+def test_server_batches_records_and_answers_queries(tmp_path):
+    """소켓으로 받은 기록이 배치로 반영되고, 조회가 메모리 상태로 답하는지 테스트"""
+    import asyncio
+    from .server import AttendanceServer
+
+    async def scenario():
+        server = AttendanceServer(batch_size=4, flush_interval=0.01, queue_size=2)
+        await server.start(unix_path=str(tmp_path / "attendance.sock"))
+        reader, writer = await asyncio.open_unix_connection(str(tmp_path / "attendance.sock"))
+        writer.write(("Umar wednesday\n" * 10 + "Umar bad line\n!sync\n").encode('utf-8'))
+        await writer.drain()
+        assert await reader.readline() == b"OK\n"
+        writer.write("? Umar\n? Nobody\n".encode('utf-8'))
+        replies = [await reader.readline(), await reader.readline()]
+        writer.close()
+        await server.stop()
+        return server, replies
+
+    server, replies = asyncio.run(scenario())
+    assert replies == [b"Umar 40 SILVER\n", b"Nobody NOT_FOUND\n"]
+    assert server.events_applied == 11
+    assert server.batches_applied >= 3  # batch_size 4, 대기열 크기 2 -> 여러 배치로 나뉜다
+
+
+def test_server_warns_on_undecodable_line_and_keeps_connection(tmp_path, capsys):
+    """UTF-8이 아닌 기록이 와도 연결이 끊기지 않고, 그 줄은 잘못된 형식 경고로 남는지 테스트"""
+    import asyncio
+    from .server import AttendanceServer
+
+    async def scenario():
+        server = AttendanceServer(flush_interval=0.01)
+        await server.start(unix_path=str(tmp_path / "attendance.sock"))
+        reader, writer = await asyncio.open_unix_connection(str(tmp_path / "attendance.sock"))
+        writer.write(b"Umar wednesday\n\xff\xfe monday\nUmar wednesday\n!sync\n? Umar\n")
+        await writer.drain()
+        replies = [await reader.readline(), await reader.readline()]
+        writer.close()
+        await server.stop()
+        return server, replies
+
+    server, replies = asyncio.run(scenario())
+    assert replies == [b"OK\n", b"Umar 6 NORMAL\n"]
+    assert server.events_applied == 2
+    assert server.system.stats.counters["bad_format"] == 1
+    assert "경고: 잘못된 형식의 데이터: '\ufffd\ufffd monday'" in capsys.readouterr().out
+
+
+@pytest.mark.parametrize("mode", ["line", "bulk", "mmap", "parallel"])
+def test_removed_player_index_matches_full_scan(messy_file, capsys, mode):
+    """색인으로 얻은 탈락 후보가 전체 사용자를 훑은 결과와 같은지 테스트"""
+    system = AttendanceSystem()
+    system.ingest(messy_file, mode, workers=2)
+    full_scan = [i for i in range(1, system.user_id_cnt + 1) if system.is_removed_candidate(i)]
+    assert system.removed_players.user_ids() == full_scan
+    system.finalize()
+    full_scan = [i for i in range(1, system.user_id_cnt + 1) if system.is_removed_candidate(i)]
+    assert system.removed_players.user_ids() == full_scan
+    assert len(system.removed_players) == len(full_scan)
+
+
+def test_removed_player_index_updates_mid_stream():
+    system = AttendanceSystem()
+    system.process_line("Umar monday")
+    system.process_line("Daisy monday")
+    assert system.removed_players.names() == ["Umar", "Daisy"]
+
+    system.process_line("Umar sunday")
+    assert system.removed_players.names() == ["Daisy"]
+
+    for _ in range(30):
+        system.process_line("Daisy monday")
+    system.assign_grades()
+    assert system.removed_players.names() == []
+    assert len(system.removed_players) == 0
+
+
+def test_removed_player_index_uses_flag_column():
+    """탈락 후보 색인이 사용자별 1바이트 플래그 컬럼에 담기고 컬럼과 함께 늘어나는지 테스트"""
+    system = AttendanceSystem()
+    for i in range(300):
+        system.process_line(f"user{i} {'sunday' if i % 3 == 0 else 'monday'}")
+    flags = system.store.removed_candidate
+    assert len(flags) == system.store.capacity
+    assert system.removed_players.user_ids() == [user_id for user_id in range(1, 301) if (user_id - 1) % 3]
+    assert 1 not in system.removed_players and 2 in system.removed_players
+
+
+@pytest.mark.parametrize("mode", ["line", "bulk", "mmap", "parallel"])
+def test_points_index_matches_sorted_scan(tmp_path, capsys, mode):
+    """포인트 색인의 상위 K, 순위, 구간, 등급별 인원이 전체 정렬 결과와 같은지 테스트"""
+    from .workload import write_workload
+
+    file_path = tmp_path / "workload.txt"
+    write_workload(file_path, 5000, 200, malformed_rate=0.01, seed=5)
+    system = AttendanceSystem()
+    system.ingest(str(file_path), mode, workers=2)
+    system.finalize()
+    index = system.points_index
+
+    ranked = sorted(((system.points[i], i) for i in range(1, system.user_id_cnt + 1)), key=lambda x: (-x[0], x[1]))
+    assert len(index) == system.user_id_cnt
+    assert index.top(10) == [(user_id, points) for points, user_id in ranked[:10]]
+    for points, user_id in ranked[::17]:
+        assert index.rank(user_id) == 1 + sum(1 for other, _ in ranked if other > points)
+    expected = sorted((p, i) for p, i in ranked if 30 <= p <= 49)
+    assert index.range(30, 49) == [(user_id, points) for points, user_id in expected]
+    assert index.count_range(30, 49) == len(expected)
+
+    grades = [Grade(system.grade[i]).name for i in range(1, system.user_id_cnt + 1)]
+    assert index.grade_counts() == {name: grades.count(name) for name in ("NORMAL", "GOLD", "SILVER")}
+
+
+def test_points_index_follows_updates_and_grows():
+    system = AttendanceSystem()
+    system.process_line("Umar monday")
+    system.process_line("Daisy wednesday")
+    # 처음 조회하기 전에는 바뀐 사용자를 기록하지 않는다
+    assert not system.points_index._dirty and not system.points_index._indexed
+    assert system.points_index.top(2) == [(2, 3), (1, 1)]
+
+    for _ in range(1000):
+        system.process_line("Umar saturday")
+    system.apply_bonuses()
+    assert system.points_index.top(1) == [(1, 2011)]
+    assert system.points_index.rank(2) == 2
+    assert system.points_index.range(0, 10) == [(2, 3)]
+
+
+def test_points_index_ties_follow_id_order_after_updates():
+    """동점 버킷에서 상위 k명과 구간 조회가 ID 순서를 따르고, 버킷이 바뀐 뒤에도 맞는지 테스트"""
+    system = AttendanceSystem()
+    for i in range(50, 0, -1):
+        system.process_line(f"user{i} monday")
+    index = system.points_index
+    assert index.top(3) == [(1, 1), (2, 1), (3, 1)]
+    assert index.range(1, 1) == [(user_id, 1) for user_id in range(1, 51)]
+
+    system.process_line("user50 monday")
+    system.process_line("user49 tuesday")
+    assert index.top(3) == [(1, 2), (2, 2), (3, 1)]
+    assert index.range(1, 1) == [(user_id, 1) for user_id in range(3, 51)]
+    assert index.range(2, 2) == [(1, 2), (2, 2)]
+
+
+@pytest.mark.parametrize("mode", ["line", "bulk", "combine", "mmap", "parallel"])
+def test_warnings_are_rate_limited_and_quarantined(tmp_path, capsys, mode):
+    """경고가 분류별로 일부만 출력되고, 잘못된 줄이 원래 모양 그대로 모두 격리 파일에 남는지 테스트"""
+    file_path = tmp_path / "bad.txt"
+    file_path.write_text("Umar monday\n" + "broken\n" * 5 + "  Umar   funday  \n" * 3 + "Umar sunday\n",
+                         encoding='utf-8')
+    quarantine = tmp_path / "quarantine.tsv"
+
+    system = AttendanceSystem(warning_limit=2, quarantine_path=str(quarantine))
+    system.run(str(file_path), mode=mode, workers=2)
+    output = capsys.readouterr().out
+
+    assert output.count("경고: 잘못된 형식의 데이터") == 2
+    assert output.count("경고: 알 수 없는 요일") == 2
+    assert "경고 요약: 잘못된 형식 5건, 알 수 없는 요일 3건 (출력 생략 4건)" in output
+    assert "NAME : Umar, POINT : 3, GRADE : NORMAL" in output
+    assert quarantine.read_text(encoding='utf-8').splitlines() == (
+        [f"{n}\tbad_format\tbroken" for n in range(2, 7)]
+        + [f"{n}\tunknown_day\t  Umar   funday  " for n in range(7, 10)])
+
+
+@pytest.fixture
+def branch_files(tmp_path):
+    from .workload import write_workload
+
+    paths = []
+    for branch in range(3):
+        path = tmp_path / f"branch{branch}.txt"
+        write_workload(path, 2000, 60, malformed_rate=0.01, seed=branch)
+        paths.append(path)
+    concatenated = tmp_path / "all.txt"
+    concatenated.write_bytes(b''.join(path.read_bytes() for path in paths))
+    return tmp_path, concatenated
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_ingest_files_matches_concatenated_input(branch_files, capsys, workers):
+    """glob으로 받은 여러 파일을 병렬 집계한 결과가 이어 붙인 파일과 같은지 테스트"""
+    directory, concatenated = branch_files
+    expected = AttendanceSystem()
+    expected.ingest(str(concatenated))
+    expected.finalize()
+
+    system = AttendanceSystem()
+    system.ingest_files([str(directory / "branch*.txt")], workers=workers)
+    system.finalize()
+    capsys.readouterr()
+
+    assert system.build_report().rows == expected.build_report().rows
+    assert system.stats.to_dict()["bad_format"] + system.stats.to_dict()["unknown_day"] == \
+        expected.stats.to_dict()["bad_format"] + expected.stats.to_dict()["unknown_day"]
+
+
+def test_ingest_files_with_custom_strategy_counts_once(tmp_path, capsys):
+    """사용자 정의 전략이 있어 차례로 적재할 때도 통계가 한 번씩만 세어지는지 테스트"""
+    from .day_strategies import AttendanceStrategy
+
+    class HolidayStrategy(AttendanceStrategy):
+        def execute(self, user_id, system):
+            system.points[user_id] += 5
+
+    (tmp_path / "a.txt").write_text("Umar monday\nUmar wednesday\nUmar holiday\n")
+    (tmp_path / "b.txt").write_text("Xena sunday\nbroken\n")
+    system = AttendanceSystem()
+    system.register_day_strategy("holiday", HolidayStrategy({}))
+    system.ingest_files([str(tmp_path / "*.txt")])
+    capsys.readouterr()
+
+    stats = system.stats.to_dict()
+    assert stats["lines_read"] == 5
+    assert stats["users_created"] == 2
+    assert stats["dispatches"] == {"SimpleDayStrategy": 1, "WednesdayStrategy": 1, "WeekendStrategy": 1,
+                                   "HolidayStrategy": 1}
+
+
+def test_merge_combines_pre_bonus_state(branch_files, capsys):
+    directory, concatenated = branch_files
+    expected = AttendanceSystem()
+    expected.ingest(str(concatenated))
+    expected.finalize()
+
+    merged = AttendanceSystem()
+    for path in sorted(directory.glob("branch*.txt")):
+        part = AttendanceSystem()
+        part.ingest(str(path), "bulk")
+        part.finalize()  # 보너스가 적용된 부분 결과도 보너스를 빼고 합친다
+        merged.merge(part)
+    merged.finalize()
+    capsys.readouterr()
+
+    assert merged.build_report().rows == expected.build_report().rows
+    assert merged.removed_players.user_ids() == expected.removed_players.user_ids()
+
+
+def test_merge_rejects_different_rules():
+    from .rules import RuleSet
+    with pytest.raises(ValueError):
+        AttendanceSystem().merge(AttendanceSystem(RuleSet(gold_grade_point=60)))
+
+
+def test_rolling_window_matches_recomputation(tmp_path, capsys):
+    """링 버퍼로 만료시킨 결과가 기간 안의 줄만 다시 적재한 결과와 같은지 테스트"""
+    import random
+    from datetime import date, timedelta
+    from .rolling_window import RollingWindowAttendanceSystem
+    from .workload import WEEKDAYS
+
+    rng = random.Random(1)
+    first_day = date(2024, 1, 1)
+    records = []
+    for offset in range(90):
+        day = first_day + timedelta(days=offset)
+        for _ in range(rng.randint(0, 6)):
+            records.append((f"user{rng.randint(1, 12)}", WEEKDAYS[day.weekday()], day))
+    # 기간 안에서 조금 늦게 도착한 줄도 섞는다
+    records[-5], records[-20] = records[-20], records[-5]
+    file_path = tmp_path / "dated.txt"
+    file_path.write_text(''.join(f"{name} {weekday} {day}\n" for name, weekday, day in records), encoding='utf-8')
+
+    system = RollingWindowAttendanceSystem(window_days=28)
+    system.ingest(str(file_path))
+    system.finalize()
+
+    window_start = max(day for *_, day in records) - timedelta(days=27)
+    expected = AttendanceSystem()
+    for name, _, _ in records:
+        expected.get_or_create_user_id(name)
+    for name, weekday, day in records:
+        if day >= window_start:
+            expected.record_attendance(name, weekday)
+    expected.finalize()
+
+    assert system.build_report().rows == expected.build_report().rows
+    assert system.removed_players.user_ids() == expected.removed_players.user_ids()
+    assert system.points_index.top(3) == expected.points_index.top(3)
+    assert all(day >= window_start for day, _ in system.window_summary(1))
+
+
+def test_rolling_window_rejects_bad_dates(capsys):
+    from .rolling_window import RollingWindowAttendanceSystem
+
+    system = RollingWindowAttendanceSystem(window_days=7)
+    system.process_line("Umar monday 2024-01-02")
+    system.process_line("Umar monday 2024-13-01")
+    system.process_line("Umar monday 2024-01-08")
+    system.process_line("Umar monday 2023-12-25")  # 기간을 벗어난 늦은 기록
+    output = capsys.readouterr().out
+
+    assert "날짜와 요일이 맞지 않습니다" in output
+    assert "잘못된 날짜: '2024-13-01'" in output
+    assert system.points[1] == 1
+    assert system.stats.counters["expired_records"] == 1
+    with pytest.raises(ValueError):
+        system.ingest("attendance_weekday_500.txt", "bulk")
+
+
+@pytest.mark.parametrize("input_name", ["messy", "workload"])
+def test_sqlite_backend_matches_memory(tmp_path, capsys, messy_file, input_name):
+    """SQLite 백엔드의 출력(경고 포함)이 메모리 백엔드와 같은지 테스트"""
+    from .sqlite_store import SqliteAttendanceSystem
+    from .workload import write_workload
+
+    file_path = messy_file
+    if input_name == "workload":
+        file_path = str(tmp_path / "workload.txt")
+        write_workload(file_path, 20000, 300, malformed_rate=0.001, seed=4)
+
+    AttendanceSystem().run(file_path)
+    expected = capsys.readouterr().out
+    system = SqliteAttendanceSystem(str(tmp_path / "state.sqlite3"), batch_lines=1000)
+    assert system.run(file_path) is True
+    assert capsys.readouterr().out == expected
+    assert system.run(str(tmp_path / "missing.txt")) is False
+    indexes = [name for name, in system.connection.execute("SELECT name FROM sqlite_master WHERE type = 'index'")]
+    assert "users_total_points" not in indexes
+    system.close()
+
+
+def test_sqlite_backend_persists_between_runs(tmp_path, capsys):
+    from .sqlite_store import SqliteAttendanceSystem
+
+    first, second = tmp_path / "week1.txt", tmp_path / "week2.txt"
+    first.write_text("Umar wednesday\n" * 6 + "Daisy monday\n", encoding='utf-8')
+    second.write_text("Umar wednesday\n" * 6 + "Xena sunday\n", encoding='utf-8')
+    db_path = str(tmp_path / "state.sqlite3")
+
+    system = SqliteAttendanceSystem(db_path)
+    system.ingest(str(first))
+    system.close()
+    system = SqliteAttendanceSystem(db_path)
+    system.ingest(str(second))
+    system.finalize()
+
+    assert [(row.name, row.points, row.label) for row in system.build_report().rows] == \
+        [("Umar", 46, "SILVER"), ("Daisy", 1, "NORMAL"), ("Xena", 2, "NORMAL")]
+    assert system.removed_names() == ["Daisy"]
+    system.close()
+
+
+def test_sqlite_report_streams_rows_from_cursor(tmp_path):
+    """SQLite 보고서가 행을 목록으로 모으지 않고 흘려 보내며 이진 형식도 메모리 백엔드와 같은지 테스트"""
+    import io
+    from .sqlite_store import SqliteAttendanceSystem
+
+    sample_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "attendance_weekday_500.txt")
+    system = SqliteAttendanceSystem(str(tmp_path / "state.sqlite3"))
+    system.ingest(sample_path)
+    system.finalize()
+    report = system.build_report()
+    assert not isinstance(report.rows, list)
+    assert not isinstance(report.removed_names(), list)
+
+    expected = AttendanceSystem()
+    expected.ingest(sample_path)
+    expected.finalize()
+    assert list(report.rows) == expected.build_report().rows
+    assert list(report.removed_names()) == expected.build_report().removed_names()
+    actual, wanted = io.BytesIO(), io.BytesIO()
+    system.print_report("binary", actual)
+    expected.print_report("binary", wanted)
+    assert actual.getvalue() == wanted.getvalue()
+    system.close()
+
+
+@pytest.mark.parametrize("compression", ["gzip", "bz2", "xz"])
+@pytest.mark.parametrize("mode", ["line", "bulk", "mmap", "parallel"])
+def test_compressed_input_matches_plain(messy_file, tmp_path, capsys, compression, mode):
+    """압축된 입력을 매직 바이트로 알아보고 평문과 같은 결과를 내는지 테스트"""
+    import bz2, gzip, lzma
+    from .compressed_input import detect_compression
+
+    compress = {"gzip": gzip.compress, "bz2": bz2.compress, "xz": lzma.compress}[compression]
+    compressed = tmp_path / "attendance.log"  # 확장자가 아닌 내용으로 판단한다
+    compressed.write_bytes(compress(open(messy_file, 'rb').read()))
+    assert detect_compression(str(compressed)) == compression
+    assert detect_compression(messy_file) is None
+
+    AttendanceSystem().run(messy_file, mode=mode, workers=2)
+    expected = capsys.readouterr().out
+    AttendanceSystem().run(str(compressed), mode=mode, workers=2)
+    assert capsys.readouterr().out == expected
+
+
+@pytest.mark.parametrize("mode", ["line", "bulk", "mmap", "parallel"])
+def test_plain_file_starting_with_compression_magic(tmp_path, capsys, mode):
+    """'BZh'로 시작하는 이름이 첫 줄에 있는 평문 파일을 bz2로 잘못 알아보지 않는지 테스트"""
+    import bz2
+    from .compressed_input import detect_compression
+
+    file_path = tmp_path / "attendance.txt"
+    file_path.write_text("BZhang monday\nUmar wednesday\n")
+    assert detect_compression(str(file_path)) is None
+    empty_bz2 = tmp_path / "empty.bz2"
+    empty_bz2.write_bytes(bz2.compress(b''))
+    assert detect_compression(str(empty_bz2)) == "bz2"
+
+    system = AttendanceSystem()
+    assert system.run(str(file_path), mode=mode, workers=2)
+    assert "NAME : BZhang, POINT : 1, GRADE : NORMAL" in capsys.readouterr().out
+
+
+def test_decompressing_reader_streams_in_chunks_and_closes_early(tmp_path):
+    import gzip
+    from .compressed_input import DecompressingReader, open_text
+
+    file_path = tmp_path / "big.gz"
+    file_path.write_bytes(gzip.compress(b"Umar monday\r\n" * 200000))
+    with open_text(str(file_path)) as f:
+        assert f.readline() == "Umar monday\n"  # 평문 open과 같은 줄바꿈 처리
+
+    reader = DecompressingReader(str(file_path), "gzip", chunk_size=4096, queue_chunks=2)
+    assert reader.read(10) == b"Umar monda"
+    assert reader._queue.qsize() <= 2
+    reader.close()
+    assert not reader._thread.is_alive()
+
+
+def test_cli_reads_stdin_and_keeps_warnings_off_machine_output(messy_file):
+    """CLI가 '-'로 표준 입력을 읽고, 기계용 형식에서는 경고를 표준 오류로 보내는지 테스트"""
+    import json
+
+    with open(messy_file, 'rb') as f:
+        completed = run_module("attendance_cli", "-f", "jsonl", "-e", "bulk", "-",
+                               stdin=f, capture_output=True, text=True, encoding='utf-8', check=True)
+    rows = [json.loads(line) for line in completed.stdout.splitlines()]
+    assert [row["name"] for row in rows] == ["user1", "user2", "user3", "user4"]
+    assert "경고: 알 수 없는 요일: 'funday' (줄 4)" in completed.stderr
+
+    missing = run_module("attendance_cli", "missing.txt", capture_output=True, text=True)
+    assert missing.returncode == 1
+
+
+def test_cli_reads_stdin_as_utf8_regardless_of_locale():
+    """표준 입력도 파일 입력처럼 UTF-8로 읽는지 테스트 (C 로케일에서도 한글 이름이 깨지지 않는다)"""
+    from .report import read_binary_report
+
+    env = dict(os.environ, LC_ALL="C", PYTHONUTF8="0")
+    env.pop("PYTHONIOENCODING", None)
+    completed = run_module("attendance_cli", "-f", "binary", "-",
+                           input="김철수 monday\n김철수 wednesday\n".encode('utf-8'),
+                           capture_output=True, env=env, check=True)
+    assert read_binary_report(completed.stdout) == [("김철수", 4, 0, False)]
+
+
+def test_cli_import_is_fast_and_lazy():
+    from .benchmark import import_profile, IMPORT_TIME_BUDGET_MS
+
+    elapsed_ms, eagerly_loaded = import_profile()
+    assert eagerly_loaded == []
+    assert 0 < elapsed_ms <= IMPORT_TIME_BUDGET_MS
+
+
+@pytest.mark.parametrize("vectorized", [True, False])
+def test_batch_finalize_matches_strategy_reference(tmp_path, capsys, vectorized):
+    """컬럼 연산 마감이 사용자별 전략 경로(기준 구현)와 같은 보너스/등급을 내는지 테스트"""
+    from .workload import write_workload
+
+    file_path = tmp_path / "workload.txt"
+    write_workload(file_path, 30000, 2000, zipf_exponent=0.6, seed=8)
+    batch, reference = AttendanceSystem(), AttendanceSystem()
+    for system in (batch, reference):
+        system.ingest(str(file_path), "bulk")
+    batch.finalize(vectorized=vectorized)
+    batch.finalize(vectorized=vectorized)  # 다시 마감해도 보너스가 중복되지 않는다
+    reference.finalize_reference()
+
+    rows = reference.user_id_cnt + 1
+    assert batch.points[:rows] == reference.points[:rows]
+    assert batch.bonus_points[:rows] == reference.bonus_points[:rows]
+    assert batch.grade[:rows] == reference.grade[:rows]
+    assert batch.points_index.top(5) == reference.points_index.top(5)
+    assert batch.removed_players.user_ids() == reference.removed_players.user_ids()
+
+
+def test_grade_lookup_matches_sequential_thresholds():
+    from .vector_finalize import grade_lookup
+    assert grade_lookup([(50, Grade.GOLD.value), (30, Grade.SILVER.value)]) == \
+        ([30, 50], [Grade.NORMAL.value, Grade.SILVER.value, Grade.GOLD.value])
+    # 기준이 같으면 표에서 앞선 등급이 이긴다
+    assert grade_lookup([(40, Grade.GOLD.value), (40, Grade.SILVER.value)])[1][-1] == Grade.GOLD.value
+
+
+def test_concurrent_recorder_stress(capsys):
+    """여러 스레드가 동시에 기록해도 사용자 ID가 겹치지 않고 카운터가 순차 처리와 같은지 테스트"""
+    import sys
+    from .threaded_recorder import record_in_threads
+    from .workload import generate_lines
+
+    # 1000명이라 기록하는 도중 컬럼이 여러 번 늘어난다
+    lines = ''.join(generate_lines(40000, 1000, malformed_rate=0.001, seed=11)).splitlines()
+    expected = AttendanceSystem()
+    for line in lines:
+        expected.process_line(line)
+
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)  # 스레드 전환을 자주 일으킨다
+    try:
+        system = AttendanceSystem()
+        record_in_threads(system, lines, thread_count=8, stripes=4)
+    finally:
+        sys.setswitchinterval(interval)
+    capsys.readouterr()
+
+    assert system.user_id_cnt == expected.user_id_cnt
+    assert sorted(system.names) == sorted(expected.names)
+    for name in expected.names[1:]:
+        user_id, expected_id = system.user_name_to_id[name], expected.user_name_to_id[name]
+        assert list(system.attendance_by_day[user_id]) == list(expected.attendance_by_day[expected_id])
+        assert system.points[user_id] == expected.points[expected_id]
+        assert system.wednesday_attendance_count[user_id] == expected.wednesday_attendance_count[expected_id]
+    assert system.stats.counters["bad_format"] + system.stats.counters["unknown_day"] == \
+        expected.stats.counters["bad_format"] + expected.stats.counters["unknown_day"]
+
+
+def test_concurrent_recorder_custom_strategy_shares_user_lock(capsys):
+    """사용자 정의 전략과 기본 전략이 같은 사용자의 같은 칸을 동시에 고쳐도 갱신이 사라지지 않는지 테스트"""
+    import sys
+    from .day_strategies import AttendanceStrategy
+    from .threaded_recorder import record_in_threads
+
+    class HolidayStrategy(AttendanceStrategy):
+        def execute(self, user_id, system):
+            system.attendance_by_day[user_id][1] += 1  # 화요일 칸을 함께 쓴다
+
+    system = AttendanceSystem()
+    system.register_day_strategy("holiday", HolidayStrategy({}))
+    # 스레드 0은 사용자 정의 전략만, 스레드 1은 기본 전략만 실행한다
+    lines = ["Umar holiday", "Umar tuesday"] * 100000
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        record_in_threads(system, lines, thread_count=2, stripes=4)
+    finally:
+        sys.setswitchinterval(interval)
+
+    user_id = system.user_name_to_id["Umar"]
+    assert system.attendance_by_day[user_id][1] == 200000
+    assert system.points[user_id] == 100000
+
+
+def test_concurrent_recorder_thread_cache_is_bounded(monkeypatch):
+    from . import threaded_recorder
+    monkeypatch.setattr(threaded_recorder, "THREAD_CACHE_SIZE", 4)
+    system = AttendanceSystem()
+    recorder = threaded_recorder.ConcurrentRecorder(system)
+    for _ in range(2):
+        for i in range(20):
+            recorder.process_line(f"user{i} monday")
+    assert len(recorder._local.user_ids) <= 4
+    assert system.user_id_cnt == 20
+    assert all(system.attendance_by_day[user_id][0] == 2 for user_id in range(1, 21))
+
+
+def test_thread_scaling_reports_every_thread_count():
+    from .threaded_recorder import thread_scaling
+    results = thread_scaling(["Umar monday"] * 2000, max_threads=3)
+    assert [thread_count for thread_count, _ in results] == [1, 2, 3]
+    assert all(per_sec > 0 for _, per_sec in results)
+
+
+@pytest.mark.parametrize("max_pairs", [2, 65536])
+def test_combine_mode_matches_line_mode(messy_file, capsys, monkeypatch, max_pairs):
+    """결합 단계를 거친 결과(출력, 포인트, 사용자 순서)가 줄 단위 경로와 같은지 테스트 (작은 상한으로 여러 번 비우는 경우 포함)"""
+    from . import combiner
+    monkeypatch.setattr(combiner, "DEFAULT_MAX_PAIRS", max_pairs)
+
+    line_system, line_output = run_and_capture(messy_file, capsys, "line")
+    combine_system, combine_output = run_and_capture(messy_file, capsys, "combine")
+
+    assert combine_output == line_output
+    assert combine_system.names == line_system.names
+    for user_id in range(1, line_system.user_id_cnt + 1):
+        assert combine_system.attendance_by_day[user_id] == line_system.attendance_by_day[user_id]
+        assert combine_system.points[user_id] == line_system.points[user_id]
+
+
+def test_combiner_applies_each_pair_once_with_count(system):
+    """같은 (이름, 요일) 줄은 count를 붙여 한 번만 반영되고, 상한에 닿으면 비우는지 테스트"""
+    from .combiner import AttendanceCombiner
+    from .day_strategies import AttendanceStrategy
+
+    calls = []
+
+    class CountingStrategy(AttendanceStrategy):
+        def execute(self, user_id, system):
+            calls.append(user_id)
+            system.points[user_id] += 2
+
+    system.register_day_strategy("holiday", CountingStrategy({}))
+    with AttendanceCombiner(system, max_pairs=3) as combiner:
+        combiner.add_lines(["Umar wednesday\n"] * 5 + ["Umar holiday\n"] * 2)
+        assert combiner.flushes == 0
+        combiner.add("Xena monday\n")
+        assert combiner.flushes == 1
+
+    user_id = system.user_name_to_id["Umar"]
+    assert system.wednesday_attendance_count[user_id] == 5
+    assert system.points[user_id] == 5 * 3 + 2 * 2
+    # count를 받지 않는 사용자 정의 전략은 횟수만큼 실행된다
+    assert calls == [user_id, user_id]
+    assert system.stats.counters["combined_lines"] == 5
+
+
+@pytest.mark.parametrize("output_format", ["text", "csv"])
+def test_out_of_core_matches_in_memory_report(messy_file, capsys, output_format):
+    """파티션별 집계 후 병합한 보고서가 메모리 백엔드와 같은 순서, 같은 내용인지 테스트"""
+    import io
+    from .out_of_core import OutOfCoreAttendance
+
+    expected, actual = io.StringIO(), io.StringIO()
+    AttendanceSystem().run(messy_file, output_format=output_format, stream=expected)
+    expected_warnings = capsys.readouterr().out
+    system = OutOfCoreAttendance(partitions=3)
+    assert system.run(messy_file, output_format, actual)
+
+    assert actual.getvalue() == expected.getvalue()
+    assert capsys.readouterr().out == expected_warnings
+    assert system.stats.counters["partitions"] == 3
+    assert system.stats.counters["users_created"] == 4
+
+
+def test_out_of_core_partition_count_follows_memory_limit(tmp_path):
+    from .out_of_core import MAX_PARTITIONS, MEMORY_PER_INPUT_BYTE, partition_count, spill_buffer_size
+    file_path = tmp_path / "attendance.txt"
+    file_path.write_text("Umar monday\n" * 1000)
+    size = file_path.stat().st_size
+    # 상한의 절반만 파티션 집계에 쓴다
+    assert partition_count(file_path, 2 * size * MEMORY_PER_INPUT_BYTE) == 1
+    assert partition_count(file_path, 2 * size * MEMORY_PER_INPUT_BYTE // 4) == 4
+    assert partition_count(file_path, 2) == MAX_PARTITIONS
+    # 열어 둔 쓰기 파일의 버퍼 합도 상한의 절반 안에 든다
+    assert MAX_PARTITIONS * spill_buffer_size(1 << 20, MAX_PARTITIONS) <= 1 << 19
+
+
+def test_out_of_core_splits_partitions_over_memory_limit(tmp_path, capsys, monkeypatch):
+    """파티션 수 상한에 막혀 상한을 넘는 파티션을 다시 나누고, 결과 파일을 미리 병합해도 보고서가 같은지 테스트"""
+    import io
+    from . import out_of_core
+    from .workload import write_workload
+
+    file_path = str(tmp_path / "workload.txt")
+    write_workload(file_path, 40000, 20000, seed=9)
+    expected = io.StringIO()
+    AttendanceSystem().run(file_path, output_format="csv", stream=expected)
+
+    monkeypatch.setattr(out_of_core, "MAX_PARTITIONS", 4)
+    system = out_of_core.OutOfCoreAttendance(memory_limit=out_of_core.MIN_MEMORY_LIMIT)
+    actual = io.StringIO()
+    assert system.run(file_path, "csv", actual)
+    assert actual.getvalue() == expected.getvalue()
+    assert system.stats.counters["partitions"] == 4
+    assert system.stats.counters["repartitioned"] >= 4
+
+
+def test_out_of_core_rejects_non_positive_memory_limit(capsys):
+    from .attendance_cli import main
+    from .out_of_core import OutOfCoreAttendance
+    with pytest.raises(ValueError):
+        OutOfCoreAttendance(memory_limit=0)
+    with pytest.raises(ValueError):
+        OutOfCoreAttendance(memory_limit=(1 << 20) - 1)
+    with pytest.raises(SystemExit) as excinfo:
+        main(["--memory-limit", "0", "attendance.txt"])
+    assert excinfo.value.code == 2
+    assert "--memory-limit" in capsys.readouterr().err
+
+
+def test_dedup_replayed_batch_is_idempotent(tmp_path, capsys):
+    """같은 배치를 두 번 받아도 이벤트 ID로 걸러 한 번 받은 것과 같은 보고서가 나오는지 테스트"""
+    from .dedup import DedupAttendanceSystem
+    batch = "Umar wednesday e1\nXena sunday e2\nUmar funday e3\nbroken\n"
+    once, twice = tmp_path / "once.txt", tmp_path / "twice.txt"
+    once.write_text(batch)
+    twice.write_text(batch + batch)
+
+    DedupAttendanceSystem().run(once)
+    expected = capsys.readouterr().out
+    system = DedupAttendanceSystem(recent_size=1)  # 최근 목록을 벗어난 ID는 필터로 걸러진다
+    system.run(twice)
+    output = capsys.readouterr().out
+
+    assert output.count("funday") == 1
+    assert system.duplicates.probable_hits == 3
+    assert "중복 이벤트 3건 생략 (필터로만 판단 3건)" in output
+    assert output[output.index("NAME"):] == expected[expected.index("NAME"):]
+
+
+def test_bloom_filter_false_positive_rate_is_bounded():
+    from .dedup import BloomFilter
+    bloom = BloomFilter(10000, 0.01)
+    # 새 원소를 넣을 때 이미 있다고 답하는 경우도 오탐이다
+    assert sum(bloom.add(f"event-{i}") for i in range(10000)) < 300
+    assert all(f"event-{i}" in bloom for i in range(10000))
+    false_positives = sum(f"other-{i}" in bloom for i in range(10000))
+    assert false_positives < 300
+
+
+def test_dedup_keeps_unique_events_past_expected_count():
+    """기대 이벤트 수를 훨씬 넘겨도 필터가 조각을 늘려 새 이벤트를 중복으로 버리지 않는지 테스트"""
+    from .dedup import DuplicateFilter
+    duplicates = DuplicateFilter(expected_events=1000, error_rate=0.001, recent_size=16)
+    dropped = sum(duplicates.seen(f"event-{i}") for i in range(50000))
+    # 오탐률 0.1%의 두 배까지 허용한다 (조각을 늘리지 않으면 대부분이 버려진다)
+    assert dropped < 100
+    assert len(duplicates.bloom.slices) > 1
+    assert all(duplicates.seen(f"event-{i}") for i in range(0, 50000, 97))
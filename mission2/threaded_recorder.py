@@ -0,0 +1,129 @@
+import argparse
+import threading
+import time
+from contextlib import ExitStack
+
+from .stats import BAD_FORMAT
+
+DEFAULT_STRIPES = 64
+# 스레드마다 두는 이름 -> ID 캐시의 최대 크기. 스레드 수만큼 생기므로 NameTable의 최근 캐시보다 작게 잡고,
+# 가득 차면 비우고 다시 채운다
+THREAD_CACHE_SIZE = 1 << 12
+
+
+class ConcurrentRecorder:
+    """여러 스레드에서 같은 AttendanceSystem에 안전하게 출석을 기록하는 래퍼
+
+    - 사용자 ID 할당은 하나의 잠금 아래에서 원자적으로 한다. 스레드마다 크기가 정해진 이름 -> ID 캐시를 두어
+      최근에 본 이름은 잠금 없이 찾는다.
+    - 카운터 갱신은 (사용자 ID % stripes)번째 잠금 아래에서 하므로 다른 사용자끼리는 서로 막지 않는다.
+    - 컬럼을 늘려야 할 때는 모든 줄무늬 잠금을 잡아 늘리는 동안 쓰는 스레드가 없게 한다.
+    - 사용자 정의 전략, 잘못된 줄 경고처럼 드문 경로는 하나의 잠금으로 직렬화한다.
+      사용자 정의 전략은 그 사용자의 줄무늬 잠금도 함께 잡는다.
+    잠금 순서는 항상 ID 잠금 -> 드문 경로 잠금 -> 줄무늬 잠금이다.
+    """
+
+    def __init__(self, system, stripes=DEFAULT_STRIPES):
+        self.system = system
+        self.stripes = stripes
+        self._id_lock = threading.Lock()
+        self._stripe_locks = [threading.Lock() for _ in range(stripes)]
+        self._slow_lock = threading.Lock()
+        self._local = threading.local()
+
+    def _user_id(self, user_name):
+        cache = getattr(self._local, "user_ids", None)
+        if cache is None:
+            cache = self._local.user_ids = {}
+        user_id = cache.get(user_name)
+        if user_id is not None:
+            return user_id
+
+        system = self.system
+        name_bytes = user_name.encode('utf-8')
+        with self._id_lock:
+            user_id = system.name_table.get_id(name_bytes)
+            if user_id is None:
+                if system.user_id_cnt + 1 >= system.store.capacity:
+                    with ExitStack() as stack:
+                        for lock in self._stripe_locks:
+                            stack.enter_context(lock)
+                        user_id = system.get_or_create_user_id_from_bytes(name_bytes)
+                else:
+                    user_id = system.get_or_create_user_id_from_bytes(name_bytes)
+        if len(cache) >= THREAD_CACHE_SIZE:
+            cache.clear()
+        cache[user_name] = user_id
+        return user_id
+
+    def record_attendance(self, user_name, day_of_week, line_no=None, line=None):
+        system = self.system
+        user_id = self._user_id(user_name)
+        rule = system.day_table.get(day_of_week)
+        stripe_lock = self._stripe_locks[user_id % self.stripes]
+        if rule is None or rule[3] is not None:
+            # 사용자 정의 전략도 같은 사용자의 카운터를 고치므로 줄무늬 잠금을 함께 잡는다
+            with self._slow_lock, stripe_lock:
+                system.dispatch_day_strategy(user_id, day_of_week, line_no, line=line)
+            return
+
+        index, add_point, flag_column, _ = rule
+        with stripe_lock:
+            system.attendance_by_day.data[user_id * system.NUM_DAYS + index] += 1
+            system.points[user_id] += add_point
+            system.points_index.mark(user_id)
+            if flag_column is not None:
+                flag_column[user_id] += 1
+                system.removed_players.discard(user_id)
+
+    def process_line(self, line, line_no=None):
+        parts = line.split()
+        if len(parts) != 2:
+            with self._slow_lock:
+                self.system.warn(f"잘못된 형식의 데이터: '{line.strip()}'", line_no, BAD_FORMAT, line)
+            return
+        self.record_attendance(parts[0], parts[1], line_no, line)
+
+
+def record_in_threads(system, lines, thread_count, stripes=DEFAULT_STRIPES):
+    """줄 목록을 thread_count개 스레드에 나눠 기록하고 걸린 시간(초)을 돌려준다"""
+    recorder = ConcurrentRecorder(system, stripes)
+    shards = [lines[i::thread_count] for i in range(thread_count)]
+    threads = [threading.Thread(target=lambda shard=shard: [recorder.process_line(line) for line in shard])
+               for shard in shards]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - started
+
+
+def thread_scaling(lines, max_threads, stripes=DEFAULT_STRIPES):
+    """1부터 max_threads까지 스레드 수별 초당 기록 수"""
+    from .attendance import AttendanceSystem
+
+    results = []
+    for thread_count in range(1, max_threads + 1):
+        elapsed = record_in_threads(AttendanceSystem(), lines, thread_count, stripes)
+        results.append((thread_count, len(lines) / elapsed if elapsed else 0.0))
+    return results
+
+
+def main(argv=None):
+    from .workload import generate_lines
+
+    parser = argparse.ArgumentParser(description="동시 기록 스레드 수별 처리량 벤치마크")
+    parser.add_argument("--lines", type=int, default=200000)
+    parser.add_argument("--users", type=int, default=10000)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--stripes", type=int, default=DEFAULT_STRIPES)
+    args = parser.parse_args(argv)
+
+    lines = ''.join(generate_lines(args.lines, args.users)).splitlines()
+    for thread_count, per_sec in thread_scaling(lines, args.threads, args.stripes):
+        print(f"{thread_count:>3} threads  {per_sec:>12.0f} records/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+from array import array
+
+# 컬럼별 타입 코드 (array 모듈)
+DAY_COUNT_TYPECODE = 'i'  # int32
+POINT_TYPECODE = 'q'      # int64
+GRADE_TYPECODE = 'b'      # int8
+COUNT_TYPECODE = 'i'      # int32
+
+
+def load_numpy():
+    """numpy가 설치되어 있으면 모듈을, 없으면 None을 반환한다"""
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+def _zeros(typecode, length):
+    column = array(typecode)
+    column.frombytes(bytes(column.itemsize * length))
+    return column
+
+
+class DayRow:
+    """DayMatrix의 한 사용자 행(요일별 출석 횟수)에 대한 뷰"""
+    __slots__ = ('_data', '_start', '_size')
+
+    def __init__(self, data, start, size):
+        self._data = data
+        self._start = start
+        self._size = size
+
+    def _offset(self, index):
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError(f"요일 인덱스 범위 초과: {index}")
+        return self._start + index
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self.tolist()[index]
+        return self._data[self._offset(index)]
+
+    def __setitem__(self, index, value):
+        self._data[self._offset(index)] = value
+
+    def __len__(self):
+        return self._size
+
+    def __iter__(self):
+        return iter(self._data[self._start:self._start + self._size])
+
+    def __eq__(self, other):
+        try:
+            return self.tolist() == list(other)
+        except TypeError:
+            return NotImplemented
+
+    def tolist(self):
+        return self._data[self._start:self._start + self._size].tolist()
+
+    def __repr__(self):
+        return f"DayRow({self.tolist()})"
+
+
+class DayMatrix:
+    """사용자 x 요일 출석 횟수를 하나의 연속된 int32 배열에 보관하는 행렬"""
+
+    def __init__(self, num_days, capacity):
+        self.num_days = num_days
+        self.capacity = capacity
+        self.data = _zeros(DAY_COUNT_TYPECODE, num_days * capacity)
+
+    def _start(self, user_id):
+        if not 0 <= user_id < self.capacity:
+            raise IndexError(f"사용자 ID 범위 초과: {user_id}")
+        return user_id * self.num_days
+
+    def __getitem__(self, user_id):
+        return DayRow(self.data, self._start(user_id), self.num_days)
+
+    def __setitem__(self, user_id, values):
+        values = array(DAY_COUNT_TYPECODE, values)
+        if len(values) != self.num_days:
+            raise ValueError(f"요일 수가 맞지 않습니다: {len(values)} != {self.num_days}")
+        start = self._start(user_id)
+        self.data[start:start + self.num_days] = values
+
+    def __len__(self):
+        return self.capacity
+
+    def grow(self, capacity):
+        self.data.frombytes(bytes(self.data.itemsize * self.num_days * (capacity - self.capacity)))
+        self.capacity = capacity
+
+
+class UserStore:
+    """사용자별 컬럼을 타입 배열로 보관하고, 용량이 부족하면 2배씩 늘리는 컬럼 저장소
+
+    배열은 제자리에서 늘어나므로 컬럼 참조는 계속 유효하다.
+    단, 버퍼를 내보낸 뷰(memoryview, numpy.frombuffer)가 살아 있는 동안에는 늘릴 수 없다.
+    """
+    INITIAL_CAPACITY = 128
+
+    def __init__(self, num_days, capacity=INITIAL_CAPACITY):
+        self.capacity = capacity
+        self.attendance_by_day = DayMatrix(num_days, capacity)
+        self.points = _zeros(POINT_TYPECODE, capacity)
+        self.bonus_points = _zeros(POINT_TYPECODE, capacity)
+        self.grade = _zeros(GRADE_TYPECODE, capacity)
+        self.wednesday_attendance_count = _zeros(COUNT_TYPECODE, capacity)
+        self.weekend_attendance_count = _zeros(COUNT_TYPECODE, capacity)
+        # 사용자별 1바이트 플래그: 탈락 후보 색인(RemovedPlayerIndex)에 들어 있는지
+        self.removed_candidate = bytearray(capacity)
+
+    def columns(self):
+        return (self.points, self.bonus_points, self.grade,
+                self.wednesday_attendance_count, self.weekend_attendance_count)
+
+    def ensure_capacity(self, size):
+        if size <= self.capacity:
+            return
+        new_capacity = self.capacity * 2
+        while new_capacity < size:
+            new_capacity *= 2
+
+        extra = new_capacity - self.capacity
+        for column in self.columns():
+            column.frombytes(bytes(column.itemsize * extra))
+        self.removed_candidate += bytes(extra)
+        self.attendance_by_day.grow(new_capacity)
+        self.capacity = new_capacity
+
+    def nbytes(self):
+        total = self.attendance_by_day.data.itemsize * len(self.attendance_by_day.data) + len(self.removed_candidate)
+        for column in self.columns():
+            total += column.itemsize * len(column)
+        return total
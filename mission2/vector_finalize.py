@@ -0,0 +1,59 @@
+from .grading_strategies import Grade
+from .user_store import load_numpy
+
+
+def grade_lookup(grade_table):
+    """(기준 포인트, 등급 값) 표를 searchsorted용 (오름차순 기준, 구간별 등급 값)으로 바꾼다
+
+    기준이 같으면 표에서 앞선 등급이 이기도록 뒤집은 뒤 안정 정렬한다 (순차 비교와 같은 결과).
+    """
+    ordered = sorted(reversed(grade_table), key=lambda rule: rule[0])
+    thresholds = [grade_point for grade_point, _ in ordered]
+    values = [Grade.NORMAL.value] + [grade_value for _, grade_value in ordered]
+    return thresholds, values
+
+
+class VectorFinalizer:
+    """보너스와 등급을 모든 사용자에 대해 numpy 컬럼 연산 몇 번으로 계산하는 마감 엔진
+
+    system.bonus_table / grade_table(컴파일된 규칙)을 따르며, 결과는 사용자별 전략 경로와 같다.
+    탈락 후보 색인은 조회할 때 다시 확인하므로 여기서는 갱신하지 않는다.
+    """
+
+    def __init__(self, system, use_numpy=None):
+        self.system = system
+        self.np = load_numpy() if use_numpy is not False else None
+        if use_numpy and self.np is None:
+            raise ImportError("numpy가 설치되어 있지 않습니다")
+
+    def _columns(self):
+        np = self.np
+        system = self.system
+        rows = system.user_id_cnt + 1
+        # 0번 사용자는 없으므로 1번부터 본다
+        matrix = np.frombuffer(system.attendance_by_day.data, dtype=np.int32)[:rows * system.NUM_DAYS]
+        matrix = matrix.reshape(rows, system.NUM_DAYS)[1:]
+        points = np.frombuffer(system.points, dtype=np.int64)[1:rows]
+        bonus_points = np.frombuffer(system.bonus_points, dtype=np.int64)[1:rows]
+        grade = np.frombuffer(system.grade, dtype=np.int8)[1:rows]
+        return matrix, points, bonus_points, grade
+
+    def apply_bonuses(self):
+        np = self.np
+        matrix, points, bonus_points, _ = self._columns()
+        bonus = np.zeros(len(points), dtype=np.int64)
+        for indexes, attendance_count, rule_points in self.system.bonus_table:
+            counts = matrix[:, list(indexes)].sum(axis=1, dtype=np.int64)
+            bonus += np.where(counts >= attendance_count, rule_points, 0)
+
+        changed = np.nonzero(bonus != bonus_points)[0]
+        points += bonus - bonus_points
+        bonus_points[:] = bonus
+        self.system.points_index.mark_many((changed + 1).tolist())
+
+    def assign_grades(self):
+        np = self.np
+        _, points, _, grade = self._columns()
+        thresholds, values = grade_lookup(self.system.grade_table)
+        positions = np.searchsorted(np.asarray(thresholds, dtype=np.int64), points, side='right')
+        grade[:] = np.asarray(values, dtype=np.int8)[positions]
@@ -0,0 +1,77 @@
+import argparse
+import random
+from itertools import accumulate
+
+WEEKDAYS = ("monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday")
+# 기본 요일 비율: 평일 위주, 주말은 조금 적게
+DEFAULT_WEEKDAY_WEIGHTS = (16, 16, 16, 16, 16, 10, 10)
+# 잘못된 줄의 종류: 단어 부족, 단어 초과, 알 수 없는 요일, 빈 줄
+MALFORMED_KINDS = ("missing_day", "extra_token", "unknown_day", "blank")
+
+CHUNK_LINES = 65536
+
+
+def zipf_cum_weights(user_count, exponent):
+    """순위 k인 사용자의 출석 비중을 1 / k^exponent로 둔 누적 가중치"""
+    return list(accumulate(1.0 / (rank ** exponent) for rank in range(1, user_count + 1)))
+
+
+def generate_lines(line_count, user_count, zipf_exponent=1.1, weekday_weights=DEFAULT_WEEKDAY_WEIGHTS,
+                   malformed_rate=0.0, seed=0):
+    """출석 줄을 CHUNK_LINES개씩 묶어 문자열로 만들어 낸다"""
+    rng = random.Random(seed)
+    user_names = [f"user{rank}" for rank in range(1, user_count + 1)]
+    # 순위와 사용자 ID 순서가 같지 않도록 이름을 섞는다
+    rng.shuffle(user_names)
+    user_weights = zipf_cum_weights(user_count, zipf_exponent)
+    day_weights = list(accumulate(weekday_weights))
+
+    remaining = line_count
+    while remaining > 0:
+        size = min(CHUNK_LINES, remaining)
+        remaining -= size
+        users = rng.choices(user_names, cum_weights=user_weights, k=size)
+        days = rng.choices(WEEKDAYS, cum_weights=day_weights, k=size)
+        lines = [f"{user} {day}\n" for user, day in zip(users, days)]
+        if malformed_rate > 0:
+            for i in range(size):
+                if rng.random() < malformed_rate:
+                    lines[i] = _malformed_line(rng, users[i], days[i])
+        yield ''.join(lines)
+
+
+def _malformed_line(rng, user, day):
+    kind = rng.choice(MALFORMED_KINDS)
+    if kind == "missing_day":
+        return f"{user}\n"
+    if kind == "extra_token":
+        return f"{user} {day} extra\n"
+    if kind == "unknown_day":
+        return f"{user} {day[:3]}day\n"
+    return "\n"
+
+
+def write_workload(file_path, line_count, user_count, **options):
+    with open(file_path, 'w', encoding='utf-8') as f:
+        for chunk in generate_lines(line_count, user_count, **options):
+            f.write(chunk)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="합성 출석 로그 생성기")
+    parser.add_argument("output")
+    parser.add_argument("--lines", type=int, default=1000)
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--zipf", type=float, default=1.1, help="사용자 활동 편중 지수 (0이면 균등)")
+    parser.add_argument("--weekday-weights", type=float, nargs=7, default=DEFAULT_WEEKDAY_WEIGHTS,
+                        metavar=("MON", "TUE", "WED", "THU", "FRI", "SAT", "SUN"))
+    parser.add_argument("--malformed-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    write_workload(args.output, args.lines, args.users, zipf_exponent=args.zipf,
+                   weekday_weights=args.weekday_weights, malformed_rate=args.malformed_rate, seed=args.seed)
+
+
+if __name__ == "__main__":
+    main()